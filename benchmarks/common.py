@@ -0,0 +1,87 @@
+"""Shared helpers for the benchmark scripts.
+
+The scripts are run from the repository root, for example `python benchmarks/memory_per_word.py`.
+"""
+
+from __future__ import annotations
+
+import random
+import tempfile
+from pathlib import Path
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+from docugenr8_core import Document
+from docugenr8_core.text_area.textarea import TextArea
+
+
+WORDS = [
+    "lorem",
+    "ipsum",
+    "dolor",
+    "sit",
+    "amet",
+    "consectetur",
+    "adipiscing",
+    "elit",
+    "sed",
+    "do",
+    "eiusmod",
+    "tempor",
+    "incididunt",
+    "ut",
+    "labore",
+    "et",
+    "dolore",
+    "magna",
+    "aliqua",
+]
+
+
+def build_font_file() -> str:
+    """Builds a font with printable ASCII glyphs of varying widths and returns its path."""
+    glyph_order = [".notdef"] + [f"uni{code:04X}" for code in range(32, 127)]
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyph_order)
+    fb.setupCharacterMap({code: f"uni{code:04X}" for code in range(32, 127)})
+    empty_glyph = TTGlyphPen(None).glyph()
+    fb.setupGlyf(dict.fromkeys(glyph_order, empty_glyph))
+    metrics = {".notdef": (500, 0)}
+    for code in range(32, 127):
+        metrics[f"uni{code:04X}"] = (250 + (code * 37) % 500, 0)
+    fb.setupHorizontalMetrics(metrics)
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({"familyName": "Benchmark", "styleName": "Regular"})
+    fb.setupOS2()
+    fb.setupPost()
+    path = Path(tempfile.mkdtemp()) / "benchmark.ttf"
+    fb.save(str(path))
+    return str(path)
+
+
+def reference_text(num_words: int, seed: int = 0) -> str:
+    """Generates lorem ipsum text with paragraphs of 100 words."""
+    rng = random.Random(seed)
+    words = []
+    for word_idx in range(1, num_words + 1):
+        words.append(rng.choice(WORDS))
+        words.append("\n" if word_idx % 100 == 0 else " ")
+    return "".join(words)
+
+
+def create_document(font_path: str) -> Document:
+    """Creates a document that uses the benchmark font."""
+    doc = Document()
+    doc.add_font("Benchmark", font_path)
+    doc.settings.font_size = 10
+    return doc
+
+
+def count_words(textarea: TextArea) -> int:
+    """Counts placed and buffered words of the text area."""
+    num_words = len(textarea._get_buffer())
+    for paragraph in textarea._paragraphs:
+        for textline in paragraph._textlines:
+            num_words += len(textline._words)
+    return num_words
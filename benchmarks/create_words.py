@@ -0,0 +1,43 @@
+"""Times `create_words` on 1 MB of plain text."""
+
+from __future__ import annotations
+
+import time
+
+from common import build_font_file
+from common import create_document
+from common import reference_text
+
+from docugenr8_core.text_area.words_creation import create_words
+
+
+TEXT_SIZE = 1_000_000
+REPEATS = 3
+
+
+def main() -> None:
+    """Prints the best time of creating words from the reference text."""
+    doc = create_document(build_font_file())
+    font = doc.fonts["Benchmark"]
+    text = reference_text(TEXT_SIZE // 6)[:TEXT_SIZE]
+    settings = doc.settings
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        words = create_words(
+            text,
+            font,
+            settings.font_size,
+            settings.font_color,
+            settings.page_num_current_page_dummy,
+            settings.page_num_total_pages_dummy,
+            settings.page_num_dummy_length,
+            settings.page_num_presentation,
+        )
+        best = min(best, time.perf_counter() - start)
+    print(f"characters: {len(text)}, words: {len(words)}")
+    print(f"create_words: {best:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
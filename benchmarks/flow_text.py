@@ -0,0 +1,37 @@
+"""Times flowing long texts onto pages that are added while the text overflows."""
+
+from __future__ import annotations
+
+import time
+
+from common import build_font_file
+from common import create_document
+from common import reference_text
+
+from docugenr8_core import PageTemplate
+
+
+TEXT_WORDS = (10_000, 50_000, 200_000)
+PAGE_TEMPLATE = PageTemplate(595.2, 842.04, 50, 50, 495.2, 742.04)
+REPEATS = 3
+
+
+def flow_time(font_path: str, text: str) -> tuple[float, int]:
+    """Returns the time of flowing the text and the number of added pages."""
+    doc = create_document(font_path)
+    start = time.perf_counter()
+    pages = doc.flow_text(text, PAGE_TEMPLATE)
+    return time.perf_counter() - start, len(pages)
+
+
+def main() -> None:
+    """Prints the best flow times and page counts of texts of every size."""
+    font_path = build_font_file()
+    for num_words in TEXT_WORDS:
+        text = reference_text(num_words)
+        seconds, num_pages = min(flow_time(font_path, text) for _ in range(REPEATS))
+        print(f"{num_words} words: {num_pages} pages, {seconds:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Times laying out text in the first text area of a long chain of linked text areas.
+
+The text areas after the first one are still empty, like the pages of a book that is being
+written, so every word that is laid out looks for words in the following text areas and for
+the buffer of the chain.
+"""
+
+from __future__ import annotations
+
+import time
+
+from common import build_font_file
+from common import create_document
+from common import reference_text
+
+
+NUM_TEXTAREAS = (1, 300, 600)
+NUM_WORDS = 10_000
+PARAGRAPH_WORDS = 100
+TEXTAREA_WIDTH = 400
+REPEATS = 3
+
+
+def layout_time(font_path: str, num_textareas: int, batch: bool) -> float:
+    """Returns the time of adding the paragraphs of the text one by one to the first text area of a chain."""
+    doc = create_document(font_path)
+    doc.settings.text_batch_line_breaking = batch
+    first_textarea = doc.create_textarea(0, 0, TEXTAREA_WIDTH, 100_000_000)
+    first_textarea.add_text(reference_text(PARAGRAPH_WORDS, seed=1))
+    for _ in range(num_textareas - 1):
+        first_textarea.link_textarea(doc.create_textarea(0, 0, TEXTAREA_WIDTH, 700))
+    paragraphs = reference_text(NUM_WORDS).splitlines(keepends=True)
+    start = time.perf_counter()
+    for paragraph in paragraphs:
+        first_textarea.add_text(paragraph)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Prints the best layout times for chains of every length, word by word and with the batch line breaker."""
+    font_path = build_font_file()
+    for num_textareas in NUM_TEXTAREAS:
+        word_by_word = min(layout_time(font_path, num_textareas, batch=False) for _ in range(REPEATS))
+        batch = min(layout_time(font_path, num_textareas, batch=True) for _ in range(REPEATS))
+        print(f"{num_textareas} text areas: word by word {word_by_word:.3f} s, batch {batch:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Times laying out long unbroken tokens, such as base64 blobs or URLs."""
+
+from __future__ import annotations
+
+import time
+
+from common import build_font_file
+from common import create_document
+
+from docugenr8_core.dto import dto_build
+from docugenr8_core.text_area.words_creation import create_words
+
+
+TOKEN_SIZES = (25_000, 50_000, 100_000)
+CHARS_PER_LINE = 60
+
+
+def create_token(token_size: int) -> str:
+    """Creates an unbroken base64-like token."""
+    return ("QUJDREVGR0hJSktMTU5PUFFSU1RVVldYWVo0123456789+/" * (token_size // 46 + 1))[:token_size]
+
+
+def main() -> None:
+    """Prints the time of splitting, adding and exporting one unbroken token of every size."""
+    font_path = build_font_file()
+    for token_size in TOKEN_SIZES:
+        doc = create_document(font_path)
+        token = create_token(token_size)
+        word = create_words(token, doc.fonts["Benchmark"], 10, (0, 0, 0))[0]
+        start = time.perf_counter()
+        while len(word._chars) > CHARS_PER_LINE:
+            word._split_first_fragment(CHARS_PER_LINE)
+        split_time = time.perf_counter() - start
+        start = time.perf_counter()
+        textarea = doc.create_textarea(0, 0, 400, 10_000_000)
+        textarea.add_text(token)
+        layout_time = time.perf_counter() - start
+        page = doc.add_page(600, 10_000_000)
+        page.add_content(textarea)
+        start = time.perf_counter()
+        dto_build(doc)
+        export_time = time.perf_counter() - start
+        print(
+            f"{token_size} characters: split into lines {split_time:.3f} s, "
+            f"layout {layout_time:.3f} s, export {export_time:.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Measures memory allocated per laid out word with tracemalloc."""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+
+from common import build_font_file
+from common import count_words
+from common import create_document
+from common import reference_text
+
+
+NUM_WORDS = 20_000
+
+
+def main() -> None:
+    """Prints the memory allocated per word while laying out the reference text."""
+    doc = create_document(build_font_file())
+    text = reference_text(NUM_WORDS)
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    textarea = doc.create_textarea(0, 0, 400, 10_000_000)
+    textarea.add_text(text)
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    num_words = count_words(textarea)
+    print(f"words: {num_words}")
+    print(f"bytes per word: {(end - start) / num_words:.1f}")
+
+
+if __name__ == "__main__":
+    main()
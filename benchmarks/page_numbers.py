@@ -0,0 +1,96 @@
+"""Times exporting documents with page numbers in footers and in the text."""
+
+from __future__ import annotations
+
+import time
+
+from common import build_font_file
+from common import create_document
+from common import reference_text
+
+from docugenr8_core import Document
+from docugenr8_core import Page
+from docugenr8_core import PageTemplate
+
+
+NUM_FOOTER_PAGES = 500
+PAGE_WORDS = 300
+BOOK_WORDS = 150_000
+REFERENCE_EVERY = 50
+PAGE_TEMPLATE = PageTemplate(595.2, 842.04, 50, 50, 495.2, 712.04)
+REPEATS = 3
+
+
+def add_footer(doc: Document, page: Page) -> None:
+    """Adds a footer with the current page and the number of pages to the page."""
+    footer = doc.create_textarea(50, 782.04, 495.2, 20)
+    footer.add_text("Page %%pn%% of %%tp%%")
+    page.add_content(footer)
+
+
+def with_page_references(text: str) -> str:
+    """Replaces every REFERENCE_EVERY-th word of the text with a reference to the current page."""
+    words = text.split(" ")
+    for word_idx in range(0, len(words), REFERENCE_EVERY):
+        words[word_idx] = "p.%%pn%%"
+    return " ".join(words)
+
+
+def create_footers_document(font_path: str) -> Document:
+    """Returns a document of separate pages with a text and a footer each."""
+    doc = create_document(font_path)
+    for page_idx in range(NUM_FOOTER_PAGES):
+        page = doc.add_page(PAGE_TEMPLATE.width, PAGE_TEMPLATE.height)
+        body = doc.create_textarea(
+            PAGE_TEMPLATE.textarea_x,
+            PAGE_TEMPLATE.textarea_y,
+            PAGE_TEMPLATE.textarea_width,
+            PAGE_TEMPLATE.textarea_height,
+        )
+        body.add_text(with_page_references(reference_text(PAGE_WORDS, seed=page_idx)))
+        page.add_content(body)
+        add_footer(doc, page)
+    return doc
+
+
+def footers_export_times(font_path: str) -> tuple[float, float, float]:
+    """Returns the times of exporting the document with footers for the first time, again and after an edit."""
+    doc = create_footers_document(font_path)
+    start = time.perf_counter()
+    doc.export()
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    doc.export()
+    again = time.perf_counter() - start
+    doc.pages[NUM_FOOTER_PAGES // 2]._contents[0].add_text(" edit")
+    start = time.perf_counter()
+    doc.export()
+    return first, again, time.perf_counter() - start
+
+
+def book_export_time(font_path: str, text: str) -> tuple[float, int]:
+    """Returns the export time of a flowed book with footers and its number of pages."""
+    doc = create_document(font_path)
+    pages = doc.flow_text(text, PAGE_TEMPLATE)
+    for page in pages:
+        add_footer(doc, page)
+    start = time.perf_counter()
+    doc.export()
+    return time.perf_counter() - start, len(pages)
+
+
+def main() -> None:
+    """Prints the best export times."""
+    font_path = build_font_file()
+    first, again, edited = map(min, zip(*(footers_export_times(font_path) for _ in range(REPEATS)), strict=True))
+    print(
+        f"{NUM_FOOTER_PAGES} pages with footers: export {first:.3f} s, export again {again:.3f} s, "
+        f"export after an edit {edited:.3f} s"
+    )
+    text = with_page_references(reference_text(BOOK_WORDS))
+    seconds, num_pages = min(book_export_time(font_path, text) for _ in range(REPEATS))
+    print(f"{num_pages} pages of a book: export {seconds:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Times laying out long paragraphs word by word and with the batch line breaker."""
+
+from __future__ import annotations
+
+import time
+
+from common import build_font_file
+from common import create_document
+from common import reference_text
+
+from docugenr8_core.text_area.words_creation import create_words
+
+
+PARAGRAPH_WORDS = (1_000, 5_000, 20_000)
+LINE_WIDTH = 400
+REPEATS = 3
+
+
+def layout_time(font_path: str, text: str, batch: bool) -> float:
+    """Returns the time of laying out the words of the text in a text area tall enough for all of it."""
+    doc = create_document(font_path)
+    doc.settings.text_batch_line_breaking = batch
+    textarea = doc.create_textarea(0, 0, LINE_WIDTH, 100_000_000)
+    settings = doc.settings
+    words = create_words(text, doc.fonts["Benchmark"], settings.font_size, settings.font_color)
+    textarea._get_buffer().extend(words)
+    start = time.perf_counter()
+    textarea._distribute_words_in_all_areas()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Prints the best layout times of one paragraph of every size with both line breakers."""
+    font_path = build_font_file()
+    for num_words in PARAGRAPH_WORDS:
+        text = reference_text(num_words).replace("\n", " ")
+        word_by_word = min(layout_time(font_path, text, batch=False) for _ in range(REPEATS))
+        batch = min(layout_time(font_path, text, batch=True) for _ in range(REPEATS))
+        print(f"{num_words} words: word by word {word_by_word:.3f} s, batch {batch:.3f} s, {word_by_word / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compares exporting a flowed document serially with exporting its pages in a process pool."""
+
+from __future__ import annotations
+
+import os
+import time
+
+from common import build_font_file
+from common import create_document
+from common import reference_text
+
+from docugenr8_core import Document
+from docugenr8_core import PageTemplate
+
+
+WORDS_PER_PAGE = 700
+PAGE_COUNTS = [10, 50, 150]
+PAGE_TEMPLATE = PageTemplate(595.2, 842.04, 50, 50, 495.2, 742.04)
+REPEATS = 3
+
+
+def export_time(doc: Document, workers: int) -> float:
+    """Returns the best time of exporting every page of the document with the number of workers."""
+    doc.settings.export_workers = workers
+    doc.settings.export_parallel_min_pages = 0
+    times = []
+    for _ in range(REPEATS):
+        for page in doc.pages:
+            page._dto_page = None
+        start = time.perf_counter()
+        doc.export()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    """Prints the export times for documents of different page counts and worker counts."""
+    font_path = build_font_file()
+    worker_counts = sorted({2, 4, os.cpu_count() or 1} - {1})
+    print(f"{os.cpu_count()} CPUs")
+    for page_count in PAGE_COUNTS:
+        doc = create_document(font_path)
+        doc.flow_text(reference_text(page_count * WORDS_PER_PAGE), PAGE_TEMPLATE)
+        serial = export_time(doc, 1)
+        line = f"{len(doc.pages)} pages: serial {serial:.3f} s"
+        for workers in worker_counts:
+            parallel = export_time(doc, workers)
+            line += f", {workers} workers {parallel:.3f} s ({serial / parallel:.2f}x)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
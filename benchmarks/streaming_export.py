@@ -0,0 +1,68 @@
+"""Measures peak memory of exporting a flowed book at once and page by page with tracemalloc."""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+
+from common import build_font_file
+from common import create_document
+from common import reference_text
+
+from docugenr8_core import Document
+from docugenr8_core import PageTemplate
+
+
+NUM_WORDS = 100_000
+PAGE_TEMPLATE = PageTemplate(595.2, 842.04, 50, 50, 495.2, 742.04)
+
+
+def create_book(font_path: str) -> Document:
+    """Returns a document with the reference text flowed over as many pages as it needs."""
+    doc = create_document(font_path)
+    doc.flow_text(reference_text(NUM_WORDS), PAGE_TEMPLATE)
+    return doc
+
+
+def export_peak(doc: Document) -> int:
+    """Returns the peak memory allocated while the whole document is exported."""
+    gc.collect()
+    tracemalloc.start()
+    dto = doc.export()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del dto
+    return peak
+
+
+def iter_export_peak(doc: Document, collect: bool) -> int:
+    """Returns the peak memory allocated while pages are exported one at a time and dropped.
+
+    Dtos of a page reference their parents, so dropped pages are freed when the garbage collector
+    runs, or right away when collect is set.
+    """
+    gc.collect()
+    tracemalloc.start()
+    for _ in doc.iter_export():
+        if collect:
+            gc.collect()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    """Prints the peak memory of both ways of exporting the book."""
+    font_path = build_font_file()
+    iter_peak = iter_export_peak(create_book(font_path), collect=False)
+    iter_collect_peak = iter_export_peak(create_book(font_path), collect=True)
+    doc = create_book(font_path)
+    peak = export_peak(doc)
+    print(f"{len(doc.pages)} pages")
+    print(f"export: peak {peak / 2**20:.1f} MiB")
+    print(f"iter_export: peak {iter_peak / 2**20:.1f} MiB")
+    print(f"iter_export, collecting each dropped page: peak {iter_collect_peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
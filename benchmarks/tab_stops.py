@@ -0,0 +1,44 @@
+"""Times laying out and reflowing tab separated columns, where every line holds many tab stops."""
+
+from __future__ import annotations
+
+import random
+import time
+
+from common import build_font_file
+from common import create_document
+
+
+NUM_ROWS = 400
+NUM_COLUMNS = 80
+LINE_WIDTH = 3_000
+
+
+def tabular_text(num_rows: int, num_columns: int, seed: int = 0) -> str:
+    """Returns rows of tab separated cells of varying widths."""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(num_rows):
+        cells = [str(rng.randint(0, 10 ** rng.randint(1, 6))) for _ in range(num_columns)]
+        rows.append("\t".join(cells))
+    return "\n".join(rows)
+
+
+def main() -> None:
+    """Prints the time of adding the columns and of changing the width of the text area."""
+    font_path = build_font_file()
+    text = tabular_text(NUM_ROWS, NUM_COLUMNS)
+    doc = create_document(font_path)
+    doc.settings.text_tab_size = 40
+    textarea = doc.create_textarea(0, 0, LINE_WIDTH, 10_000_000)
+    start = time.perf_counter()
+    textarea.add_text(text)
+    layout_time = time.perf_counter() - start
+    start = time.perf_counter()
+    textarea.set_width(LINE_WIDTH * 0.6)
+    reflow_time = time.perf_counter() - start
+    print(f"{NUM_ROWS} rows of {NUM_COLUMNS} columns: layout {layout_time:.3f} s, reflow {reflow_time:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
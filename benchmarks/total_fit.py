@@ -0,0 +1,53 @@
+"""Compares greedy and total fit line breaking of justified text on a 10k-word corpus."""
+
+from __future__ import annotations
+
+import time
+
+from common import build_font_file
+from common import create_document
+from common import reference_text
+
+
+CORPUS_WORDS = 10_000
+LINE_WIDTH = 400
+REPEATS = 3
+
+
+def layout(font_path: str, text: str, line_breaking: str) -> tuple[float, list[float]]:
+    """Returns the best layout time and the space added between words of every justified line."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        doc = create_document(font_path)
+        doc.settings.text_h_align = "justify"
+        doc.settings.paragraph_line_breaking = line_breaking
+        textarea = doc.create_textarea(0, 0, LINE_WIDTH, 100_000_000)
+        start = time.perf_counter()
+        textarea.add_text(text)
+        best = min(best, time.perf_counter() - start)
+    justify_spaces = []
+    for paragraph in textarea._paragraphs:
+        for textline in paragraph._textlines[:-1]:
+            words = list(textline._words)[: len(textline._words) - len(textline._spaces_at_the_end)]
+            num_spaces = sum(1 for word in words if word._is_space())
+            if num_spaces > 0:
+                justify_spaces.append(textline._available_width / num_spaces)
+    return best, justify_spaces
+
+
+def main() -> None:
+    """Prints layout times and statistics of the space added between words for both modes."""
+    font_path = build_font_file()
+    text = reference_text(CORPUS_WORDS)
+    for line_breaking in ("greedy", "total-fit"):
+        seconds, justify_spaces = layout(font_path, text, line_breaking)
+        mean = sum(justify_spaces) / len(justify_spaces)
+        mean_square = sum(space * space for space in justify_spaces) / len(justify_spaces)
+        print(
+            f"{line_breaking}: {seconds:.3f} s, lines {len(justify_spaces)}, "
+            f"justify space mean {mean:.2f}, mean square {mean_square:.2f}, max {max(justify_spaces):.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Times laying out and reflowing text in wide lines, where words move between lines one at a time."""
+
+from __future__ import annotations
+
+import time
+
+from common import build_font_file
+from common import create_document
+from common import reference_text
+
+
+NUM_WORDS = 20_000
+LINE_WIDTHS = (2_000, 8_000, 32_000)
+
+
+def main() -> None:
+    """Prints the time of adding text and of changing the width for every line width."""
+    font_path = build_font_file()
+    text = reference_text(NUM_WORDS).replace("\n", " ")
+    for line_width in LINE_WIDTHS:
+        doc = create_document(font_path)
+        textarea = doc.create_textarea(0, 0, line_width, 10_000_000)
+        start = time.perf_counter()
+        textarea.add_text(text)
+        layout_time = time.perf_counter() - start
+        start = time.perf_counter()
+        textarea.set_width(line_width * 0.9)
+        reflow_time = time.perf_counter() - start
+        print(f"line width {line_width}: layout {layout_time:.3f} s, reflow {reflow_time:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
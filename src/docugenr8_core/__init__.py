@@ -5,13 +5,16 @@ which represents a document and its pages. It has functions to add new pages, cr
 information into DTOs for usage in other modules where the information will be rendered.
 
 Example:
+    # Optionally load and pin fonts in the shared font registry at worker startup
+    font_registry.preload("./fonts/calibri.ttf")
+
     # Create a new document
     doc = Document()
 
     # Add first page to the document
     doc.add_page(595.2, 842.04)
 
-    # Add font to the document
+    # Add font to the document, fonts are loaded once per process and shared by all documents
     doc.add_font(font_name="calibri", path="./fonts/calibri.ttf")
 
     # Create a text area and fill it with a text
@@ -31,5 +34,7 @@ Example:
 """
 
 from docugenr8_core.document import Document as Document
+from docugenr8_core.font import font_registry as font_registry
 from docugenr8_core.page import Page as Page
+from docugenr8_core.page import PageTemplate as PageTemplate
 from docugenr8_core.settings import Settings as Settings
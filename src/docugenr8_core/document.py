@@ -1,8 +1,16 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
 from docugenr8_shared.dto import Dto
 
 from docugenr8_core.dto import dto_build
+from docugenr8_core.dto import dto_build_iter
 from docugenr8_core.font import Font
+from docugenr8_core.font import font_registry
 from docugenr8_core.page import Page
+from docugenr8_core.page import PageTemplate
 from docugenr8_core.settings import Settings
 from docugenr8_core.shapes import Arc
 from docugenr8_core.shapes import Curve
@@ -13,11 +21,23 @@ from docugenr8_core.text_area import TextArea
 from docugenr8_core.text_box import TextBox
 
 
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    from docugenr8_shared.dto import DtoFont
+    from docugenr8_shared.dto import DtoPage
+
+
 class Document:
     def __init__(self) -> None:
         self.settings = Settings()
         self.pages: list[Page] = []
         self.fonts: dict[str, Font] = {}
+        # text areas with words added inside deferred_layout blocks, laid out when the outermost block ends
+        self._deferred_layout_depth: int = 0
+        self._textareas_with_deferred_layout: list[TextArea] = []
 
     def add_page(
         self,
@@ -33,7 +53,7 @@ class Document:
         font_name: str,
         path: str,
     ) -> None:
-        font = Font(font_name, path)
+        font = font_registry.get(font_name, path, self.settings.font_metrics_cache_dir)
         self.fonts[font_name] = font
         self.settings.font_current = font_name
 
@@ -48,8 +68,8 @@ class Document:
         x: float,
         y: float,
         closed: bool = False,
-        fill_color: tuple[int, int, int] | None | bool = False,
-        line_color: tuple[int, int, int] | None | bool = False,
+        fill_color: tuple[int, int, int] | bool | None = False,
+        line_color: tuple[int, int, int] | bool | None = False,
         line_width: float | None = None,
         line_pattern: tuple[int, int, int, int, int] | None = None,
     ):
@@ -77,8 +97,8 @@ class Document:
         y: float,
         width: float,
         height: float,
-        fill_color: tuple[int, int, int] | None | bool = False,
-        line_color: tuple[int, int, int] | None | bool = False,
+        fill_color: tuple[int, int, int] | bool | None = False,
+        line_color: tuple[int, int, int] | bool | None = False,
         line_width: float | None = None,
         line_pattern: tuple[int, int, int, int, int] | None = None,
     ):
@@ -107,8 +127,8 @@ class Document:
         y: float,
         width: float,
         height: float,
-        fill_color: tuple[int, int, int] | None | bool = False,
-        line_color: tuple[int, int, int] | None | bool = False,
+        fill_color: tuple[int, int, int] | bool | None = False,
+        line_color: tuple[int, int, int] | bool | None = False,
         line_width: float | None = None,
         line_pattern: tuple[int, int, int, int, int] | None = None,
     ) -> Ellipse:
@@ -137,7 +157,7 @@ class Document:
         y1: float,
         x2: float,
         y2: float,
-        line_color: tuple[int, int, int] | None | bool = False,
+        line_color: tuple[int, int, int] | bool | None = False,
         line_width: float | None = None,
         line_pattern: tuple[int, int, int, int, int] | None = None,
     ) -> Arc:
@@ -194,9 +214,132 @@ class Document:
     def import_svg(self, path: str) -> Svg:
         return Svg(path)
 
+    @contextmanager
+    def deferred_layout(self) -> Generator[Document, None, None]:
+        """Defers the layout of text added to text areas of the document until the end of the block.
+
+        Words of add_text and add_text_stream calls inside the block wait in the buffers of their
+        text areas and are laid out once per text area when the outermost block ends, or earlier
+        when the document is exported. Words are laid out with the settings from when they were
+        added, so the layout is the same as when every call lays out its words. Words added before a
+        change of settings read by the layout, such as paragraph indents, are laid out when the
+        first call after the change is made.
+
+        Yields:
+            Document: The document.
+        """
+        self._deferred_layout_depth += 1
+        try:
+            yield self
+        finally:
+            self._deferred_layout_depth -= 1
+        if self._deferred_layout_depth == 0:
+            self._run_deferred_layout()
+
+    def flow_text(
+        self,
+        text: str | Iterable[str],
+        page_template: PageTemplate,
+    ) -> list[Page]:
+        """Adds the text on new pages created from the page template.
+
+        The text is laid out in the text area of the first added page. While words are left in the
+        buffer, another page with a text area linked to the previous one is added. The number of
+        pages follows from the text and pages are never laid out again when the next one is added.
+        The pages are laid out while they are added, also inside deferred_layout blocks, since the
+        number of pages follows from the layout.
+
+        Args:
+            text (str | Iterable[str]): Text, or text split into chunks, such as an open file.
+            page_template (PageTemplate): Size of the pages and the box of their text areas.
+
+        Returns:
+            list[Page]: The added pages.
+
+        Raises:
+            ValueError: If the text area of the page template is empty or does not lie on its page,
+                or if a word does not fit into the empty text area of a new page. No pages are
+                added then.
+        """
+        _check_page_template(page_template)
+        num_pages = len(self.pages)
+        num_deferred_textareas = len(self._textareas_with_deferred_layout)
+        try:
+            return self._add_pages_with_text(text, page_template)
+        except BaseException:
+            # the added pages hold only part of the text, so they are removed with their text areas
+            del self.pages[num_pages:]
+            del self._textareas_with_deferred_layout[num_deferred_textareas:]
+            raise
+
+    def _add_pages_with_text(self, text: str | Iterable[str], page_template: PageTemplate) -> list[Page]:
+        page, first_textarea = self._add_page_from_template(page_template)
+        pages = [page]
+        if isinstance(text, str):
+            first_textarea.add_text(text)
+        else:
+            first_textarea.add_text_stream(text)
+        first_textarea._run_deferred_layout()
+        textarea = first_textarea
+        while first_textarea._has_words_in_buffer():
+            if textarea is not first_textarea and textarea._is_empty():
+                raise ValueError("Text does not fit into the text area of the page template.")
+            page, textarea = self._add_page_from_template(page_template)
+            pages.append(page)
+            first_textarea.link_textarea(textarea)
+            first_textarea._run_deferred_layout()
+        return pages
+
+    def _add_page_from_template(self, page_template: PageTemplate) -> tuple[Page, TextArea]:
+        page = self.add_page(page_template.width, page_template.height)
+        textarea = self.create_textarea(
+            page_template.textarea_x,
+            page_template.textarea_y,
+            page_template.textarea_width,
+            page_template.textarea_height,
+        )
+        page.add_content(textarea)
+        return page, textarea
+
+    def _run_deferred_layout(self) -> None:
+        textareas = self._textareas_with_deferred_layout
+        self._textareas_with_deferred_layout = []
+        for textarea in textareas:
+            textarea._run_deferred_layout()
+
     def export(self, data_type: str = "dto") -> Dto:
+        self._run_deferred_layout()
         match data_type:
             case "dto":
                 return dto_build(self)
             case _:
                 raise NotImplementedError("Not implemented data type.")
+
+    def iter_export(self) -> Iterator[DtoFont | DtoPage]:
+        """Exports the document one page at a time.
+
+        The Dtos of the fonts are yielded first, followed by the Dto of every page in order. A page
+        is generated only when it is requested, so a renderer can write each page and drop it before
+        the next one is generated. Dtos of a page reference their parents, so a dropped page is
+        freed when the garbage collector runs. The document must not be changed until the
+        iteration ends.
+
+        Yields:
+            DtoFont | DtoPage: Dtos of the fonts, then Dtos of the pages.
+        """
+        self._run_deferred_layout()
+        yield from dto_build_iter(self)
+
+
+def _check_page_template(page_template: PageTemplate) -> None:
+    if page_template.width <= 0 or page_template.height <= 0:
+        raise ValueError("Page of the page template must have a positive width and height.")
+    if page_template.textarea_width <= 0 or page_template.textarea_height <= 0:
+        raise ValueError("Text area of the page template must have a positive width and height.")
+    if (
+        page_template.textarea_x < 0
+        or page_template.textarea_y < 0
+        or page_template.textarea_x + page_template.textarea_width > page_template.width
+        or page_template.textarea_y + page_template.textarea_height > page_template.height
+    ):
+        raise ValueError("Text area of the page template must lie on the page.")
@@ -6,11 +6,16 @@ transferring document information between modules.
 
 from __future__ import annotations
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import TYPE_CHECKING
 
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from docugenr8_core.document import Document
+    from docugenr8_core.page import Page
 
 from docugenr8_shared.dto import Dto
 from docugenr8_shared.dto import DtoArc
@@ -40,6 +45,7 @@ from docugenr8_core.shapes import Rotation
 from docugenr8_core.shapes import Skew
 from docugenr8_core.svg import Svg
 from docugenr8_core.text_area.fragment import Fragment
+from docugenr8_core.text_area.page_number_overlay import PageNumberOverlay
 from docugenr8_core.text_area.paragraph import Paragraph
 from docugenr8_core.text_area.textarea import TextArea
 from docugenr8_core.text_area.textline import TextLine
@@ -47,39 +53,203 @@ from docugenr8_core.text_area.word import Word
 from docugenr8_core.text_box import TextBox
 
 
+MAX_PAGE_NUMBER_PASSES = 10
+
+
 def dto_build(doc: Document) -> Dto:
     dto = Dto()
-    for font_name, font in doc.fonts.items():
-        dto_font = DtoFont(font_name, font.raw_data)
-        dto.fonts.append(dto_font)
-    for page_number, page in enumerate(doc.pages):
-        dto_page = DtoPage(page._width, page._height)
+    overlay = _resolve_page_numbers(doc)
+    total_pages = len(doc.pages)
+    stale_page_indexes = [
+        page_idx
+        for page_idx, page in enumerate(doc.pages)
+        if page._dto_page is None or not _is_dto_page_current(page, page_idx + 1, total_pages)
+    ]
+    generated_dto_pages = dict(
+        zip(stale_page_indexes, _generate_dto_pages(doc, overlay, stale_page_indexes), strict=True)
+    )
+    for page_idx, page in enumerate(doc.pages):
+        dto_page = page._dto_page
+        if dto_page is None or page_idx in generated_dto_pages:
+            dto_page = generated_dto_pages[page_idx]
+            page._dto_page = dto_page
+            page._dto_page_key = _get_dto_page_key(page, page_idx + 1, total_pages)
+            page._used_unicodes = None
         dto.pages.append(dto_page)
-        for content in page._contents:
-            match content:
-                case TextArea():
-                    content._build_current_page_fragments(page_number + 1)
-                    content._build_total_pages_fragments(len(doc.pages))
-                    dto_page.contents.append(generate_dto_text_area(content))
-                case TextBox():
-                    content._text_area._build_current_page_fragments(page_number + 1)
-                    content._text_area._build_total_pages_fragments(len(doc.pages))
-                    dto_page.contents.append(generate_dto_textbox(content))
-                case Curve():
-                    dto_page.contents.append(generate_dto_curve(content))
-                case Rectangle():
-                    dto_page.contents.append(generate_dto_rectangle(content))
-                case Arc():
-                    dto_page.contents.append(generate_dto_arc(content))
-                case Ellipse():
-                    dto_page.contents.append(generate_dto_ellipse(content))
-                case Svg():
-                    dto_page.contents.extend(content.build_elements())
-                case _:
-                    raise TypeError("Invalid content type to generate Dto in Core module.")
+    dto.fonts.extend(_generate_dto_fonts(doc, overlay))
     return dto
 
 
+def dto_build_iter(doc: Document) -> Iterator[DtoFont | DtoPage]:
+    """Yields the Dtos of the fonts and then the Dto of every page, generating each page when it is requested.
+
+    Generated pages are not kept on the pages of the document, so only the page that is being
+    generated is held in memory. Pages kept by an earlier dto_build that did not change are reused.
+    """
+    overlay = _resolve_page_numbers(doc)
+    yield from _generate_dto_fonts(doc, overlay)
+    total_pages = len(doc.pages)
+    for page_number, page in enumerate(doc.pages, 1):
+        dto_page = page._dto_page
+        if dto_page is None or not _is_dto_page_current(page, page_number, total_pages):
+            dto_page = generate_dto_page(page, overlay)
+        yield dto_page
+
+
+def _generate_dto_pages(doc: Document, overlay: PageNumberOverlay, page_indexes: list[int]) -> list[DtoPage]:
+    workers = doc.settings.export_workers
+    if (
+        workers <= 1
+        or len(page_indexes) < doc.settings.export_parallel_min_pages
+        or "fork" not in multiprocessing.get_all_start_methods()
+    ):
+        return [generate_dto_page(doc.pages[page_idx], overlay) for page_idx in page_indexes]
+    # workers are forked after layout, so they inherit the document and only page indexes are sent to them,
+    # the Dtos of the pages are pickled back and merged in order
+    chunk_size = -(-len(page_indexes) // workers)
+    chunks = [
+        page_indexes[chunk_start : chunk_start + chunk_size] for chunk_start in range(0, len(page_indexes), chunk_size)
+    ]
+    with ProcessPoolExecutor(
+        len(chunks),
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_set_forked_document,
+        initargs=(doc, overlay),
+    ) as pool:
+        return [dto_page for dto_pages in pool.map(_generate_forked_dto_pages, chunks) for dto_page in dto_pages]
+
+
+_forked_document: tuple[Document, PageNumberOverlay] | None = None
+
+
+def _set_forked_document(doc: Document, overlay: PageNumberOverlay) -> None:
+    global _forked_document
+    _forked_document = (doc, overlay)
+
+
+def _generate_forked_dto_pages(page_indexes: list[int]) -> list[DtoPage]:
+    if _forked_document is None:
+        raise ValueError("Document is not set in the export worker.")
+    doc, overlay = _forked_document
+    return [generate_dto_page(doc.pages[page_idx], overlay) for page_idx in page_indexes]
+
+
+def _generate_dto_fonts(doc: Document, overlay: PageNumberOverlay) -> list[DtoFont]:
+    if not doc.settings.font_subsetting:
+        return [DtoFont(font_name, font.raw_data) for font_name, font in doc.fonts.items()]
+    # fonts are subset after page numbers are filled in, so that their digits are included
+    used_unicodes: dict[str, set[int]] = {}
+    total_pages = len(doc.pages)
+    for page_number, page in enumerate(doc.pages, 1):
+        if _is_dto_page_current(page, page_number, total_pages):
+            if page._used_unicodes is None:
+                page._used_unicodes = _collect_used_unicodes(page, overlay)
+            page_used_unicodes = page._used_unicodes
+        else:
+            page_used_unicodes = _collect_used_unicodes(page, overlay)
+        for font_name, unicodes in page_used_unicodes.items():
+            used_unicodes.setdefault(font_name, set()).update(unicodes)
+    return [
+        DtoFont(font_name, font._subset(used_unicodes.get(font_name, set()))) for font_name, font in doc.fonts.items()
+    ]
+
+
+def generate_dto_page(page: Page, overlay: PageNumberOverlay) -> DtoPage:
+    """Generates the Dto of the page with the Dtos of its contents."""
+    dto_page = DtoPage(page._width, page._height)
+    for content in page._contents:
+        match content:
+            case TextArea():
+                dto_page.contents.append(generate_dto_text_area(content, overlay))
+            case TextBox():
+                dto_page.contents.append(generate_dto_textbox(content, overlay))
+            case Curve():
+                dto_page.contents.append(generate_dto_curve(content))
+            case Rectangle():
+                dto_page.contents.append(generate_dto_rectangle(content))
+            case Arc():
+                dto_page.contents.append(generate_dto_arc(content))
+            case Ellipse():
+                dto_page.contents.append(generate_dto_ellipse(content))
+            case Svg():
+                dto_page.contents.extend(content.build_elements())
+            case _:
+                raise TypeError("Invalid content type to generate Dto in Core module.")
+    return dto_page
+
+
+def _get_dto_page_key(page: Page, page_number: int, total_pages: int) -> tuple[int, ...] | None:
+    # page numbers are in the key only when the text of the page shows them,
+    # so adding a page exports again only the pages that show the number of pages
+    key = [page._version, 0, 0]
+    for content in page._contents:
+        match content:
+            case TextArea():
+                text_area = content
+            case TextBox():
+                text_area = content._text_area
+            case _:
+                # shapes and svg images are changed through their attributes, pages with them are exported every time
+                return None
+        key.append(text_area._version)
+        if len(text_area._words_with_current_page_fragments) > 0:
+            key[1] = page_number
+        if len(text_area._words_with_total_pages_fragments) > 0:
+            key[2] = total_pages
+    return tuple(key)
+
+
+def _is_dto_page_current(page: Page, page_number: int, total_pages: int) -> bool:
+    if page._dto_page is None or page._dto_page_key is None:
+        return False
+    return _get_dto_page_key(page, page_number, total_pages) == page._dto_page_key
+
+
+def _resolve_page_numbers(doc: Document) -> PageNumberOverlay:
+    # all page numbers are set before the textlines that no longer fit are reflowed,
+    # the next pass sets page numbers of words that the reflow moved to other pages
+    total_pages = len(doc.pages)
+    overlay = PageNumberOverlay()
+    for _ in range(MAX_PAGE_NUMBER_PASSES):
+        overflowing_textlines: list[tuple[TextArea, list[TextLine]]] = []
+        for page_number, page in enumerate(doc.pages, 1):
+            for content in page._contents:
+                match content:
+                    case TextArea():
+                        text_area = content
+                    case TextBox():
+                        text_area = content._text_area
+                    case _:
+                        continue
+                textlines = text_area._set_page_numbers(page_number, total_pages, overlay)
+                if len(textlines) > 0:
+                    overflowing_textlines.append((text_area, textlines))
+        if len(overflowing_textlines) == 0:
+            break
+        for text_area, textlines in overflowing_textlines:
+            text_area._reflow_overflowing_textlines(textlines)
+    return overlay
+
+
+def _collect_used_unicodes(page: Page, overlay: PageNumberOverlay) -> dict[str, set[int]]:
+    used_unicodes: dict[str, set[int]] = {}
+    for content in page._contents:
+        match content:
+            case TextArea():
+                text_area = content
+            case TextBox():
+                text_area = content._text_area
+            case _:
+                continue
+        for paragraph in text_area._paragraphs:
+            for textline in paragraph._textlines:
+                for word in textline._words:
+                    for fragment in word._fragments:
+                        chars = overlay._get_chars(fragment)
+                        used_unicodes.setdefault(fragment._font_name, set()).update(map(ord, chars))
+    return used_unicodes
+
+
 def generate_dto_ellipse(content: Ellipse) -> DtoEllipse:
     dto_ellipse = DtoEllipse(
         content.x,
@@ -239,13 +409,13 @@ def generate_dto_curve(content: Curve) -> DtoCurve:
     return dto_curve
 
 
-def generate_dto_textbox(textbox: TextBox) -> DtoTextBox:
+def generate_dto_textbox(textbox: TextBox, overlay: PageNumberOverlay) -> DtoTextBox:
     dto_textbox = DtoTextBox(textbox._x, textbox._y, textbox._width, textbox._height)
     dto_textbox._fill_color = textbox._fill_color
     dto_textbox._line_color = textbox._line_color
     dto_textbox._line_width = textbox._line_width
     dto_textbox._line_pattern = textbox._line_pattern
-    dto_textbox._text_area = generate_dto_text_area(textbox._text_area)
+    dto_textbox._text_area = generate_dto_text_area(textbox._text_area, overlay)
     return dto_textbox
 
 
@@ -254,26 +424,29 @@ def _generate_dto_fragment(
     y: float,
     dto_word: DtoWord,
     fragment: Fragment,
+    overlay: PageNumberOverlay,
 ) -> DtoFragment:
-    """Generate Dto fragment object. Dto fragment object is the smallest posible object that holds one character.
+    """Generate Dto fragment object. Dto fragment object is the smallest posible object, it holds a run of characters.
 
     Args:
         x (float): x position of the fragment
         y (float): y position of the fragment
         dto_word (DtoWord): Parent Dto word object
         fragment (Fragment): Word fragment from text area
+        overlay (PageNumberOverlay): Page numbers of the export
 
     Returns:
         DtoFragment: Dto fragment object
     """
+    style = fragment._style
     dto_fragment = DtoFragment(x, y, dto_word)
     dto_fragment.width = fragment._width
-    dto_fragment.height = fragment._height
-    dto_fragment.baseline = y + fragment._ascent
-    dto_fragment.chars = fragment._chars
-    dto_fragment.font_name = fragment._font_name
-    dto_fragment.font_size = fragment._font_size
-    dto_fragment.font_color = fragment._font_color
+    dto_fragment.height = style.height
+    dto_fragment.baseline = y + style.ascent
+    dto_fragment.chars = overlay._get_chars(fragment)
+    dto_fragment.font_name = style.font_name
+    dto_fragment.font_size = style.font_size
+    dto_fragment.font_color = style.font_color
     return dto_fragment
 
 
@@ -282,6 +455,7 @@ def _generate_dto_word(
     y: float,
     dto_textline: DtoTextLine,
     word: Word,
+    overlay: PageNumberOverlay,
 ) -> DtoWord:
     """_summary_.
 
@@ -290,6 +464,7 @@ def _generate_dto_word(
         y (float): _description_
         dto_textline (DtoTextLine): _description_
         word (Word): _description_
+        overlay (PageNumberOverlay): _description_
 
     Returns:
         DtoWord: _description_
@@ -300,7 +475,7 @@ def _generate_dto_word(
     dto_word.baseline = y + word._ascent
     dto_word.justify_space = word._justify_space
     for fragment in word._fragments:
-        dto_fragment = _generate_dto_fragment(x, y + (word._ascent - fragment._ascent), dto_word, fragment)
+        dto_fragment = _generate_dto_fragment(x, y + (word._ascent - fragment._ascent), dto_word, fragment, overlay)
         dto_word.fragments.append(dto_fragment)
         dto_word.textline.fragments.append(dto_fragment)
         dto_word.textline.paragraph.fragments.append(dto_fragment)
@@ -310,7 +485,12 @@ def _generate_dto_word(
 
 
 def _generate_dto_textline(
-    x: float, y: float, dto_paragraph: DtoParagraph, textline: TextLine, justify_padding_after: float
+    x: float,
+    y: float,
+    dto_paragraph: DtoParagraph,
+    textline: TextLine,
+    justify_padding_after: float,
+    overlay: PageNumberOverlay,
 ) -> DtoTextLine:
     dto_textline = DtoTextLine(x, y, dto_paragraph, justify_padding_after)
     dto_textline.width = textline._width
@@ -331,9 +511,9 @@ def _generate_dto_textline(
             justify_space = _calculate_justify_space(textline)
     x += x_offset
     for word in textline._words:
-        dto_word = _generate_dto_word(x, y + (textline._ascent - word._ascent), dto_textline, word)
+        dto_word = _generate_dto_word(x, y + (textline._ascent - word._ascent), dto_textline, word, overlay)
         dto_textline.words.append(dto_word)
-        if word._chars == " ":
+        if word._is_space():
             x += dto_word.width + justify_space
         else:
             x += dto_word.width
@@ -348,11 +528,11 @@ def _generate_dto_paragraph(
     should_distrubute_space_in_lines: bool,
     height_diff: float,
     last_paragraph: bool,
+    overlay: PageNumberOverlay,
 ) -> DtoParagraph:
     dto_paragraph = DtoParagraph(x, y, dto_text_area)
     dto_paragraph.width = paragraph._width
     dto_paragraph.height = paragraph._height
-    dto_paragraph.chars = paragraph._get_chars()
     dto_paragraph.tab_size = paragraph._tab_size
     dto_paragraph.line_height_ratio = paragraph._line_height_ratio
     dto_paragraph.first_line_indent = paragraph._first_line_indent
@@ -381,6 +561,7 @@ def _generate_dto_paragraph(
             dto_paragraph,
             line,
             line_justify_padding,
+            overlay,
         )
         dto_paragraph.textlines.append(dto_textline)
         y += dto_textline.height
@@ -388,10 +569,11 @@ def _generate_dto_paragraph(
         y += dto_textline.justify_padding_after
     y += dto_paragraph.space_after
     dto_paragraph.height += height_diff
+    dto_paragraph.chars = "".join([dto_fragment.chars for dto_fragment in dto_paragraph.fragments])
     return dto_paragraph
 
 
-def generate_dto_text_area(text_area: TextArea) -> DtoTextArea:
+def generate_dto_text_area(text_area: TextArea, overlay: PageNumberOverlay) -> DtoTextArea:
     y_offset: float = 0.0
     between_paragraphs_padding: float = 0.0
     should_distrubute_space_in_lines: bool = False
@@ -431,7 +613,14 @@ def generate_dto_text_area(text_area: TextArea) -> DtoTextArea:
                 last_paragraph = True
         # ******************************
         dto_paragraph = _generate_dto_paragraph(
-            text_area._x, y, paragraph, dto_text_area, should_distrubute_space_in_lines, height_diff, last_paragraph
+            text_area._x,
+            y,
+            paragraph,
+            dto_text_area,
+            should_distrubute_space_in_lines,
+            height_diff,
+            last_paragraph,
+            overlay,
         )
         dto_text_area.paragraphs.append(dto_paragraph)
         # ******************************
@@ -454,7 +643,7 @@ def _calculate_justify_space(textline: TextLine) -> float:
     end_pos = _get_index_last_not_empty_space_word(textline)
     num_inner_words = 0
     for i in range(start_pos, end_pos):
-        if textline._words[i]._chars == " ":
+        if textline._words[i]._is_space():
             num_inner_words += 1
     if num_inner_words == 0:
         return 0
@@ -462,7 +651,7 @@ def _calculate_justify_space(textline: TextLine) -> float:
 
 
 def _textline_has_only_empty_spaces(textline: TextLine) -> bool:
-    return all(word._chars in {" ", "\t", "\n"} for word in textline._words)
+    return all(word._is_whitespace() for word in textline._words)
 
 
 def _textline_has_only_one_word(textline: TextLine) -> bool:
@@ -473,13 +662,13 @@ def _textline_has_only_one_word(textline: TextLine) -> bool:
 
 def _get_index_first_not_empty_space_word(textline: TextLine) -> int:
     for index, word in enumerate(textline._words):
-        if word._chars not in {" ", "\t", "\n"}:
+        if not word._is_whitespace():
             return index
     raise ValueError("Could not obtain index for the first word that" " is not empty space.")
 
 
 def _get_index_last_not_empty_space_word(textline: TextLine) -> int:
     for index, word in enumerate(reversed(textline._words)):
-        if word._chars not in {" ", "\t", "\n"}:
+        if not word._is_whitespace():
             return len(textline._words) - index - 1
     raise ValueError("Could not obtain index for the last word that" " is not empty space.")
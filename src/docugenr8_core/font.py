@@ -1,13 +1,95 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import io
+import mmap
 import os
 import pathlib
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable
 from io import BytesIO
+from typing import Any
 
+from fontTools import subset
 from fontTools import ttLib
 
 
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None  # type: ignore[assignment]
+
+
 TAB = 9
 NEW_LINE = 10
 SPACE = 32
+BMP_SIZE = 0x10000
+# metrics cache file: header, advances of the BMP code points, astral code points and their advances
+METRICS_MAGIC = b"DGMC"
+METRICS_VERSION = 1
+METRICS_HEADER = struct.Struct("<4sHHhhHI6x")
+SUBSET_CACHE_SIZE = 16
+
+
+class _FontFileReader(io.RawIOBase):
+    """Seekable stream over the font file map, so fontTools reads tables from it without copying the file.
+
+    Every parsed font reads from its own reader, since fontTools seeks to every table before reading it.
+    """
+
+    def __init__(self, data: memoryview) -> None:
+        self._data = data
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._data)
+        self._position = max(0, offset)
+        return self._position
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._data[self._position : self._position + len(buffer)]
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+class _ParsedFont:
+    """Lazily parsed font and font subsets, shared by a font and its renamed copies.
+
+    Fonts from the registry are used by documents in several threads, so the parsed font and the
+    subsets are read and written only while holding the lock.
+    """
+
+    __slots__ = (
+        "cmap",
+        "lock",
+        "subsets",
+        "ttfont",
+    )
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.ttfont: Any = None
+        self.cmap: dict[int, str] | None = None
+        self.subsets: OrderedDict[frozenset[int], bytes] = OrderedDict()
 
 
 class Font:
@@ -15,29 +97,263 @@ class Font:
         self,
         font_name: str,
         path: str,
+        metrics_cache_dir: str | None = None,
     ) -> None:
         self.name = font_name
-        self.raw_data = pathlib.Path(_resolve_file_path(path)).read_bytes()
-        self.ttfont = ttLib.TTFont(BytesIO(self.raw_data), recalcTimestamp=False)
-        self.cmap = self.ttfont.getBestCmap()
-        self.em: float = self.ttfont["head"].unitsPerEm  # type: ignore
-        self.ascent_per_em: float = self.ttfont["hhea"].ascent  # type: ignore
-        self.descent_per_em: float = self.ttfont["hhea"].descent  # type: ignore
+        font_path = _resolve_file_path(path)
+        with font_path.open("rb") as font_file:
+            self._font_file_map = mmap.mmap(font_file.fileno(), 0, access=mmap.ACCESS_READ)
+            font_stat = os.fstat(font_file.fileno())
+        # read-only view of the font file, it is shared with the DTOs without copying the font data
+        self.raw_data = memoryview(self._font_file_map)
+        self._parsed = _ParsedFont()
+        self._metrics_cache: mmap.mmap | None = None
+        self._load_metrics(font_path, font_stat, metrics_cache_dir)
         self.line_height_per_em: float = self.ascent_per_em - self.descent_per_em
+        self._bmp_advances_np: Any = None
+        if np is not None:
+            self._bmp_advances_np = np.frombuffer(self._bmp_advances, dtype=np.uint16)
+
+    @property
+    def ttfont(self) -> Any:
+        """Parsed font, loaded on first access because layout needs only the metrics tables."""
+        parsed = self._parsed
+        with parsed.lock:
+            if parsed.ttfont is None:
+                parsed.ttfont = self._parse()
+            return parsed.ttfont
+
+    def _parse(self) -> Any:
+        # lazy parsing reads the tables from the font file map, otherwise fontTools copies the whole file
+        return ttLib.TTFont(_FontFileReader(self.raw_data), recalcTimestamp=False, lazy=True)
+
+    @property
+    def cmap(self) -> dict[int, str]:
+        """Best unicode cmap of the font, loaded on first access."""
+        parsed = self._parsed
+        with parsed.lock:
+            if parsed.cmap is None:
+                parsed.cmap = self.ttfont.getBestCmap()
+            return parsed.cmap
+
+    def _build_advance_table(self) -> None:
+        """Builds codepoint to advance width lookup tables in font units.
+
+        Code points from the Basic Multilingual Plane are stored in a dense array indexed by code point,
+        all other code points are stored in a sparse dictionary. Code points not defined in the font
+        have the advance width of the `.notdef` glyph.
+        """
+        metrics = self.ttfont["hmtx"].metrics
+        self._notdef_advance: int = metrics[".notdef"][0]
+        self._bmp_advances: array[int] | memoryview = array("H", [self._notdef_advance]) * BMP_SIZE
+        self._astral_advances: dict[int, int] = {}
+        for unicode, glyph_name in self.cmap.items():
+            glyph_width = metrics[glyph_name][0] if glyph_name in metrics else self._notdef_advance
+            if unicode < BMP_SIZE:
+                self._bmp_advances[unicode] = glyph_width
+            else:
+                self._astral_advances[unicode] = glyph_width
+        self._bmp_advances[TAB] = 0
+        self._bmp_advances[NEW_LINE] = 0
+
+    def _load_metrics(
+        self,
+        font_path: pathlib.Path,
+        font_stat: os.stat_result,
+        metrics_cache_dir: str | None,
+    ) -> None:
+        """Loads font metrics from the metrics cache, or from the font file and writes the missing cache files.
+
+        The cache is looked up by the path, size and modification time of the font file first, so a cached
+        font is loaded without reading the font file. Only on a miss the font file is hashed and the cache
+        looked up by its content, which finds the metrics of a copied or touched font file.
+        """
+        missing_cache_paths: list[pathlib.Path] = []
+        if metrics_cache_dir is not None:
+            cache_dir = _resolve_file_path(metrics_cache_dir)
+            file_key = f"{font_path.resolve()}\0{font_stat.st_size}\0{font_stat.st_mtime_ns}"
+            file_cache_path = cache_dir / f"{hashlib.sha256(file_key.encode()).hexdigest()}.metrics"
+            if self._load_metrics_cache(file_cache_path):
+                return
+            missing_cache_paths.append(file_cache_path)
+            content_cache_path = cache_dir / f"{hashlib.sha256(self.raw_data).hexdigest()}.metrics"
+            if self._load_metrics_cache(content_cache_path):
+                self._save_metrics_cache(file_cache_path)
+                return
+            missing_cache_paths.append(content_cache_path)
+        self.em: float = self.ttfont["head"].unitsPerEm
+        self.ascent_per_em: float = self.ttfont["hhea"].ascent
+        self.descent_per_em: float = self.ttfont["hhea"].descent
+        self._build_advance_table()
+        for cache_path in missing_cache_paths:
+            self._save_metrics_cache(cache_path)
+
+    def _load_metrics_cache(self, cache_path: pathlib.Path) -> bool:
+        """Loads font metrics from a metrics cache file by memory mapping it.
+
+        Returns:
+            bool: False if the cache file is missing or was written in an incompatible format.
+        """
+        try:
+            with cache_path.open("rb") as cache_file:
+                metrics_cache = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        if len(metrics_cache) < METRICS_HEADER.size:
+            metrics_cache.close()
+            return False
+        magic, version, em, ascent, descent, notdef_advance, num_astral = METRICS_HEADER.unpack_from(metrics_cache)
+        astral_offset = METRICS_HEADER.size + 2 * BMP_SIZE
+        if (
+            magic != METRICS_MAGIC
+            or version != METRICS_VERSION
+            or len(metrics_cache) != astral_offset + 6 * num_astral
+            or sys.byteorder != "little"
+        ):
+            metrics_cache.close()
+            return False
+        self._metrics_cache = metrics_cache
+        self.em = em
+        self.ascent_per_em = ascent
+        self.descent_per_em = descent
+        self._notdef_advance = notdef_advance
+        self._bmp_advances = memoryview(metrics_cache)[METRICS_HEADER.size : astral_offset].cast("H")
+        astral_unicodes = array("I", metrics_cache[astral_offset : astral_offset + 4 * num_astral])
+        astral_widths = array("H", metrics_cache[astral_offset + 4 * num_astral :])
+        self._astral_advances = dict(zip(astral_unicodes, astral_widths, strict=True))
+        return True
+
+    def _save_metrics_cache(self, cache_path: pathlib.Path) -> None:
+        """Writes font metrics into a metrics cache file.
+
+        The file is written under a temporary name and renamed, so concurrent workers never read a partial
+        file. Failing to write the cache does not prevent the font from loading.
+        """
+        if sys.byteorder != "little":
+            return
+        header = METRICS_HEADER.pack(
+            METRICS_MAGIC,
+            METRICS_VERSION,
+            self.em,
+            self.ascent_per_em,
+            self.descent_per_em,
+            self._notdef_advance,
+            len(self._astral_advances),
+        )
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=cache_path.parent, delete=False) as cache_file:
+                cache_file.write(header)
+                cache_file.write(self._bmp_advances)
+                cache_file.write(array("I", self._astral_advances.keys()))
+                cache_file.write(array("H", self._astral_advances.values()))
+            os.replace(cache_file.name, cache_path)
+        except OSError:
+            return
+
+    def _subset(self, unicodes: Iterable[int]) -> bytes:
+        """Returns the font file subset to the glyphs of the given code points.
+
+        Subsets are cached per font. A cached subset built for a superset of the requested code points is
+        reused, so repeated exports of similar content do not run the subsetter again.
+        """
+        unicodes = frozenset(unicodes)
+        subsets = self._parsed.subsets
+        with self._parsed.lock:
+            for cached_unicodes, cached_subset in reversed(subsets.items()):
+                if unicodes <= cached_unicodes:
+                    subsets.move_to_end(cached_unicodes)
+                    return cached_subset
+            # the subsetter changes the parsed font, so it gets a font of its own
+            ttfont = self._parse()
+            subsetter = subset.Subsetter(subset.Options(recalc_timestamp=False))
+            subsetter.populate(unicodes=unicodes)
+            subsetter.subset(ttfont)
+            font_file = BytesIO()
+            ttfont.save(font_file)
+            subsets[unicodes] = font_file.getvalue()
+            while len(subsets) > SUBSET_CACHE_SIZE:
+                subsets.popitem(last=False)
+            return subsets[unicodes]
+
+    def _renamed(self, font_name: str) -> Font:
+        """Returns a copy of the font under another name that shares the font data, parsed font and subsets."""
+        font = copy.copy(self)
+        font.name = font_name
+        return font
 
     def _get_char_width(self, char: str, font_size: float) -> float:
         unicode = ord(char)
-        if unicode in {TAB, NEW_LINE}:
-            return 0.0
-        try:
-            glyph_name = self.cmap[unicode]
-            glyph_width = self.ttfont["hmtx"].metrics[glyph_name][0]  # type: ignore
-        # for unicodes not defined in font
-        except KeyError:
-            glyph_name = ".notdef"
-            glyph_width = self.ttfont["hmtx"].metrics[glyph_name][0]  # type: ignore
+        if unicode < BMP_SIZE:
+            glyph_width = self._bmp_advances[unicode]
+        else:
+            glyph_width = self._astral_advances.get(unicode, self._notdef_advance)
         return font_size * glyph_width / self.em
 
+    def measure(self, text: str, font_size: float) -> tuple[float, Any]:
+        """Measures a string in one call.
+
+        Args:
+            text (str): Text to measure.
+            font_size (float): Font size used for measuring.
+
+        Returns:
+            tuple[float, Any]: Total width of the text and the advance width of every character.
+                Advances are a NumPy array when NumPy is installed, otherwise an `array('d')`.
+        """
+        if np is not None:
+            advances = self._measure_np(text, font_size)
+            return float(advances.sum()), advances
+        advances = self._measure_array(text, font_size)
+        return sum(advances), advances
+
+    def measure_many(self, texts: Iterable[str], font_size: float) -> tuple[list[float], list[Any]]:
+        """Measures several strings in one call.
+
+        Args:
+            texts (Iterable[str]): Texts to measure.
+            font_size (float): Font size used for measuring.
+
+        Returns:
+            tuple[list[float], list[Any]]: Total width of every text and advance widths of its characters.
+        """
+        texts = list(texts)
+        if np is None:
+            all_advances = [self._measure_array(text, font_size) for text in texts]
+            return [sum(advances) for advances in all_advances], all_advances
+        if len(texts) == 0:
+            return [], []
+        advances = self._measure_np("".join(texts), font_size)
+        offsets = np.cumsum([len(text) for text in texts])[:-1]
+        all_advances = np.split(advances, offsets)
+        return [float(advances.sum()) for advances in all_advances], all_advances
+
+    def _measure_np(self, text: str, font_size: float) -> Any:
+        # lone surrogates are valid in str, they are measured as their code points like in _measure_array
+        unicodes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        glyph_widths = np.full(len(unicodes), self._notdef_advance, dtype=np.float64)
+        in_bmp = unicodes < BMP_SIZE
+        glyph_widths[in_bmp] = self._bmp_advances_np[unicodes[in_bmp]]
+        if len(self._astral_advances) > 0:
+            for index in np.flatnonzero(~in_bmp):
+                glyph_widths[index] = self._astral_advances.get(int(unicodes[index]), self._notdef_advance)
+        return font_size * glyph_widths / self.em
+
+    def _measure_array(self, text: str, font_size: float) -> array[float]:
+        bmp_advances = self._bmp_advances
+        astral_advances = self._astral_advances
+        notdef_advance = self._notdef_advance
+        em = self.em
+        return array(
+            "d",
+            [
+                font_size
+                * (bmp_advances[unicode] if unicode < BMP_SIZE else astral_advances.get(unicode, notdef_advance))
+                / em
+                for unicode in map(ord, text)
+            ],
+        )
+
     def _get_ascent(self, font_size: float) -> float:
         return font_size * (self.ascent_per_em / self.em)
 
@@ -48,6 +364,98 @@ class Font:
         return font_size * (self.line_height_per_em / self.em)
 
 
+class FontRegistry:
+    """Process-wide registry of loaded fonts shared by all documents.
+
+    Fonts are keyed by the resolved path and modification time of the font file and by the font name,
+    so a font file is loaded once per process and documents adding it under the same name share the
+    same `Font` object. Fonts of one file under different names share the font data, metric tables,
+    parsed font and subsets. The least recently used fonts are dropped when the registry holds more
+    than `max_size` unpinned fonts.
+    """
+
+    def __init__(self, max_size: int = 64) -> None:
+        self.max_size = max_size
+        self._fonts: OrderedDict[tuple[str, int, str], Font] = OrderedDict()
+        self._pinned: set[tuple[str, int]] = set()
+        self._lock = threading.Lock()
+
+    def get(self, font_name: str, path: str, metrics_cache_dir: str | None = None) -> Font:
+        """Returns the font for a font file, loading it only if it is not in the registry.
+
+        Args:
+            font_name (str): Name of the font in the document.
+            path (str): Path to the font file.
+            metrics_cache_dir (str | None): Metrics cache directory used if the font has to be loaded.
+
+        Returns:
+            Font: Font shared by all documents that add the font file under the same name.
+        """
+        return self._get_or_load(font_name, _get_registry_key(path), metrics_cache_dir)
+
+    def preload(self, path: str, metrics_cache_dir: str | None = None, pin: bool = True) -> Font:
+        """Loads a font into the registry, typically at worker startup.
+
+        Args:
+            path (str): Path to the font file.
+            metrics_cache_dir (str | None): Metrics cache directory used if the font has to be loaded.
+            pin (bool): Pinned fonts are never dropped from the registry.
+
+        Returns:
+            Font: Shared font object, named after the font file.
+        """
+        file_key = _get_registry_key(path)
+        font = self._get_or_load(pathlib.Path(file_key[0]).stem, file_key, metrics_cache_dir)
+        if pin:
+            with self._lock:
+                self._pinned.add(file_key)
+        return font
+
+    def unpin(self, path: str) -> None:
+        """Allows a preloaded font to be dropped from the registry again."""
+        with self._lock:
+            self._pinned.discard(_get_registry_key(path))
+            self._drop_least_recently_used()
+
+    def clear(self) -> None:
+        """Removes all fonts, including the pinned ones, from the registry."""
+        with self._lock:
+            self._fonts.clear()
+            self._pinned.clear()
+
+    def _get_or_load(self, font_name: str, file_key: tuple[str, int], metrics_cache_dir: str | None) -> Font:
+        key = (*file_key, font_name)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                return font
+            # the font file may be loaded under another name already
+            loaded_font = next((font for font_key, font in self._fonts.items() if font_key[:2] == file_key), None)
+        if loaded_font is not None:
+            font = loaded_font._renamed(font_name)
+        else:
+            font = Font(font_name, file_key[0], metrics_cache_dir)
+        with self._lock:
+            font = self._fonts.setdefault(key, font)
+            self._fonts.move_to_end(key)
+            self._drop_least_recently_used()
+        return font
+
+    def _drop_least_recently_used(self) -> None:
+        unpinned_keys = [key for key in self._fonts if key[:2] not in self._pinned]
+        for key in unpinned_keys[: max(0, len(unpinned_keys) - self.max_size)]:
+            del self._fonts[key]
+
+
+def _get_registry_key(path: str) -> tuple[str, int]:
+    resolved_path = _resolve_file_path(path).resolve()
+    return (str(resolved_path), resolved_path.stat().st_mtime_ns)
+
+
+font_registry = FontRegistry()
+
+
 def _resolve_file_path(path: str) -> pathlib.Path:
     root_dir = pathlib.Path(os.getcwd())
     return root_dir / path
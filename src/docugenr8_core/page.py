@@ -1,8 +1,36 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+
+if TYPE_CHECKING:
+    from docugenr8_shared.dto import DtoPage
+
+
 class Page:
     def __init__(self, width: float, height: float) -> None:
         self._width = width
         self._height = height
         self._contents: list[object] = []
+        # changes when content is added, exported pages are reused while it stays the same
+        self._version: int = 0
+        # the exported page, the key it was exported with and the unicodes used by its fonts
+        self._dto_page: DtoPage | None = None
+        self._dto_page_key: tuple[int, ...] | None = None
+        self._used_unicodes: dict[str, set[int]] | None = None
 
     def add_content(self, content: object) -> None:
         self._contents.append(content)
+        self._version += 1
+
+
+class PageTemplate(NamedTuple):
+    """Size of the pages that Document.flow_text adds and the box of the text area on every page."""
+
+    width: float
+    height: float
+    textarea_x: float
+    textarea_y: float
+    textarea_width: float
+    textarea_height: float
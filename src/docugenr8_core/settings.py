@@ -1,9 +1,28 @@
 from collections.abc import Callable
 
 
+# settings read while words are laid out, deferred layout uses their values from when the words were added
+LAYOUT_SETTINGS = (
+    "text_tab_size",
+    "textline_height_ratio",
+    "text_split_words",
+    "paragraph_first_line_indent",
+    "paragraph_hanging_indent",
+    "paragraph_left_indent",
+    "paragraph_right_indent",
+    "paragraph_space_before",
+    "paragraph_space_after",
+    "paragraph_line_breaking",
+)
+
+
 class Settings:
     def __init__(self) -> None:
         self.font_current: None | str = None
+        self.font_metrics_cache_dir: None | str = None
+        self.font_subsetting: bool = False
+        self.export_workers: int = 1  # pages are exported in a process pool when set above 1
+        self.export_parallel_min_pages: int = 100  # fewer changed pages than this are exported serially
         self.font_size: float = 11.0
         self.font_color: tuple[int, int, int] = (0, 0, 0)  # black color 0, 0, 0
         self.text_tab_size = 35.4375
@@ -11,12 +30,14 @@ class Settings:
         self.text_v_align: str = "top"
         self.textline_height_ratio: float = 1.2
         self.text_split_words: bool = True
+        self.text_batch_line_breaking: bool = True
         self.paragraph_first_line_indent: float = 20.0
         self.paragraph_hanging_indent: float = 0.0
         self.paragraph_left_indent: float = 10.0
         self.paragraph_right_indent: float = 10.0
         self.paragraph_space_before: float = 10.0
         self.paragraph_space_after: float = 10.0
+        self.paragraph_line_breaking: str = "greedy"
         self.page_num_current_page_dummy: str = "%%pn%%"
         self.page_num_total_pages_dummy: str = "%%tp%%"
         self.page_num_dummy_length: int = 2
@@ -34,3 +55,10 @@ class Settings:
         self.textbox_margin_right: float = 0.0
         self.textbox_margin_top: float = 0.0
         self.textbox_margin_bottom: float = 0.0
+
+    def _get_layout_settings(self) -> tuple[object, ...]:
+        return tuple(getattr(self, name) for name in LAYOUT_SETTINGS)
+
+    def _set_layout_settings(self, layout_settings: tuple[object, ...]) -> None:
+        for name, value in zip(LAYOUT_SETTINGS, layout_settings, strict=True):
+            setattr(self, name, value)
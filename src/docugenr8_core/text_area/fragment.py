@@ -4,36 +4,128 @@ from typing import TYPE_CHECKING
 
 
 if TYPE_CHECKING:
+    from array import array
     from collections.abc import Callable
 
+    from .text_style import TextStyle
     from .word import Word
 
 
 class Fragment:
+    __slots__ = (
+        "_is_current_page_dummy",
+        "_is_total_pages_dummy",
+        "_offset",
+        "_page_number_presentation",
+        "_run_advances",
+        "_style",
+        "_text",
+        "_width",
+        "_word",
+    )
+
     def __init__(
         self,
-        height: float,
+        style: TextStyle,
         width: float,
-        ascent: float,
         chars: str,
-        font_name: str,
-        font_size: float,
-        font_color: tuple[int, int, int],
+        advances: array[float] | None = None,
     ) -> None:
-        self._height = height
+        self._style = style
         self._width = width
-        self._ascent = ascent
-        self._chars = chars
-        self._font_name = font_name
-        self._font_size = font_size
-        self._font_color = font_color
+        # characters and advances of a run are views from _offset onwards, so splitting off the start
+        # of a long run does not copy the rest of it
+        self._text = chars
+        self._offset = 0
+        # advances of every character of a run, fragments without them are never split or extended
+        self._run_advances = advances
         self._word: None | Word = None
         self._page_number_presentation: Callable[[int], str] | None = None
         self._is_current_page_dummy: bool = False
         self._is_total_pages_dummy: bool = False
 
+    @property
+    def _chars(self) -> str:
+        if self._offset == 0:
+            return self._text
+        return self._text[self._offset :]
+
+    @property
+    def _advances(self) -> array[float] | None:
+        if self._run_advances is None or self._offset == 0:
+            return self._run_advances
+        return self._run_advances[self._offset :]
+
+    def _get_num_chars(self) -> int:
+        return len(self._text) - self._offset
+
+    @property
+    def _height(self) -> float:
+        return self._style.height
+
+    @property
+    def _ascent(self) -> float:
+        return self._style.ascent
+
+    @property
+    def _font_name(self) -> str:
+        return self._style.font_name
+
+    @property
+    def _font_size(self) -> float:
+        return self._style.font_size
+
+    @property
+    def _font_color(self) -> tuple[int, int, int]:
+        return self._style.font_color
+
     def _adjust_width(self, new_width: float) -> None:
         width_diff = new_width - self._width
         self._width += width_diff
         if self._word is not None:
             self._word._adjust_width_by_difference(width_diff)
+
+    def _can_extend_with(self, fragment: Fragment) -> bool:
+        return self._style is fragment._style and self._run_advances is not None and fragment._run_advances is not None
+
+    def _extend(self, fragment: Fragment) -> None:
+        fragment_advances = fragment._advances
+        self._drop_offset()
+        if self._run_advances is None or fragment_advances is None:
+            raise TypeError("Only runs of characters can be extended.")
+        self._text += fragment._chars
+        self._run_advances.extend(fragment_advances)
+        self._width += fragment._width
+
+    def _drop_offset(self) -> None:
+        if self._offset == 0:
+            return
+        self._text = self._text[self._offset :]
+        if self._run_advances is not None:
+            self._run_advances = self._run_advances[self._offset :]
+        self._offset = 0
+
+    def _count_chars_fitting(self, start_width: float, max_width: float) -> int:
+        """Counts the characters of the run that fit into max_width when placed after start_width."""
+        if self._run_advances is None:
+            return 0
+        num_chars = 0
+        width = start_width
+        with memoryview(self._run_advances) as advances:
+            for advance in advances[self._offset :]:
+                if width + advance > max_width:
+                    break
+                width += advance
+                num_chars += 1
+        return num_chars
+
+    def _split(self, num_chars: int) -> Fragment:
+        """Splits off the first num_chars characters of the run into a new fragment."""
+        if self._run_advances is None or num_chars <= 0 or num_chars >= self._get_num_chars():
+            raise ValueError(f"Fragment {self._chars} cannot be split at {num_chars}.")
+        split_idx = self._offset + num_chars
+        left_advances = self._run_advances[self._offset : split_idx]
+        left_fragment = Fragment(self._style, sum(left_advances), self._text[self._offset : split_idx], left_advances)
+        self._offset = split_idx
+        self._width -= left_fragment._width
+        return left_fragment
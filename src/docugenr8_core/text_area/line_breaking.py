@@ -0,0 +1,502 @@
+"""line_breaking module.
+
+This module provides the line breaking of paragraphs that lays out many words in one pass, the
+greedy breaking that gives the same lines as appending words one by one, and the optional total
+fit breaking that spreads words evenly over the lines of a justified paragraph.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import NamedTuple
+
+
+# kinds of words for line breaking
+WORD = 0
+SPACE = 1
+TAB = 2
+NEW_LINE = 3
+WHITESPACE_KINDS = {" ": SPACE, "\t": TAB, "\n": NEW_LINE}
+
+# most words laid out in one pass, longer paragraphs are laid out in consecutive passes
+BATCH_SIZE = 1 << 10
+
+
+class LineState(NamedTuple):
+    """State of the textline that words are appended to."""
+
+    width: float
+    available_width: float
+    spaces_width_at_the_end: float
+    spaces_at_the_end: list[float]
+    words_width: float
+    num_words: int
+    leading: float
+
+
+class GreedyLines(NamedTuple):
+    """Lines of words broken by break_lines_greedy, the first line continues the given textline."""
+
+    num_words: int
+    ends: list[int]
+    available_widths: list[float]
+    spaces_widths_at_the_end: list[float]
+    num_spaces_at_the_end: list[int]
+    tab_widths: dict[int, float]
+    height: float
+    available_height: float
+
+
+def break_lines_greedy(
+    widths: list[float],
+    kinds: list[int],
+    line: LineState,
+    line_width: float,
+    tab_size: float,
+    line_height: float,
+    leading: float,
+    height: float,
+    available_height: float,
+) -> GreedyLines:
+    """Breaks words into lines in one pass, as appending them one by one to the last textline does.
+
+    The available widths, spaces at the end of lines and tab stops of textlines, and the heights of the
+    paragraph and of the text area, are computed with the same operations in the same order as in
+    the word by word layout, so both give equal results. Breaking stops before a word that the
+    word by word layout does not simply move to a new line, such as a word wider than a line, and
+    after a new line or the word that makes the text area overflow.
+
+    Args:
+        widths (list[float]): Widths of the words.
+        kinds (list[int]): Kinds of the words, WORD, SPACE, TAB or NEW_LINE.
+        line (LineState): The textline that the first word is appended to.
+        line_width (float): Width of the new lines.
+        tab_size (float): Distance between tab stops.
+        line_height (float): Height of all the words.
+        leading (float): Leading of a line that has a line after it.
+        height (float): Height of the paragraph.
+        available_height (float): Available height of the text area.
+
+    Returns:
+        GreedyLines: Ends and states of the lines, tab widths by word index and the new heights.
+    """
+    lines = _GreedyLineBreaker(line, line_width, tab_size, line_height, leading, height, available_height)
+    num_words = 0
+    if line.num_words == 0 and len(widths) > 0:
+        if not lines._append_first_word(widths[0], kinds[0]):
+            return lines._get_lines(0)
+        num_words = 1
+        if lines._stops_after(kinds[0]):
+            return lines._get_lines(1)
+    while num_words < len(widths):
+        num_words, stopped = lines._append_words(widths, kinds, num_words)
+        if stopped or num_words == len(widths):
+            break
+        # the word after the appended words overflows the line
+        if not lines._start_new_line(num_words, widths[num_words], kinds[num_words]):
+            break
+        num_words += 1
+        if lines._stops_after(kinds[num_words - 1]):
+            break
+    return lines._get_lines(num_words)
+
+
+class _GreedyLineBreaker:
+    """State of the last line and the ended lines while break_lines_greedy appends words."""
+
+    __slots__ = (
+        "_available_height",
+        "_available_width",
+        "_available_widths",
+        "_current_width",
+        "_ends",
+        "_height",
+        "_leading",
+        "_line_height",
+        "_line_leading",
+        "_line_width",
+        "_num_spaces",
+        "_space_widths",
+        "_spaces_width",
+        "_spaces_widths",
+        "_tab_size",
+        "_tab_widths",
+        "_words_width",
+    )
+
+    def __init__(
+        self,
+        line: LineState,
+        line_width: float,
+        tab_size: float,
+        line_height: float,
+        leading: float,
+        height: float,
+        available_height: float,
+    ) -> None:
+        self._available_width = line.available_width
+        self._spaces_width = line.spaces_width_at_the_end
+        self._space_widths = list(line.spaces_at_the_end)
+        self._words_width = line.words_width
+        self._current_width = line.width
+        self._line_leading = line.leading
+        self._line_width = line_width
+        self._tab_size = tab_size
+        self._line_height = line_height
+        self._leading = leading
+        self._height = height
+        self._available_height = available_height
+        self._ends: list[int] = []
+        self._available_widths: list[float] = []
+        self._spaces_widths: list[float] = []
+        self._num_spaces: list[int] = []
+        self._tab_widths: dict[int, float] = {}
+
+    def _append_words(self, widths: list[float], kinds: list[int], start: int) -> tuple[int, bool]:
+        """Appends words from start to the last line while they fit into it.
+
+        Returns:
+            tuple[int, bool]: Index after the appended words, and whether breaking stops after them
+                because of a new line or the text area overflowing.
+        """
+        # the state of the line is kept in locals while words are appended
+        available_width = self._available_width
+        spaces_width = self._spaces_width
+        words_width = self._words_width
+        tab_size = self._tab_size
+        # spaces at the end of the line are the kept spaces followed by the words from spaces_start
+        spaces_start = start
+        # the word after which the text area overflows is the last appended word
+        end = len(widths) if self._available_height >= 0 else min(len(widths), start + 1)
+        stopped = False
+        for index in range(start, end):
+            width = widths[index]
+            kind = kinds[index]
+            if kind == WORD:
+                new_available_width = available_width - width - spaces_width
+                if new_available_width < 0:
+                    break
+                available_width = new_available_width
+                spaces_width = 0
+                spaces_start = index + 1
+                words_width += width
+            elif kind == SPACE:
+                # spaces at the end of a line do not take its width, the width is taken and given back
+                # as in the word by word layout, so that the available width is rounded the same way
+                available_width = available_width - width + width
+                spaces_width += width
+                words_width += width
+            else:
+                if kind == TAB:
+                    # tab stops are measured from the start of the line
+                    new_width = tab_size - (words_width % tab_size)
+                    new_available_width = available_width - spaces_width + width - new_width
+                else:
+                    new_width = width
+                    new_available_width = available_width - width - spaces_width
+                if new_available_width < 0:
+                    break
+                available_width = new_available_width
+                spaces_width = 0
+                spaces_start = index + 1
+                words_width += new_width
+                if kind == TAB:
+                    self._tab_widths[index] = new_width
+                elif kind == NEW_LINE:
+                    stopped = True
+                    index += 1
+                    break
+        else:
+            index = end
+            stopped = end < len(widths) or (end > start and self._available_height < 0)
+        if spaces_start > start:
+            self._space_widths = widths[spaces_start:index]
+        else:
+            self._space_widths.extend(widths[start:index])
+        self._available_width = available_width
+        self._spaces_width = spaces_width
+        self._words_width = words_width
+        return index, stopped
+
+    def _append_first_word(self, width: float, kind: int) -> bool:
+        """Appends the first word of an empty line, returns False if it does not fit into the line."""
+        new_width = self._get_tab_width() if kind == TAB else width
+        # a first word wider than the line is split or overflows the text area
+        if new_width > self._current_width or self._append_words([width], [kind], 0)[0] == 0:
+            return False
+        self._add_line_height()
+        return True
+
+    def _start_new_line(self, index: int, width: float, kind: int) -> bool:
+        """Ends the last line before the word that overflows it and starts a new line with the word.
+
+        Returns:
+            bool: False if the word by word layout does not simply move the word to a new line.
+        """
+        if kind == NEW_LINE:
+            return False
+        new_width = self._get_tab_width() if kind == TAB else width
+        if kind == TAB:
+            new_available_width = self._available_width - self._spaces_width + width - new_width
+        else:
+            new_available_width = self._available_width - width - self._spaces_width
+        popped_available_width, popped_spaces_width = self._pop_word(new_available_width, new_width)
+        if popped_available_width < 0 or popped_available_width - popped_spaces_width - new_width >= 0:
+            return False
+        new_line_available_width = self._line_width - width
+        if kind == TAB:
+            # a tab at the start of a line reaches the first tab stop
+            new_line_available_width = self._line_width + new_width - self._tab_size
+            new_width = self._tab_size
+            self._tab_widths[index] = new_width
+        if new_width > self._line_width or new_line_available_width < 0:
+            return False
+        self._end_line(index, popped_available_width, popped_spaces_width)
+        leading_diff = self._leading - self._line_leading
+        self._height += leading_diff
+        self._available_height -= leading_diff
+        self._add_line_height()
+        self._available_width = new_line_available_width
+        self._spaces_width = 0
+        self._space_widths = []
+        self._words_width = new_width
+        self._current_width = self._line_width
+        self._line_leading = 0.0
+        return True
+
+    def _pop_word(self, new_available_width: float, new_width: float) -> tuple[float, float]:
+        """Returns the available width and the width of spaces at the end of the line without the overflowing word."""
+        # popping the word frees the spaces at the end of the line again
+        popped_available_width = new_available_width
+        popped_spaces_width: float = 0
+        for space_width in reversed(self._space_widths):
+            popped_spaces_width += space_width
+            popped_available_width += space_width
+        popped_available_width += new_width
+        return popped_available_width, popped_spaces_width
+
+    def _get_tab_width(self) -> float:
+        # tab stops are measured from the start of the line
+        return self._tab_size - (self._words_width % self._tab_size)
+
+    def _stops_after(self, kind: int) -> bool:
+        return kind == NEW_LINE or self._available_height < 0
+
+    def _end_line(self, end: int, available_width: float, spaces_width: float) -> None:
+        self._ends.append(end)
+        self._available_widths.append(available_width)
+        self._spaces_widths.append(spaces_width)
+        self._num_spaces.append(len(self._space_widths))
+
+    def _add_line_height(self) -> None:
+        self._height += self._line_height
+        self._available_height -= self._line_height
+
+    def _get_lines(self, num_words: int) -> GreedyLines:
+        self._end_line(num_words, self._available_width, self._spaces_width)
+        return GreedyLines(
+            num_words,
+            self._ends,
+            self._available_widths,
+            self._spaces_widths,
+            self._num_spaces,
+            self._tab_widths,
+            self._height,
+            self._available_height,
+        )
+
+
+# bound on the search of break_lines_total_fit, the most breakpoints tried for the end of one line,
+# which keeps the time of the search linear in the number of words
+TOTAL_FIT_WINDOW = 64
+# badness of a line without spaces to stretch to its width
+MAX_BADNESS = 1e10
+
+
+def break_lines_total_fit(
+    widths: list[float],
+    kinds: list[int],
+    line_widths: list[float],
+    justify_last_line: bool,
+    window: int = TOTAL_FIT_WINDOW,
+) -> list[int] | None:
+    """Breaks words into the given number of lines with the least total demerits of the lines.
+
+    A line may end before a word that follows a space. The demerits of a line are computed from the
+    space added between its words when it is justified, as in TeX, so lines get stretched evenly. The
+    end of each line is searched only between the ends of the greedy breaking from the last line
+    backwards and from the first line forwards, and among at most window breakpoints before the
+    greedy end, which keeps the time linear in the number of words.
+
+    Args:
+        widths (list[float]): Widths of the words.
+        kinds (list[int]): Kinds of the words, WORD, SPACE or NEW_LINE.
+        line_widths (list[float]): Widths of the lines, one for every line.
+        justify_last_line (bool): Whether the last line is stretched as well.
+        window (int): Most breakpoints tried for the end of one line.
+
+    Returns:
+        list[int] | None: Indices after the last word of every line, or None if the words do not
+            fit into the lines.
+    """
+    num_lines = len(line_widths)
+    if num_lines == 0:
+        return None
+    sums = _get_width_sums(widths, kinds)
+    windows = _get_candidate_ends(sums, kinds, line_widths, window)
+    if windows is None:
+        return None
+    prev_ends = _find_least_demerits(sums, windows, line_widths, justify_last_line)
+    if prev_ends is None:
+        return None
+    return _backtrack(prev_ends, len(widths))
+
+
+class _WidthSums(NamedTuple):
+    """Sums of widths before every index of the words broken by break_lines_total_fit."""
+
+    # sums of widths of the words and of the spaces before an index
+    sums: list[float]
+    space_sums: list[float]
+    # index after the last word before an index that is not a space, since spaces at the end of
+    # a line do not take its width
+    content_ends: list[int]
+
+
+def _get_width_sums(widths: list[float], kinds: list[int]) -> _WidthSums:
+    sums = [0.0]
+    space_sums = [0.0]
+    content_ends = [0]
+    for index, width in enumerate(widths):
+        sums.append(sums[-1] + width)
+        if kinds[index] == SPACE:
+            space_sums.append(space_sums[-1] + width)
+            content_ends.append(content_ends[-1])
+        else:
+            space_sums.append(space_sums[-1])
+            content_ends.append(index + 1)
+    return _WidthSums(sums, space_sums, content_ends)
+
+
+def _fits(sums: _WidthSums, start: int, end: int, line_width: float) -> bool:
+    return sums.sums[sums.content_ends[end]] - sums.sums[start] <= line_width
+
+
+def _get_candidate_ends(
+    sums: _WidthSums,
+    kinds: list[int],
+    line_widths: list[float],
+    window: int,
+) -> list[list[int]] | None:
+    """Returns the breakpoints tried for the end of every line, or None if the words do not fit into the lines.
+
+    The end of a line lies between the ends of the greedy breaking from the last line backwards and
+    from the first line forwards, and among at most window breakpoints before the greedy end.
+    """
+    num_words = len(kinds)
+    breakpoints = [index for index in range(1, num_words) if kinds[index] == WORD and kinds[index - 1] == SPACE]
+    greedy_ends = _get_greedy_ends(sums, breakpoints, line_widths)
+    if greedy_ends is None:
+        return None
+    backward_ends = _get_backward_ends(sums, breakpoints, line_widths)
+    windows: list[list[int]] = []
+    for line_index in range(len(line_widths) - 1):
+        first = bisect_left(breakpoints, backward_ends[line_index])
+        last = bisect_left(breakpoints, greedy_ends[line_index])
+        windows.append(breakpoints[max(first, last - window + 1) : last + 1])
+    windows.append([num_words])
+    return windows
+
+
+def _get_greedy_ends(sums: _WidthSums, breakpoints: list[int], line_widths: list[float]) -> list[int] | None:
+    """Returns the ends of the first lines broken greedily from the start, where they hold the most words."""
+    greedy_ends: list[int] = []
+    candidate = 0
+    start = 0
+    for line_width in line_widths[:-1]:
+        end = start
+        while candidate < len(breakpoints) and _fits(sums, start, breakpoints[candidate], line_width):
+            end = breakpoints[candidate]
+            candidate += 1
+        if end == start:
+            return None
+        greedy_ends.append(end)
+        start = end
+    if not _fits(sums, start, len(sums.sums) - 1, line_widths[-1]):
+        return None
+    return greedy_ends
+
+
+def _get_backward_ends(sums: _WidthSums, breakpoints: list[int], line_widths: list[float]) -> list[int]:
+    """Returns the ends of the lines broken greedily from the end, where the last lines hold the most words."""
+    num_words = len(sums.sums) - 1
+    backward_ends = [num_words] * len(line_widths)
+    candidate = len(breakpoints) - 1
+    end = num_words
+    for line_index in range(len(line_widths) - 1, 0, -1):
+        while candidate >= 0 and _fits(sums, breakpoints[candidate], end, line_widths[line_index]):
+            candidate -= 1
+        end = breakpoints[candidate + 1] if candidate + 1 < len(breakpoints) else end
+        backward_ends[line_index - 1] = end
+    return backward_ends
+
+
+def _get_demerits(sums: _WidthSums, start: int, end: int, line_width: float, is_justified: bool) -> float:
+    """Returns the demerits of a line from the space added between its words when it is justified, as in TeX."""
+    if not is_justified:
+        return 0.0
+    content_end = sums.content_ends[end]
+    slack = line_width - (sums.sums[content_end] - sums.sums[start])
+    stretch = sums.space_sums[content_end] - sums.space_sums[start]
+    if slack == 0:
+        badness = 0.0
+    elif stretch == 0:
+        badness = MAX_BADNESS
+    else:
+        badness = 100 * (slack / stretch) ** 3
+    return (1 + badness) ** 2
+
+
+def _find_least_demerits(
+    sums: _WidthSums,
+    windows: list[list[int]],
+    line_widths: list[float],
+    justify_last_line: bool,
+) -> list[dict[int, int]] | None:
+    """Returns the previous line end with the least total demerits for the candidate ends of every line.
+
+    Returns None if no candidate end of a line can be reached from the ends of the line before it.
+    """
+    # total demerits of the lines up to the ends of the last line
+    totals: dict[int, float] = {0: 0.0}
+    prev_ends: list[dict[int, int]] = []
+    for line_index, line_ends in enumerate(windows):
+        line_width = line_widths[line_index]
+        is_justified = justify_last_line or line_index < len(line_widths) - 1
+        new_totals: dict[int, float] = {}
+        line_prev_ends: dict[int, int] = {}
+        for end in line_ends:
+            # a line that does not fit does not fit with an earlier start either
+            for start in reversed(totals):
+                if start >= end:
+                    continue
+                if not _fits(sums, start, end, line_width):
+                    break
+                total = totals[start] + _get_demerits(sums, start, end, line_width, is_justified)
+                if end not in new_totals or total < new_totals[end]:
+                    new_totals[end] = total
+                    line_prev_ends[end] = start
+        if len(new_totals) == 0:
+            return None
+        totals = new_totals
+        prev_ends.append(line_prev_ends)
+    return prev_ends
+
+
+def _backtrack(prev_ends: list[dict[int, int]], num_words: int) -> list[int]:
+    """Returns the ends of the lines, following the previous line ends back from the end of the last line."""
+    ends = [num_words]
+    for line_prev_ends in reversed(prev_ends[1:]):
+        ends.append(line_prev_ends[ends[-1]])
+    ends.reverse()
+    return ends
@@ -0,0 +1,55 @@
+"""page_number_overlay module.
+
+This module provides the overlay that holds the characters and widths of page numbers for one
+export, so that the fragments of the text areas are never changed by exporting.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from docugenr8_core.font import Font
+
+    from .fragment import Fragment
+
+
+class PageNumberOverlay:
+    """Page numbers of one export, kept apart from the fragments of the text areas.
+
+    Fragments of page numbers keep their dummy characters, the characters of the page numbers are
+    looked up in the overlay when the document is exported, so the same document can be exported
+    again after pages are added or text is changed.
+    """
+
+    __slots__ = (
+        "_chars",
+        "_widths",
+    )
+
+    def __init__(self) -> None:
+        """Initializes an overlay without page numbers."""
+        self._chars: dict[Fragment, str] = {}
+        # widths of page numbers measured once per font, font size and page number
+        self._widths: dict[tuple[str, float, str], float] = {}
+
+    def _set_page_number(self, fragment: Fragment, page_number: int, fonts: dict[str, Font]) -> float:
+        """Sets the characters of the page number of the fragment and returns their width."""
+        if fragment._page_number_presentation is None:
+            return fragment._width
+        chars = fragment._page_number_presentation(page_number)
+        self._chars[fragment] = chars
+        if len(chars) == 0:
+            return 0.0
+        key = (fragment._font_name, fragment._font_size, chars)
+        width = self._widths.get(key)
+        if width is None:
+            width = fonts[fragment._font_name].measure(chars, fragment._font_size)[0]
+            self._widths[key] = width
+        return width
+
+    def _get_chars(self, fragment: Fragment) -> str:
+        if fragment._page_number_presentation is None:
+            return fragment._chars
+        return self._chars.get(fragment, fragment._chars)
@@ -1,17 +1,51 @@
 from __future__ import annotations
 
 from collections import deque
+from itertools import chain
+from itertools import islice
 from typing import TYPE_CHECKING
 
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
     from .textarea import TextArea
     from .word import Word
 
+from .line_breaking import NEW_LINE
+from .line_breaking import SPACE
+from .line_breaking import TAB
+from .line_breaking import WHITESPACE_KINDS
+from .line_breaking import WORD
+from .line_breaking import GreedyLines
+from .line_breaking import LineState
+from .line_breaking import break_lines_greedy
+from .line_breaking import break_lines_total_fit
 from .textline import TextLine
 
 
 class Paragraph:
+    __slots__ = (
+        "_ends_with_br",
+        "_first_line_indent",
+        "_h_align",
+        "_hanging_indent",
+        "_height",
+        "_left_indent",
+        "_line_breaking",
+        "_line_height_ratio",
+        "_next_linked_paragraph",
+        "_prev_linked_paragraph",
+        "_right_indent",
+        "_space_after",
+        "_space_before",
+        "_tab_size",
+        "_textarea",
+        "_textlines",
+        "_width",
+    )
+
     def __init__(self, textarea: TextArea) -> None:
         self._textarea = textarea
         self._width: float = textarea._width
@@ -25,6 +59,7 @@ class Paragraph:
         self._hanging_indent: float = textarea._document.settings.paragraph_hanging_indent
         self._left_indent: float = textarea._document.settings.paragraph_left_indent
         self._right_indent: float = textarea._document.settings.paragraph_right_indent
+        self._line_breaking: str = textarea._document.settings.paragraph_line_breaking
         self._h_align: str = textarea._h_align
         self._textlines: list[TextLine] = []
         self._ends_with_br: bool = False
@@ -43,6 +78,16 @@ class Paragraph:
             last_linked_paragraph = last_linked_paragraph._next_linked_paragraph
         return last_linked_paragraph
 
+    def _unlink_paragraph(self) -> None:
+        prev_linked_paragraph = self._prev_linked_paragraph
+        next_linked_paragraph = self._next_linked_paragraph
+        if prev_linked_paragraph is not None:
+            prev_linked_paragraph._next_linked_paragraph = next_linked_paragraph
+        if next_linked_paragraph is not None:
+            next_linked_paragraph._prev_linked_paragraph = prev_linked_paragraph
+        self._prev_linked_paragraph = None
+        self._next_linked_paragraph = None
+
     def _copy_paragraph_parameters_from(self, other_paragraph: Paragraph) -> None:
         self._line_height_ratio = other_paragraph._line_height_ratio
         self._tab_size = other_paragraph._tab_size
@@ -50,6 +95,7 @@ class Paragraph:
         self._hanging_indent = other_paragraph._hanging_indent
         self._left_indent = other_paragraph._left_indent
         self._right_indent = other_paragraph._right_indent
+        self._line_breaking = other_paragraph._line_breaking
         height_diff = other_paragraph._space_before - self._space_before
         height_diff += other_paragraph._space_after - self._space_after
         self._space_before = other_paragraph._space_before
@@ -57,10 +103,7 @@ class Paragraph:
         self._change_height(height_diff)
 
     def _get_chars(self) -> str:
-        chars = ""
-        for line in self._textlines:
-            chars += line._get_chars()
-        return chars
+        return "".join([line._get_chars() for line in self._textlines])
 
     def _adjust_words_between_textlines(self) -> None:
         if len(self._textlines) == 0:
@@ -70,6 +113,33 @@ class Paragraph:
             line._adjust_words_between_textlines()
             line = line._next
 
+    def _reflow_from_textline(self, textline: TextLine) -> bool:
+        """Adjusts words between textlines after the words of the textline changed.
+
+        The reflow starts at the line before the textline, which can pull its first word, and stops
+        at the first line from the textline on that ends with the same word as before, since the
+        lines after it do not change. Returns whether the reflow stopped at such a line without
+        changing the number of lines, so that the heights of the paragraph did not change.
+        """
+        num_textlines = len(self._textlines)
+        line: TextLine | None = textline._prev if textline._prev is not None else textline
+        is_after_change = line is textline
+        while line is not None:
+            last_word = line._words[-1]
+            next_line = line._next
+            line._adjust_words_between_textlines()
+            is_after_change = is_after_change or line is textline
+            if (
+                is_after_change
+                and line._next is next_line
+                and len(line._words) > 0
+                and line._words[-1] is last_word
+                and line._paragraph is self
+            ):
+                return len(self._textlines) == num_textlines
+            line = line._next
+        return False
+
     def _change_height(self, height_diff: float) -> None:
         self._height += height_diff
         self._textarea._available_height -= height_diff
@@ -77,18 +147,215 @@ class Paragraph:
     def _append_word_left(self, word: Word) -> None:
         if len(self._textlines) == 0:
             self._create_textline()
-        if word._chars == "\n":
+        if word._is_new_line():
             self._ends_with_br = True
         self._textlines[0]._append_word(word, 0)
 
     def _append_word_right(self, word: Word) -> None:
         if len(self._textlines) == 0:
             self._create_textline()
-        if word._chars == "\n":
+        if word._is_new_line():
             self._ends_with_br = True
         last_line = self._textlines[-1]
         last_line._append_word(word)
-        last_line._adjust_words_between_textlines()
+        # words pushed out of the last line can overflow the new last line as well
+        textline: TextLine | None = last_line
+        while textline is not None:
+            textline._adjust_words_between_textlines()
+            textline = textline._next
+
+    def _append_words_right(self, words: Iterable[Word]) -> int:
+        """Appends words to the last textline in one pass and returns the number of appended words.
+
+        The pass stops at a word that is not laid out by moving it to a new line, such as a word with
+        another height or a word wider than a line, which is then appended with _append_word_right.
+        """
+        if len(self._textlines) == 0:
+            self._create_textline()
+        last_line = self._textlines[-1]
+        if not self._can_append_words_in_one_pass(last_line):
+            return 0
+        words = iter(words)
+        if len(last_line._words) > 0:
+            height = last_line._height
+            ascent = last_line._ascent
+            is_extendable = last_line._words[-1]._is_extendable
+        else:
+            first_word = next(words, None)
+            if first_word is None:
+                return 0
+            height = first_word._height
+            ascent = first_word._ascent
+            is_extendable = False
+            words = chain((first_word,), words)
+        words_to_append, widths, kinds = self._get_words_of_one_height(words, height, ascent, is_extendable)
+        if len(words_to_append) == 0 or height <= 0:
+            return 0
+        lines = break_lines_greedy(
+            widths,
+            kinds,
+            self._get_line_state(last_line, TAB in kinds),
+            self._width - self._left_indent - self._hanging_indent - self._right_indent,
+            self._tab_size,
+            height,
+            (height * self._line_height_ratio) - height,
+            self._height,
+            self._textarea._available_height,
+        )
+        if lines.num_words == 0:
+            return 0
+        self._extend_textlines(words_to_append, lines, height, ascent)
+        self._height = lines.height
+        self._textarea._available_height = lines.available_height
+        if kinds[lines.num_words - 1] == NEW_LINE:
+            self._ends_with_br = True
+        return lines.num_words
+
+    def _can_append_words_in_one_pass(self, last_line: TextLine) -> bool:
+        if last_line._stale_tabs_position is not None:
+            return False
+        if len(last_line._words) == 0:
+            return True
+        # words of other heights and a first word wider than the line are laid out word by word
+        return (
+            list(last_line._height_dict) == [last_line._height]
+            and list(last_line._ascent_dict) == [last_line._ascent]
+            and last_line._words[0]._width <= last_line._width
+        )
+
+    def _get_words_of_one_height(
+        self,
+        words: Iterator[Word],
+        height: float,
+        ascent: float,
+        is_extendable: bool,
+    ) -> tuple[list[Word], list[float], list[int]]:
+        """Returns the words up to the first word of another height or new line, with their widths and kinds."""
+        words_to_append: list[Word] = []
+        kinds: list[int] = []
+        append_word = words_to_append.append
+        append_kind = kinds.append
+        for word in words:
+            # words with other heights change heights of lines and adjacent words are merged
+            if word._height != height or word._ascent != ascent:
+                break
+            if word._is_extendable:
+                if is_extendable:
+                    break
+                is_extendable = True
+                append_word(word)
+                append_kind(WORD)
+                continue
+            is_extendable = False
+            # as in Word._get_whitespace, words that are not extendable are whitespace words of one fragment
+            fragments = word._fragments
+            kind = WHITESPACE_KINDS[fragments[0]._chars] if len(fragments) == 1 else WORD
+            append_word(word)
+            append_kind(kind)
+            if kind == NEW_LINE:
+                break
+        return words_to_append, [word._width for word in words_to_append], kinds
+
+    def _get_line_state(self, last_line: TextLine, has_tabs: bool) -> LineState:
+        words_width: float = 0
+        if has_tabs:
+            words_width = last_line._get_width_before(len(last_line._words))
+        num_spaces_at_the_end = len(last_line._spaces_at_the_end)
+        spaces_at_the_end = [word._width for word in islice(reversed(last_line._words), num_spaces_at_the_end)][::-1]
+        return LineState(
+            last_line._width,
+            last_line._available_width,
+            last_line._spaces_width_at_the_end,
+            spaces_at_the_end,
+            words_width,
+            len(last_line._words),
+            last_line._leading,
+        )
+
+    def _extend_textlines(self, words: list[Word], lines: GreedyLines, height: float, ascent: float) -> None:
+        """Appends the words to the last textline and to new textlines after it, as broken into lines."""
+        tab_indices = list(lines.tab_widths)
+        for index, tab_width in lines.tab_widths.items():
+            words[index]._width = tab_width
+        textline = self._textlines[-1]
+        start = 0
+        first_tab = 0
+        for line_index, end in enumerate(lines.ends):
+            if line_index > 0:
+                prev_textline = textline
+                textline = TextLine(self)
+                self._textlines.append(textline)
+                prev_textline._next = textline
+                textline._prev = prev_textline
+                prev_textline._leading += (height * self._line_height_ratio) - height - prev_textline._leading
+            end_tab = first_tab
+            while end_tab < len(tab_indices) and tab_indices[end_tab] < end:
+                end_tab += 1
+            textline._extend_words(
+                words[start:end],
+                [words[index] for index in tab_indices[first_tab:end_tab]],
+                height,
+                ascent,
+                lines.available_widths[line_index],
+                lines.spaces_widths_at_the_end[line_index],
+                lines.num_spaces_at_the_end[line_index],
+            )
+            first_tab = end_tab
+            start = end
+
+    def _break_lines_total_fit(self) -> None:
+        """Moves words between the textlines to the breaks of break_lines_total_fit.
+
+        The number of lines is kept, so the heights of the paragraph and the text area do not change.
+        Paragraphs with tabs, with words of other heights or with words wider than a line keep
+        their lines.
+        """
+        if len(self._textlines) < 2:
+            return
+        height = self._textlines[0]._height
+        ascent = self._textlines[0]._ascent
+        words: list[Word] = []
+        widths: list[float] = []
+        kinds: list[int] = []
+        line_ends: list[int] = []
+        line_widths: list[float] = []
+        for textline in self._textlines:
+            if list(textline._height_dict) != [height] or list(textline._ascent_dict) != [ascent]:
+                return
+            if textline._available_width < 0:
+                return
+            for word in textline._words:
+                whitespace = word._get_whitespace()
+                kind = WORD if whitespace is None else WHITESPACE_KINDS[whitespace]
+                words.append(word)
+                widths.append(word._width)
+                kinds.append(kind)
+            line_ends.append(len(words))
+            line_widths.append(textline._width)
+        if TAB in kinds:
+            return
+        # the last line of a paragraph continued in the next text area is justified as well
+        ends = break_lines_total_fit(widths, kinds, line_widths, self._next_linked_paragraph is not None)
+        if ends is None or ends == line_ends:
+            return
+        start = 0
+        for textline, end in zip(self._textlines, ends, strict=True):
+            num_spaces_at_the_end = 0
+            spaces_width_at_the_end = 0.0
+            while end - num_spaces_at_the_end > start and kinds[end - num_spaces_at_the_end - 1] == SPACE:
+                num_spaces_at_the_end += 1
+                spaces_width_at_the_end += widths[end - num_spaces_at_the_end]
+            textline._clear_words()
+            textline._extend_words(
+                words[start:end],
+                [],
+                height,
+                ascent,
+                textline._width - sum(widths[start:end]) + spaces_width_at_the_end,
+                spaces_width_at_the_end,
+                num_spaces_at_the_end,
+            )
+            start = end
 
     def _create_textline(
         self,
@@ -142,17 +409,12 @@ class Paragraph:
         self._adjust_words_between_textlines()
 
     def _get_first_word_from_next_textline(self, textline: TextLine) -> Word | None:
-        if textline not in self._textlines:
-            raise ValueError("Textline object is not present " "in parent paragraph object.")
-        textline_index = self._textlines.index(textline)
-        next_textline_index = textline_index + 1
-        if next_textline_index > len(self._textlines):
-            raise ValueError("Invalid index of the textline.")
-        if next_textline_index == len(self._textlines):
-            return None
-        if len(self._textlines[next_textline_index]._words) == 0:
+        if textline._paragraph is not self:
+            raise ValueError("Textline object is not present in parent paragraph object.")
+        next_textline = textline._next
+        if next_textline is None or len(next_textline._words) == 0:
             return None
-        return self._textlines[next_textline_index]._words[0]
+        return next_textline._words[0]
 
     def _remove_paragraph_from_text_area(self) -> deque[Word]:
         removed_words = deque()
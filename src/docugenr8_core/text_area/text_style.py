@@ -0,0 +1,38 @@
+"""text_style module.
+
+This module provides the interned text styles that fragments of text areas share, holding the
+font, font size, color and vertical metrics of their characters.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class TextStyle(NamedTuple):
+    """Immutable text style shared by all fragments with the same font, size and color.
+
+    Styles are interned with `TextStyle._get`, so fragments with equal styles reference the same
+    style object and style equality is an identity check.
+    """
+
+    font_name: str
+    font_size: float
+    font_color: tuple[int, int, int]
+    height: float
+    ascent: float
+
+    @classmethod
+    def _get(
+        cls,
+        font_name: str,
+        font_size: float,
+        font_color: tuple[int, int, int],
+        height: float,
+        ascent: float,
+    ) -> TextStyle:
+        style = cls(font_name, font_size, font_color, height, ascent)
+        return _interned_styles.setdefault(style, style)
+
+
+_interned_styles: dict[TextStyle, TextStyle] = {}
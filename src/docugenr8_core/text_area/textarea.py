@@ -1,18 +1,29 @@
 from __future__ import annotations
 
 from collections import deque
+from contextlib import contextmanager
+from itertools import islice
 from typing import TYPE_CHECKING
 
 
 if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
     from docugenr8_core.document import Document
     from docugenr8_core.font import Font
 
+    from .fragment import Fragment
+    from .page_number_overlay import PageNumberOverlay
     from .textline import TextLine
     from .word import Word
 
+from .line_breaking import BATCH_SIZE
 from .paragraph import Paragraph
+from .textarea_chain import TextAreaChain
 from .words_creation import create_words
+from .words_creation import stream_words
 
 
 class TextArea:
@@ -33,11 +44,18 @@ class TextArea:
         self._h_align = document.settings.text_h_align
         self._available_height = height
         self._paragraphs: deque[Paragraph] = deque()
-        self._buffer: deque[Word] = deque()
         self._next_textarea: None | TextArea = None
         self._prev_textarea: None | TextArea = None
+        # linked text areas share the chain with the buffer of words
+        self._chain = TextAreaChain(self)
+        self._chain_position: int = 0
         self._state_accepts_words: bool = True
         self._state_textline_width_overflow: bool = False
+        # words added inside batch blocks are laid out when the outermost block ends
+        self._deferred_layout_depth: int = 0
+        self._state_layout_pending: bool = False
+        # layout settings of the calls whose words wait for the deferred layout
+        self._deferred_layout_settings: tuple[object, ...] = ()
         # late binding when adding text
         self._current_font: None | Font = None
         self._current_font_size: float = 0
@@ -46,14 +64,98 @@ class TextArea:
         # words to fill in with page numbers
         self._words_with_current_page_fragments: list[Word] = []
         self._words_with_total_pages_fragments: list[Word] = []
+        # changes with every change of the layout, exported pages are reused while it stays the same
+        self._version: int = 0
 
     def add_text(
         self,
         unicode_text: str,
     ) -> None:
         self._save_font_attributes_from_document_settings()
+        self._run_deferred_layout_if_settings_changed()
         self._create_and_insert_words_into_buffer(unicode_text)
-        self._distribute_words_in_all_areas()
+        self._distribute_words_unless_deferred()
+
+    def add_text_stream(
+        self,
+        chunks: Iterable[str],
+    ) -> None:
+        """Adds text from an iterable of strings, such as an open file.
+
+        Words are created lazily while the layout needs them. Text that does not fit into the linked
+        text areas stays unread in the iterable.
+
+        Args:
+            chunks (Iterable[str]): Text split into chunks, chunks can end in the middle of a word.
+        """
+        self._save_font_attributes_from_document_settings()
+        if self._current_font is None:
+            raise ValueError("Current font must be set in settings.")
+        words = stream_words(
+            chunks,
+            self._current_font,
+            self._current_font_size,
+            self._current_font_color,
+            self._document.settings.page_num_current_page_dummy,
+            self._document.settings.page_num_total_pages_dummy,
+            self._document.settings.page_num_dummy_length,
+            self._document.settings.page_num_presentation,
+        )
+        self._run_deferred_layout_if_settings_changed()
+        self._get_buffer_sources().append(words)
+        self._distribute_words_unless_deferred()
+
+    @contextmanager
+    def batch(self) -> Generator[TextArea, None, None]:
+        """Defers the layout of text added to the text area until the end of the block.
+
+        Words of add_text and add_text_stream calls inside the block wait in the buffer and are
+        laid out once when the outermost block ends, or earlier when the document is exported.
+        Words are laid out with the settings from when they were added, so the layout is the same
+        as when every call lays out its words. Words added before a change of settings read by the
+        layout, such as paragraph indents, are laid out when the first call after the change is made.
+
+        Yields:
+            TextArea: The text area.
+        """
+        self._deferred_layout_depth += 1
+        try:
+            yield self
+        finally:
+            self._deferred_layout_depth -= 1
+        if not self._is_layout_deferred():
+            self._run_deferred_layout()
+
+    def _is_layout_deferred(self) -> bool:
+        return self._deferred_layout_depth > 0 or self._document._deferred_layout_depth > 0
+
+    def _distribute_words_unless_deferred(self) -> None:
+        if not self._is_layout_deferred():
+            self._distribute_words_in_all_areas()
+            return
+        if not self._state_layout_pending:
+            self._state_layout_pending = True
+            self._deferred_layout_settings = self._document.settings._get_layout_settings()
+            self._document._textareas_with_deferred_layout.append(self)
+
+    def _run_deferred_layout_if_settings_changed(self) -> None:
+        if (
+            self._state_layout_pending
+            and self._deferred_layout_settings != self._document.settings._get_layout_settings()
+        ):
+            self._run_deferred_layout()
+
+    def _run_deferred_layout(self) -> None:
+        if not self._state_layout_pending:
+            return
+        self._state_layout_pending = False
+        settings = self._document.settings
+        layout_settings = settings._get_layout_settings()
+        settings._set_layout_settings(self._deferred_layout_settings)
+        try:
+            self._distribute_words_in_all_areas()
+        finally:
+            settings._set_layout_settings(layout_settings)
 
     def _distribute_words_in_all_areas(self) -> None:
         textarea = self._get_the_first_textarea_to_accept_words()
@@ -88,20 +190,35 @@ class TextArea:
             self._document.settings.page_num_dummy_length,
             self._document.settings.page_num_presentation,
         )
+        buffer_sources = self._get_buffer_sources()
+        if len(buffer_sources) > 0:
+            # words follow the unread text of streams
+            buffer_sources.append(iter(words))
+            return
         buffer = self._get_buffer()
         buffer.extend(words)
 
     def _set_buffer(self, words: deque[Word]) -> None:
-        current_textarea = self
-        while current_textarea._next_textarea is not None:
-            current_textarea = current_textarea._next_textarea
-        current_textarea._buffer = words
+        self._chain._buffer = words
 
     def _get_buffer(self) -> deque[Word]:
-        current_textarea = self
-        while current_textarea._next_textarea is not None:
-            current_textarea = current_textarea._next_textarea
-        return current_textarea._buffer
+        return self._chain._buffer
+
+    def _get_buffer_sources(self) -> deque[Iterator[Word]]:
+        return self._chain._buffer_sources
+
+    def _pull_word_from_buffer_sources(self) -> Word | None:
+        buffer_sources = self._get_buffer_sources()
+        while len(buffer_sources) > 0:
+            word = next(buffer_sources[0], None)
+            if word is not None:
+                self._get_buffer().append(word)
+                return word
+            buffer_sources.popleft()
+        return None
+
+    def _has_words_in_buffer(self) -> bool:
+        return len(self._get_buffer()) > 0 or self._pull_word_from_buffer_sources() is not None
 
     def _get_the_last_word_from_textareas(self) -> Word | None:
         textarea = self._get_the_first_textarea_to_accept_words()
@@ -110,6 +227,10 @@ class TextArea:
         return textarea._paragraphs[-1]._textlines[-1]._words[-1]
 
     def _get_the_first_textarea_to_accept_words(self) -> TextArea | None:
+        textarea = self._chain._get_first_textarea_to_accept_words()
+        if textarea is None or textarea._chain_position >= self._chain_position:
+            return textarea
+        # text areas after the first one to accept words are searched from this text area
         current_textarea = self
         while current_textarea._state_accepts_words is False:
             if current_textarea._next_textarea is not None:
@@ -124,12 +245,25 @@ class TextArea:
 
     def _pull_and_push_words(self) -> None:
         if self._available_height >= 0:
+            self._break_last_paragraph_greedy_if_needed()
             self._pull_next_available_word()
         if self._available_height < 0:
             self._state_accepts_words = False
             self._push_excess_words_to_next_available_place()
+        self._break_lines_total_fit_in_paragraphs()
+
+    def _break_last_paragraph_greedy_if_needed(self) -> None:
+        # words are appended to greedily broken lines, total fit lines are broken again afterwards
+        if len(self._paragraphs) > 0 and self._paragraphs[-1]._line_breaking == "total-fit":
+            self._paragraphs[-1]._adjust_words_between_textlines()
+
+    def _break_lines_total_fit_in_paragraphs(self) -> None:
+        for paragraph in self._paragraphs:
+            if paragraph._line_breaking == "total-fit":
+                paragraph._break_lines_total_fit()
 
     def _pull_next_available_word(self) -> None:
+        self._chain._textarea_gets_words(self)
         while self._available_height >= 0:
             next_word = self._get_next_word()
             if next_word is None:
@@ -138,14 +272,31 @@ class TextArea:
                 self._create_paragraph_from_textarea_if_needed(next_word)
                 next_word._remove_page_number_from_textarea()
                 next_word._remove_from_line()
-            if next_word._is_from_buffer():
+            elif next_word._is_from_buffer():
                 self._create_paragraph_from_buffer_if_needed()
+                if self._document.settings.text_batch_line_breaking and self._append_words_from_buffer(next_word) > 0:
+                    continue
                 self._get_buffer().remove(next_word)
             self._append_word_to_textarea(next_word)
             if self._state_textline_width_overflow:
                 self._state_textline_width_overflow = False
                 break
 
+    def _append_words_from_buffer(self, next_word: Word) -> int:
+        buffer = self._get_buffer()
+        if len(buffer) == 0 or buffer[0] is not next_word:
+            return 0
+        num_words = self._paragraphs[-1]._append_words_right(islice(buffer, BATCH_SIZE))
+        words = [buffer.popleft() for _ in range(num_words)]
+        # page number fragment lists are created only for words with page numbers
+        self._words_with_current_page_fragments.extend(
+            word for word in words if word._current_page_fragments is not None and word._has_current_page_fragments()
+        )
+        self._words_with_total_pages_fragments.extend(
+            word for word in words if word._total_pages_fragments is not None and word._has_total_pages_fragments()
+        )
+        return num_words
+
     def _append_word_to_textarea(self, word: Word) -> None:
         if word._has_current_page_fragments():
             self._words_with_current_page_fragments.append(word)
@@ -156,13 +307,19 @@ class TextArea:
     def _push_excess_words_to_next_available_place(self) -> deque[Word] | None:
         textline_to_push = self._paragraphs[-1]._textlines[-1]
         while self._available_height < 0:
+            # the place of the textline in its paragraph is known only before the textline is removed
+            paragraph = textline_to_push._paragraph
+            prev_paragraph = paragraph if len(paragraph._textlines) > 1 else paragraph._prev_linked_paragraph
+            is_last_line = textline_to_push._is_last_line_in_paragraph()
             words_to_push = textline_to_push._remove_line_and_get_words()
             if self._next_textarea is not None:
-                self._next_textarea._generate_paragraph_when_pushing_words(textline_to_push)
+                self._next_textarea._generate_paragraph_when_pushing_words(paragraph, prev_paragraph, is_last_line)
                 self._next_textarea._add_words_front_to_textarea(words_to_push)
             else:
-                words_to_push.extend(self._get_buffer())
-                self._set_buffer(words_to_push)
+                if is_last_line:
+                    # the line break is pushed to the buffer with the last line
+                    paragraph._ends_with_br = False
+                self._get_buffer().extendleft(reversed(words_to_push))
             if len(self._paragraphs) == 0:
                 return
             textline_to_push = self._paragraphs[-1]._textlines[-1]
@@ -178,14 +335,22 @@ class TextArea:
         if len(self._paragraphs) == 0:
             new_paragraph = Paragraph(self)
             self._paragraphs.append(new_paragraph)
-            if self._prev_textarea is not None:
-                prev_paragraph = self._prev_textarea._paragraphs[-1]
+            prev_paragraph = self._get_paragraph_to_continue()
+            if prev_paragraph is not None:
                 prev_paragraph._next_linked_paragraph = new_paragraph
                 new_paragraph._prev_linked_paragraph = prev_paragraph
                 new_paragraph._copy_paragraph_parameters_from(prev_paragraph)
         if self._paragraphs[-1]._ends_with_br:
             self._paragraphs.append(Paragraph(self))
 
+    def _get_paragraph_to_continue(self) -> Paragraph | None:
+        if self._prev_textarea is None or len(self._prev_textarea._paragraphs) == 0:
+            return None
+        prev_paragraph = self._prev_textarea._paragraphs[-1]
+        if prev_paragraph._ends_with_br:
+            return None
+        return prev_paragraph
+
     def _create_paragraph_from_textarea_if_needed(
         self,
         next_word: Word,
@@ -211,40 +376,37 @@ class TextArea:
             paragraph._prev_linked_paragraph = self._paragraphs[-1]
             return
 
-    def _generate_paragraph_when_pushing_words(self, textline_to_push: TextLine) -> None:
-        if len(self._paragraphs) == 0 and textline_to_push._is_first_line_in_paragraph():
-            new_paragraph = Paragraph(self)
-            self._paragraphs.append(new_paragraph)
-            if textline_to_push._paragraph is not None:
-                textline_to_push._paragraph._next_linked_paragraph = None
-            return
-        if len(self._paragraphs) == 0 and not textline_to_push._is_first_line_in_paragraph():
-            new_paragraph = Paragraph(self)
-            self._paragraphs.append(new_paragraph)
-            if textline_to_push._paragraph is not None:
-                new_paragraph._copy_paragraph_parameters_from(textline_to_push._paragraph)
-            new_paragraph._prev_linked_paragraph = textline_to_push._paragraph
-            if textline_to_push._paragraph is not None:
-                textline_to_push._paragraph._next_linked_paragraph = new_paragraph
-            return
-        if textline_to_push._is_last_line_in_paragraph():
-            new_paragraph = Paragraph(self)
-            self._paragraphs.appendleft(new_paragraph)
-            if textline_to_push._paragraph is not None:
-                new_paragraph._copy_paragraph_parameters_from(textline_to_push._paragraph)
-            new_paragraph._prev_linked_paragraph = textline_to_push._paragraph
-            if textline_to_push._paragraph is not None:
-                textline_to_push._paragraph._next_linked_paragraph = new_paragraph
-        if textline_to_push._is_first_line_in_paragraph():
-            self._paragraphs[0]._prev_linked_paragraph = None
-            if textline_to_push._paragraph is not None:
-                textline_to_push._paragraph._next_linked_paragraph = None
+    def _generate_paragraph_when_pushing_words(
+        self, paragraph: Paragraph, prev_paragraph: Paragraph | None, is_last_line: bool
+    ) -> None:
+        if is_last_line or len(self._paragraphs) == 0:
+            next_paragraph = Paragraph(self)
+            next_paragraph._copy_paragraph_parameters_from(paragraph)
+            if is_last_line:
+                next_paragraph._ends_with_br = paragraph._ends_with_br
+                paragraph._ends_with_br = False
+            self._paragraphs.appendleft(next_paragraph)
+        else:
+            next_paragraph = self._paragraphs[0]
+        next_paragraph._prev_linked_paragraph = prev_paragraph
+        if prev_paragraph is not None:
+            prev_paragraph._next_linked_paragraph = next_paragraph
+        elif len(next_paragraph._textlines) > 0:
+            # the pushed words start the paragraph
+            next_paragraph._set_first_line_indent(next_paragraph._textlines[0])
 
     def _add_words_front_to_textarea(self, words: deque[Word]) -> None:
-        while len(words) > 0:
-            word = words.popleft()
-            self._paragraphs[0]._textlines[0]._append_word(word, 0)
-        self._paragraphs[0]._adjust_words_between_textlines()
+        self._chain._textarea_gets_words(self)
+        paragraph = self._paragraphs[0]
+        if len(paragraph._textlines) == 0:
+            paragraph._create_textline()
+        textline = paragraph._textlines[0]
+        for word in reversed(words):
+            textline._append_word(word, 0)
+            # a word merged with the next word is replaced by the merged word, which is already added
+            if textline._words[0] is word:
+                word._add_page_number_to_textarea()
+        paragraph._reflow_from_textline(textline)
 
     def _get_next_word(self) -> Word | None:
         """Get next word.
@@ -257,15 +419,17 @@ class TextArea:
             return textarea._paragraphs[0]._textlines[0]._words[0]
         buffer = self._get_buffer()
         if len(buffer) == 0:
-            return None
+            return self._pull_word_from_buffer_sources()
         return buffer[0]
 
     def _get_next_textarea_with_words(self) -> TextArea | None:
+        last_position_with_words = self._chain._last_position_with_words
         textarea = self._next_textarea
-        while textarea is not None:
+        while textarea is not None and textarea._chain_position <= last_position_with_words:
             if not textarea._is_empty():
                 return textarea
             textarea = textarea._next_textarea
+        self._chain._textareas_after_are_empty(self)
         return None
 
     def _is_empty(self) -> bool:
@@ -277,68 +441,79 @@ class TextArea:
             return True
         return False
 
-    def _build_current_page_fragments(self, current_page: int) -> None:
+    def _set_page_numbers(
+        self,
+        current_page: int,
+        total_pages: int,
+        overlay: PageNumberOverlay,
+    ) -> list[TextLine]:
+        """Sets page numbers in the overlay and returns the textlines that no longer fit their words.
+
+        Available widths of textlines follow the widths of page numbers. Textlines that still fit
+        their words are not reflowed, so page numbers narrower than the reserved width keep the
+        rest of the reserved space.
+        """
+        overflowing_textlines: list[TextLine] = []
         for word in self._words_with_current_page_fragments:
-            for fragment in word._current_page_fragments:
-                if fragment._page_number_presentation is None:
-                    continue
-                font = self._document.fonts[fragment._font_name]
-                chars = fragment._page_number_presentation(current_page)
-                page_number_width = 0.0
-                if len(chars) > 0:
-                    fragment._chars = chars
-                    for char in chars:
-                        page_number_width += font._get_char_width(char, fragment._font_size)
-                fragment._adjust_width(page_number_width)
-                if (
-                    fragment._word is not None
-                    and fragment._word._textline is not None
-                    and fragment._word._textline._paragraph is not None
-                    and fragment._word._textline._paragraph._textarea is not None
-                ):
-                    paragraph = fragment._word._textline._paragraph
-                    paragraph._adjust_words_between_textlines()
-                    textarea = fragment._word._textline._paragraph._textarea
-                    textarea._pull_and_push_words()
-
-    def _build_total_pages_fragments(self, total_pages: int) -> None:
+            self._set_page_number_fragments(
+                word, word._current_page_fragments, current_page, overlay, overflowing_textlines
+            )
         for word in self._words_with_total_pages_fragments:
-            for fragment in word._total_pages_fragments:
-                if fragment._page_number_presentation is None:
-                    continue
-                font = self._document.fonts[fragment._font_name]
-                chars = fragment._page_number_presentation(total_pages)
-                new_length = 0.0
-                if len(chars) > 0:
-                    fragment._chars = chars
-                    for char in chars:
-                        new_length += font._get_char_width(char, fragment._font_size)
-                fragment._adjust_width(new_length)
-                if (
-                    fragment._word is not None
-                    and fragment._word._textline is not None
-                    and fragment._word._textline._paragraph is not None
-                    and fragment._word._textline._paragraph._textarea is not None
-                ):
-                    paragraph = fragment._word._textline._paragraph
-                    paragraph._adjust_words_between_textlines()
-                    textarea = fragment._word._textline._paragraph._textarea
-                    textarea._pull_and_push_words()
+            self._set_page_number_fragments(
+                word, word._total_pages_fragments, total_pages, overlay, overflowing_textlines
+            )
+        return overflowing_textlines
+
+    def _set_page_number_fragments(
+        self,
+        word: Word,
+        fragments: list[Fragment] | None,
+        page_number: int,
+        overlay: PageNumberOverlay,
+        overflowing_textlines: list[TextLine],
+    ) -> None:
+        if fragments is None:
+            return
+        word_width = word._width
+        for fragment in fragments:
+            width = overlay._set_page_number(fragment, page_number, self._document.fonts)
+            # unchanged widths do not count as changes of the layout
+            if width != fragment._width:
+                fragment._adjust_width(width)
+        textline = word._textline
+        if textline is None or word._width == word_width:
+            return
+        textline._available_width -= word._width - word_width
+        if textline._available_width < 0 and (
+            len(overflowing_textlines) == 0 or overflowing_textlines[-1] is not textline
+        ):
+            overflowing_textlines.append(textline)
+
+    def _reflow_overflowing_textlines(self, textlines: list[TextLine]) -> None:
+        # words move between text areas only when the heights or the last line of a paragraph change
+        pull_and_push_words = False
+        for textline in textlines:
+            # earlier reflows may have removed the textline or fitted its words
+            if len(textline._words) == 0 or textline._available_width >= 0:
+                continue
+            if not textline._paragraph._reflow_from_textline(textline):
+                pull_and_push_words = True
+        if pull_and_push_words:
+            self._pull_and_push_words()
 
     def link_textarea(self, next_textarea: TextArea) -> None:
-        last_textarea = self
-        while last_textarea._next_textarea is not None:
-            last_textarea = last_textarea._next_textarea
-        last_textarea._next_textarea = next_textarea
-        next_textarea._buffer = last_textarea._buffer
-        last_textarea._buffer = deque()
-        self._distribute_words_in_all_areas()
+        self._run_deferred_layout_if_settings_changed()
+        self._chain._append(next_textarea._chain)
+        self._distribute_words_unless_deferred()
 
     def set_width(self, new_width: float) -> None:
+        if new_width == self._width:
+            return
         self._width = new_width
         for paragraph in self._paragraphs:
             paragraph._set_paragraph_width(new_width)
         self._distribute_words_in_all_areas()
+        self._break_lines_total_fit_in_paragraphs()
 
     def _empty_textlines_and_paragraphs_from_line(self, textline_index: int, paragraph_index: int) -> None:
         removed_words = deque()
@@ -0,0 +1,81 @@
+"""textarea_chain module.
+
+This module provides the chain of linked text areas, which holds the buffer of words shared by
+the text areas and the cursors that spare walking them.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .textarea import TextArea
+    from .word import Word
+
+
+class TextAreaChain:
+    """Linked text areas that share one buffer of words.
+
+    Every text area starts in a chain of its own and linking text areas appends the chain of the
+    next text area to the chain of the first one. The chain keeps its head and tail, the buffer of
+    words that did not fit into the text areas, and cursors to the first text area that accepts words
+    and to the last text area that can hold words, so that none of them is found by walking the
+    linked text areas.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_buffer_sources",
+        "_first_accepting_textarea",
+        "_head",
+        "_last_position_with_words",
+        "_tail",
+    )
+
+    def __init__(self, textarea: TextArea) -> None:
+        """Initializes the chain of a text area that is not linked yet.
+
+        Args:
+            textarea (TextArea): The only text area of the chain, its head and tail.
+        """
+        self._head = textarea
+        self._tail = textarea
+        self._buffer: deque[Word] = deque()
+        # lazy word sources, words are pulled into the buffer when it runs empty
+        self._buffer_sources: deque[Iterator[Word]] = deque()
+        # text areas stop accepting words for good, so the cursor only moves forward
+        self._first_accepting_textarea: TextArea | None = textarea
+        # text areas after this position are empty, -1 when all of them are empty
+        self._last_position_with_words: int = -1
+
+    def _append(self, chain: TextAreaChain) -> None:
+        offset = self._tail._chain_position + 1
+        textarea: TextArea | None = chain._head
+        while textarea is not None:
+            textarea._chain = self
+            textarea._chain_position += offset
+            textarea = textarea._next_textarea
+        self._tail._next_textarea = chain._head
+        chain._head._prev_textarea = self._tail
+        self._tail = chain._tail
+        if self._first_accepting_textarea is None:
+            self._first_accepting_textarea = chain._head
+        if chain._last_position_with_words >= 0:
+            self._last_position_with_words = chain._last_position_with_words + offset
+
+    def _get_first_textarea_to_accept_words(self) -> TextArea | None:
+        textarea = self._first_accepting_textarea
+        while textarea is not None and textarea._state_accepts_words is False:
+            textarea = textarea._next_textarea
+        self._first_accepting_textarea = textarea
+        return textarea
+
+    def _textarea_gets_words(self, textarea: TextArea) -> None:
+        self._last_position_with_words = max(self._last_position_with_words, textarea._chain_position)
+
+    def _textareas_after_are_empty(self, textarea: TextArea) -> None:
+        self._last_position_with_words = min(self._last_position_with_words, textarea._chain_position)
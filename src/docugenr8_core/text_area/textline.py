@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from collections import deque
+from itertools import islice
+from operator import attrgetter
 from typing import TYPE_CHECKING
 
 from .word import Word
@@ -11,6 +14,28 @@ if TYPE_CHECKING:
 
 
 class TextLine:
+    __slots__ = (
+        "_ascent",
+        "_ascent_dict",
+        "_available_width",
+        "_h_align",
+        "_head_position",
+        "_height",
+        "_height_dict",
+        "_inner_spaces",
+        "_leading",
+        "_next",
+        "_paragraph",
+        "_prev",
+        "_spaces_at_the_end",
+        "_spaces_width_at_the_end",
+        "_stale_tabs_position",
+        "_tabs",
+        "_width",
+        "_widths_before",
+        "_words",
+    )
+
     def __init__(
         self,
         paragraph: Paragraph,
@@ -23,6 +48,13 @@ class TextLine:
         self._spaces_at_the_end: list[Word] = []
         self._h_align = self._paragraph._h_align
         self._words: deque[Word] = deque()
+        # every word keeps its position, the index of a word is its position minus the position of the head
+        self._head_position = 0
+        # running sums of word widths, the item at an index is the width of the words before it;
+        # sums are extended on demand and dropped after the index of a changed word
+        self._widths_before: list[float] = [0]
+        # tabs from this position onwards are recalculated on the next change of the line
+        self._stale_tabs_position: int | None = None
         self._height: float = 0.0
         self._height_dict: dict[float, int] = {}
         self._ascent: float = 0.0
@@ -39,7 +71,7 @@ class TextLine:
         if index < 0 or index > len(self._words):
             raise IndexError(f"Index {index} out of range.")
         word._textline = self
-        self._words.insert(index, word)
+        self._insert_word_at(index, word)
         self._append_height(word._height)
         self._append_ascent(word._ascent)
         self._set_available_width(word)
@@ -52,16 +84,14 @@ class TextLine:
             index = len(self._words) - 1
         if index < 0 or index > len(self._words) - 1:
             raise IndexError(f"Index {index} out of range.")
-        word_to_remove = self._words[index]
-        self._words.remove(word_to_remove)
+        word_to_remove = self._remove_word_at(index)
         self._remove_ascent(word_to_remove._ascent)
         self._remove_height(word_to_remove._height)
         self._set_spaces_width_at_the_end()
         self._available_width += word_to_remove._width
         if word_to_remove in self._tabs:
             self._tabs.remove(word_to_remove)
-        for tab in self._tabs:
-            self._recalculate_tab_width(tab)
+        self._recalculate_stale_tab_widths()
         word_to_remove._textline = None
         if len(self._words) == 0:
             self._remove_line()
@@ -69,61 +99,159 @@ class TextLine:
             self._set_leading()
         return word_to_remove
 
+    def _extend_words(
+        self,
+        words: list[Word],
+        tabs: list[Word],
+        height: float,
+        ascent: float,
+        available_width: float,
+        spaces_width_at_the_end: float,
+        num_spaces_at_the_end: int,
+    ) -> None:
+        """Appends words of one height that the batch line breaker placed into the line."""
+        self._paragraph._textarea._version += 1
+        for position, word in enumerate(words, self._head_position + len(self._words)):
+            word._textline = self
+            word._position = position
+        self._words.extend(words)
+        self._tabs.extend(tabs)
+        self._height_dict[height] = self._height_dict.get(height, 0) + len(words)
+        self._ascent_dict[ascent] = self._ascent_dict.get(ascent, 0) + len(words)
+        self._height = max(self._height, height)
+        self._ascent = max(self._ascent, ascent)
+        self._available_width = available_width
+        self._spaces_width_at_the_end = spaces_width_at_the_end
+        self._spaces_at_the_end = list(islice(reversed(self._words), num_spaces_at_the_end))
+
+    def _clear_words(self) -> None:
+        """Removes all words from the line without changing its height, for _extend_words to refill it."""
+        self._paragraph._textarea._version += 1
+        self._words.clear()
+        self._head_position = 0
+        self._widths_before = [0]
+        self._stale_tabs_position = None
+        self._tabs.clear()
+        self._height_dict.clear()
+        self._ascent_dict.clear()
+        self._spaces_at_the_end = []
+        self._spaces_width_at_the_end = 0
+        self._available_width = self._width
+
+    def _get_word_index(self, word: Word) -> int:
+        if word._textline is not self:
+            raise ValueError(f"Word {word._chars} is not present in Textline {self._get_chars()}.")
+        word_index: int = word._position - self._head_position
+        return word_index
+
+    def _insert_word_at(self, index: int, word: Word) -> None:
+        if index == len(self._words):
+            word._position = self._head_position + index
+            self._words.append(word)
+        elif index == 0:
+            self._head_position -= 1
+            word._position = self._head_position
+            self._words.appendleft(word)
+        else:
+            self._words.insert(index, word)
+            self._renumber_words_from(index)
+        self._widths_changed_at(index)
+
+    def _remove_word_at(self, index: int) -> Word:
+        if index == 0:
+            self._head_position += 1
+            word = self._words.popleft()
+        elif index == len(self._words) - 1:
+            word = self._words.pop()
+        else:
+            word = self._words[index]
+            del self._words[index]
+            self._renumber_words_from(index)
+        self._widths_changed_at(index)
+        return word
+
+    def _renumber_words_from(self, index: int) -> None:
+        for word_index, word in enumerate(islice(self._words, index, None), index):
+            word._position = self._head_position + word_index
+
+    def _drop_widths_after(self, index: int) -> None:
+        if len(self._widths_before) > index + 1:
+            del self._widths_before[index + 1 :]
+
+    def _widths_changed_at(self, index: int) -> None:
+        self._paragraph._textarea._version += 1
+        if len(self._tabs) == 0 and len(self._widths_before) == 1:
+            # nothing to drop, and a tab added later marks itself in _set_tab_width_if_needed
+            return
+        self._drop_widths_after(index)
+        position = self._head_position + index
+        if self._stale_tabs_position is None or position < self._stale_tabs_position:
+            self._stale_tabs_position = position
+
+    def _word_width_changed(self, word: Word) -> None:
+        self._widths_changed_at(self._get_word_index(word))
+
+    def _get_width_before(self, index: int) -> float:
+        widths_before = self._widths_before
+        if len(widths_before) <= index:
+            width = widths_before[-1]
+            for word in islice(self._words, len(widths_before) - 1, index):
+                width += word._width
+                widths_before.append(width)
+        return widths_before[index]
+
     def _set_spaces_width_at_the_end(self) -> None:
         if len(self._words) == 0:
             return
         for word in reversed(self._words):
-            if word._chars != " ":
+            if not word._is_space():
                 break
             if word not in self._spaces_at_the_end:
                 self._spaces_at_the_end.append(word)
                 self._spaces_width_at_the_end += word._width
                 self._available_width += word._width
-        if self._words[-1]._chars != " ":
+        if not self._words[-1]._is_space():
             self._spaces_at_the_end.clear()
             self._available_width -= self._spaces_width_at_the_end
             self._spaces_width_at_the_end = 0
 
     def _set_available_width(self, word: Word) -> None:
-        if word._chars == "\t":
+        if word._is_tab():
             return
         self._available_width -= word._width
 
     def _set_tab_width_if_needed(self, word: Word) -> None:
-        if word._chars == "\t" and word not in self._tabs:
+        if word._is_tab() and word not in self._tabs:
             self._add_tab(word)
-        for tab in self._tabs:
-            self._recalculate_tab_width(tab)
+            self._widths_changed_at(self._get_word_index(word))
+        self._recalculate_stale_tab_widths()
 
     def _add_tab(self, word: Word) -> None:
-        if len(self._tabs) == 0:
-            self._tabs.append(word)
+        # tabs are kept in the order of their positions in the line
+        self._tabs.insert(bisect_left(self._tabs, word._position, key=_get_position), word)
+
+    def _recalculate_stale_tab_widths(self) -> None:
+        if self._stale_tabs_position is None:
             return
-        word_index_in_words = self._words.index(word)
-        for tab in self._tabs:
-            tab_index_in_words = self._words.index(tab)
-            if word_index_in_words < tab_index_in_words:
-                tab_index_in_tabs = self._tabs.index(tab)
-                self._tabs.insert(tab_index_in_tabs, word)
-                return
-        self._tabs.append(word)
+        # tabs before the first changed word keep their widths
+        first_stale_tab = bisect_left(self._tabs, self._stale_tabs_position, key=_get_position)
+        self._stale_tabs_position = None
+        for tab in islice(self._tabs, first_stale_tab, None):
+            self._recalculate_tab_width(tab)
 
     def _recalculate_tab_width(self, tab: Word) -> None:
         old_tab_width = tab._width
         tab_size = self._paragraph._tab_size
-        width = 0
-        for word in self._words:
-            if word == tab:
-                break
-            width += word._width
+        tab_index = self._get_word_index(tab)
+        width = self._get_width_before(tab_index)
         tab._width = tab_size - (width % tab_size)
+        if tab._width != old_tab_width:
+            self._drop_widths_after(tab_index)
         self._available_width = self._available_width + old_tab_width - tab._width
 
     def _test_tab_width(self) -> float:
         tab_size = self._paragraph._tab_size
-        width = 0
-        for word in self._words:
-            width += word._width
+        width = self._get_width_before(len(self._words))
         return tab_size - (width % tab_size)
 
     def _merge_words_if_possible(self, word: Word) -> None:
@@ -131,7 +259,7 @@ class TextLine:
             return
         if not word._is_extendable:
             return
-        word_index = self._words.index(word)
+        word_index = self._get_word_index(word)
         word_index_before = word_index - 1
         if word_index_before >= 0 and self._words[word_index_before]._is_extendable:
             self._merge_words(self._words[word_index_before], self._words[word_index])
@@ -148,8 +276,12 @@ class TextLine:
             new_word._add_fragment(fragment)
         for fragment in word_right._fragments:
             new_word._add_fragment(fragment)
-        index = self._words.index(word_left)
-        self._words.insert(index, new_word)
+        self._remove_word_at(self._get_word_index(word_right))
+        # the merged word takes the place of the left word
+        index = self._get_word_index(word_left)
+        self._words[index] = new_word
+        self._widths_changed_at(index)
+        new_word._position = word_left._position
         new_word._textline = word_left._textline
         new_word._add_page_number_to_textarea()
         textline = new_word._textline
@@ -165,8 +297,6 @@ class TextLine:
 
         word_left._remove_page_number_from_textarea()
         word_right._remove_page_number_from_textarea()
-        self._words.remove(word_left)
-        self._words.remove(word_right)
 
     # split word takes another paramether:
     # width to split the first part of the word
@@ -175,17 +305,22 @@ class TextLine:
         right_word: Word,
         left_width_to_split: float,
     ) -> None:
-        if right_word not in self._words:
+        if right_word._textline is not self:
             raise IndexError(f"Word {right_word._chars} " f"is not present in Textline {self._get_chars()}.")
         left_word = Word()
         while left_word._width + right_word._fragments[0]._width <= left_width_to_split:
             first_fragment = right_word._pop_fragment(0)
             left_word._add_fragment(first_fragment)
+        # a run of characters is split at the last character that fits
+        fragment_to_split = right_word._fragments[0]
+        num_chars = fragment_to_split._count_chars_fitting(left_word._width, left_width_to_split)
+        if 0 < num_chars < fragment_to_split._get_num_chars():
+            left_word._add_fragment(right_word._split_first_fragment(num_chars))
         if left_word._width == 0:
             return
+        word_index = self._get_word_index(right_word)
         left_word._textline = self
-        word_index = self._words.index(right_word)
-        self._words.insert(word_index, left_word)
+        self._insert_word_at(word_index, left_word)
         right_word._remove_page_number_from_textarea()
         left_word._add_page_number_to_textarea()
         right_word._add_page_number_to_textarea()
@@ -196,10 +331,10 @@ class TextLine:
         first_word = self._paragraph._get_first_word_from_next_textline(self)
         if first_word is None:
             return False
-        if first_word._chars in {" ", "\n"}:
+        if first_word._is_space() or first_word._is_new_line():
             return True
         word_width = 0.0
-        if first_word._chars == "\t":
+        if first_word._is_tab():
             word_width = self._test_tab_width()
         else:
             word_width = first_word._width
@@ -237,10 +372,7 @@ class TextLine:
         return self == last_linked_paragraph._textlines[-1]
 
     def _get_chars(self) -> str:
-        chars = ""
-        for word in self._words:
-            chars += word._chars
-        return chars
+        return "".join([word._chars for word in self._words])
 
     def _adjust_words_between_textlines(self) -> None:
         if self._word_width_exceeds_texline_width():
@@ -329,12 +461,16 @@ class TextLine:
         self._next = None
         self._prev = None
         paragraph = self._paragraph
-        paragraph._textlines.remove(self)
+        if paragraph._textlines[-1] is self:
+            paragraph._textlines.pop()
+        else:
+            paragraph._textlines.remove(self)
         paragraph._change_height(-height_to_remove)
         if len(paragraph._textlines) == 0:
             textarea = paragraph._textarea
-            textarea._available_height -= paragraph._space_before + paragraph._space_after
+            textarea._available_height += paragraph._space_before + paragraph._space_after
             textarea._paragraphs.remove(paragraph)
+            paragraph._unlink_paragraph()
 
     def _calculate_leading(self) -> float:
         return (self._height * self._paragraph._line_height_ratio) - self._height
@@ -350,6 +486,7 @@ class TextLine:
         self._paragraph._change_height(leading_diff)
 
     def _set_width_and_available_space(self, width: float) -> None:
+        self._paragraph._textarea._version += 1
         width_diff = width - self._width
         self._width += width_diff
         self._available_width += width_diff
@@ -371,3 +508,6 @@ class TextLine:
                 - self._paragraph._hanging_indent
                 - self._paragraph._right_indent
             )
+
+
+_get_position = attrgetter("_position")
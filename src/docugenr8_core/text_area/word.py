@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from collections import deque
 from typing import TYPE_CHECKING
 
 
@@ -8,32 +7,79 @@ if TYPE_CHECKING:
     from .fragment import Fragment
     from .paragraph import Paragraph
     from .textline import TextLine
-    from .word import Word
 
 
 class Word:
+    __slots__ = (
+        "_ascent",
+        "_ascent_dict",
+        "_chars_cache",
+        "_current_page_fragments",
+        "_fragments",
+        "_height",
+        "_height_dict",
+        "_is_extendable",
+        "_justify_space",
+        "_position",
+        "_should_render",
+        "_textline",
+        "_total_pages_fragments",
+        "_width",
+    )
+
     def __init__(self) -> None:
         self._textline: None | TextLine = None
-        self._fragments: deque[Fragment] = deque()
-        self._chars = ""
+        # position of the word in its textline, see TextLine._get_word_index
+        self._position = 0
+        self._fragments: list[Fragment] = []
+        # characters are joined from fragments when needed and cached until the fragments change
+        self._chars_cache: None | str = ""
         self._width = 0.0
+        # height and ascent counters are created only when fragments of the word differ in them,
+        # until then every fragment has the height and the ascent of the word
         self._ascent = 0.0
-        self._ascent_dict: dict[float, int] = {}
+        self._ascent_dict: None | dict[float, int] = None
         self._height = 0.0
-        self._height_dict: dict[float, int] = {}
+        self._height_dict: None | dict[float, int] = None
         self._justify_space = 0.0
         self._is_extendable: bool = True
         self._should_render: bool = True
-        self._current_page_fragments: list[Fragment] = []
-        self._total_pages_fragments: list[Fragment] = []
+        # created only for words with page number fragments
+        self._current_page_fragments: None | list[Fragment] = None
+        self._total_pages_fragments: None | list[Fragment] = None
+
+    @property
+    def _chars(self) -> str:
+        if self._chars_cache is None:
+            self._chars_cache = "".join([fragment._chars for fragment in self._fragments])
+        return self._chars_cache
+
+    def _get_whitespace(self) -> str | None:
+        """Returns the character of a space, tab or new line word, or None for other words."""
+        # only whitespace fragments make a word not extendable and they are always alone in a word
+        if self._is_extendable or len(self._fragments) != 1:
+            return None
+        return self._fragments[0]._chars
+
+    def _is_whitespace(self) -> bool:
+        return self._get_whitespace() is not None
+
+    def _is_space(self) -> bool:
+        return self._get_whitespace() == " "
+
+    def _is_tab(self) -> bool:
+        return self._get_whitespace() == "\t"
+
+    def _is_new_line(self) -> bool:
+        return self._get_whitespace() == "\n"
 
     def _has_current_page_fragments(self) -> bool:
-        if len(self._current_page_fragments) > 0:
+        if self._current_page_fragments is not None and len(self._current_page_fragments) > 0:
             return True
         return False
 
     def _has_total_pages_fragments(self) -> bool:
-        if len(self._total_pages_fragments) > 0:
+        if self._total_pages_fragments is not None and len(self._total_pages_fragments) > 0:
             return True
         return False
 
@@ -61,7 +107,7 @@ class Word:
     def _remove_from_line(self) -> None:
         if self._textline is None:
             raise ValueError("Missing textline.")
-        word_index = self._textline._words.index(self)
+        word_index = self._textline._get_word_index(self)
         self._textline._pop_word(word_index)
 
     def _add_page_number_to_textarea(self) -> None:
@@ -91,10 +137,10 @@ class Word:
         return width
 
     def _append_height(self, height: float) -> None:
-        if height not in self._height_dict:
-            self._height_dict[height] = 1
-        else:
-            self._height_dict[height] += 1
+        if self._height_dict is not None:
+            self._height_dict[height] = self._height_dict.get(height, 0) + 1
+        elif len(self._fragments) > 1 and height != self._height:
+            self._height_dict = {self._height: len(self._fragments) - 1, height: 1}
         if height > self._height:
             height_diff = height - self._height
             self._height += height_diff
@@ -102,10 +148,10 @@ class Word:
                 self._textline._append_height(self._height)
 
     def _append_ascent(self, ascent: float) -> None:
-        if ascent not in self._ascent_dict:
-            self._ascent_dict[ascent] = 1
-        else:
-            self._ascent_dict[ascent] += 1
+        if self._ascent_dict is not None:
+            self._ascent_dict[ascent] = self._ascent_dict.get(ascent, 0) + 1
+        elif len(self._fragments) > 1 and ascent != self._ascent:
+            self._ascent_dict = {self._ascent: len(self._fragments) - 1, ascent: 1}
         if ascent > self._ascent:
             ascent_diff = ascent - self._ascent
             self._ascent += ascent_diff
@@ -113,6 +159,10 @@ class Word:
                 self._textline._append_ascent(self._ascent)
 
     def _remove_height(self, height: float) -> None:
+        if self._height_dict is None:
+            if len(self._fragments) == 0:
+                self._height = 0.0
+            return
         self._height_dict[height] -= 1
         if self._height_dict[height] > 0:
             return
@@ -127,65 +177,80 @@ class Word:
             # height_diff = self.height - removed_height
 
     def _remove_ascent(self, ascent: float) -> None:
+        if self._ascent_dict is None:
+            if len(self._fragments) == 0:
+                self._ascent = 0.0
+            return
         self._ascent_dict[ascent] -= 1
         if self._ascent_dict[ascent] > 0:
             return
-        removed_ascent = self._ascent_dict.pop(ascent, None)
+        del self._ascent_dict[ascent]
         if len(self._ascent_dict) == 0:
             self._ascent = 0.0
             return
-        if self._ascent == removed_ascent:
+        if self._ascent == ascent:
             self._ascent = max(self._ascent_dict)
             if self._textline is not None:
                 raise NotImplementedError("Needs implementation " "for removing ascent from " "a textline.")
             # ascent_diff = self.ascent - removed_ascent
 
     def _add_fragment(self, fragment: Fragment) -> Word:
-        fragment._word = self
-        if fragment._chars in {" ", "\t", "\n"}:
+        if fragment._run_advances is None and fragment._chars in {" ", "\t", "\n"}:
             self._is_extendable = False
-        if fragment._chars in {"\t", "\n"}:
-            self._should_render = False
+            if fragment._chars in {"\t", "\n"}:
+                self._should_render = False
+        self._chars_cache = None
+        if len(self._fragments) > 0 and self._fragments[-1]._can_extend_with(fragment):
+            # same style runs are kept in one fragment
+            self._fragments[-1]._extend(fragment)
+            fragment._word = None
+            self._adjust_width_by_difference(fragment._width)
+            return self
+        fragment._word = self
         self._fragments.append(fragment)
         self._adjust_width_by_difference(fragment._width)
         self._append_height(fragment._height)
         self._append_ascent(fragment._ascent)
-        self._chars += fragment._chars
         if fragment._is_current_page_dummy:
+            if self._current_page_fragments is None:
+                self._current_page_fragments = []
             self._current_page_fragments.append(fragment)
         if fragment._is_total_pages_dummy:
+            if self._total_pages_fragments is None:
+                self._total_pages_fragments = []
             self._total_pages_fragments.append(fragment)
         return self
 
     def _pop_fragment_left(self) -> Fragment:
-        first_fragment = self._fragments.popleft()
-        first_fragment._word = None
-        self._chars = self._chars[len(first_fragment._chars) :]
-        self._width -= first_fragment._width
-        self._remove_height(first_fragment._height)
-        self._remove_ascent(first_fragment._ascent)
-        return first_fragment
+        return self._pop_fragment(0)
 
     def _pop_fragment(self, index: int) -> Fragment:
-        if index < 0 or index > len(self._fragments):
+        if index < 0 or index > len(self._fragments) - 1:
             raise IndexError(f"Fragment index {index} is out of range in word.")
         fragment_to_remove = self._fragments[index]
         fragment_to_remove._word = None
-        chars_left = self._chars[:index]
-        chars_right = self._chars[index + 1 :]
-        self._chars = chars_left + chars_right
-        self._fragments.remove(fragment_to_remove)
-        self._width -= fragment_to_remove._width
+        del self._fragments[index]
+        self._chars_cache = None
+        self._adjust_width_by_difference(-fragment_to_remove._width)
         self._remove_height(fragment_to_remove._height)
         self._remove_ascent(fragment_to_remove._ascent)
-        if fragment_to_remove._is_current_page_dummy:
+        if fragment_to_remove._is_current_page_dummy and self._current_page_fragments is not None:
             self._current_page_fragments.remove(fragment_to_remove)
-        if fragment_to_remove._is_total_pages_dummy:
+        if fragment_to_remove._is_total_pages_dummy and self._total_pages_fragments is not None:
             self._total_pages_fragments.remove(fragment_to_remove)
         return fragment_to_remove
 
+    def _split_first_fragment(self, num_chars: int) -> Fragment:
+        """Splits off the first num_chars characters of the first fragment and returns them as a new fragment."""
+        left_fragment = self._fragments[0]._split(num_chars)
+        self._chars_cache = None
+        self._adjust_width_by_difference(-left_fragment._width)
+        return left_fragment
+
     def _adjust_width_by_difference(self, width_diff: float) -> None:
         self._width += width_diff
+        if self._textline is not None:
+            self._textline._word_width_changed(self)
 
     def _calc_width_with_justify(self) -> float:
         return self._width + self._justify_space
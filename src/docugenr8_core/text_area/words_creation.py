@@ -6,228 +6,189 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from docugenr8.font import Font
 
+import re
+from array import array
 from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from functools import lru_cache
 
 from .fragment import Fragment
+from .text_style import TextStyle
 from .word import Word
 
 
+# longest text that is turned into words at once when streaming
+STREAM_SLICE_SIZE = 1 << 16
+WORD_SEPARATORS = ("\n", "\t", " ")
+
+
 # CREATE WORDS
 def create_words(
     unicode_text: str,
     current_font: Font,
     current_font_size: float,
-    current_font_color: tuple[float, float, float],
+    current_font_color: tuple[int, int, int],
     current_page_dummy: str | None = None,
     total_pages_dummy: str | None = None,
     page_num_dummy_length: int | None = None,
     page_number_presentation: Callable[[int], str] | None = None,
 ) -> list[Word]:
-    char_idx = 0
+    if page_num_dummy_length is None or page_number_presentation is None:
+        current_page_dummy = None
+        total_pages_dummy = None
+    tokenizer = get_tokenizer(current_page_dummy, total_pages_dummy)
+    style = get_text_style(current_font, current_font_size, current_font_color)
+    advances = measure_advances(unicode_text, current_font, current_font_size)
+    page_num_width = 0.0
+    if page_num_dummy_length is not None:
+        page_num_width = page_num_dummy_length * current_font._get_char_width("0", current_font_size)
     words: list[Word] = []
-    while char_idx < len(unicode_text):
-        (fragment, increment) = generate_fragment_with_increment(
-            unicode_text,
-            char_idx,
-            current_font,
-            current_font_size,
-            current_font_color,
-            current_page_dummy,
-            total_pages_dummy,
-            page_num_dummy_length,
-            page_number_presentation,
-        )
-        if fragment._chars in {"\n", "\t", " "}:
-            word = Word()
-            word._add_fragment(fragment)
-            words.append(word)
+    run_start_idx = 0
+    for token in tokenizer.finditer(unicode_text):
+        token_start = token.start()
+        if run_start_idx < token_start:
+            run_advances = advances[run_start_idx:token_start]
+            run_fragment = Fragment(style, sum(run_advances), unicode_text[run_start_idx:token_start], run_advances)
+            add_fragment_to_words(words, run_fragment)
+        run_start_idx = token.end()
+        chars = token.group()
+        if chars[0] == "\r":
+            fragment = Fragment(style, 0.0, "\n")
+        elif chars == current_page_dummy:
+            fragment = Fragment(style, page_num_width, chars)
+            fragment._page_number_presentation = page_number_presentation
+            fragment._is_current_page_dummy = True
+        elif chars == total_pages_dummy:
+            fragment = Fragment(style, page_num_width, chars)
+            fragment._page_number_presentation = page_number_presentation
+            fragment._is_total_pages_dummy = True
         else:
-            if len(words) == 0:
-                words.append(Word())
-            if words[-1]._is_extendable:
-                words[-1]._add_fragment(fragment)
-            else:
-                word = Word()
-                word._add_fragment(fragment)
-                words.append(word)
-        char_idx += increment
+            fragment = Fragment(style, advances[token_start], chars)
+        add_fragment_to_words(words, fragment)
+    if run_start_idx < len(unicode_text):
+        run_advances = advances[run_start_idx:]
+        run_fragment = Fragment(style, sum(run_advances), unicode_text[run_start_idx:], run_advances)
+        add_fragment_to_words(words, run_fragment)
     return words
 
 
-def generate_fragment_with_increment(
-    unicode_text: str,
-    char_idx: int,
+def stream_words(
+    chunks: Iterable[str],
     current_font: Font,
     current_font_size: float,
-    current_font_color: tuple[float, float, float],
-    current_page_dummy: str | None,
-    total_pages_dummy: str | None,
-    page_num_dummy_length: int | None,
-    page_number_presentation: Callable[[int], str] | None,
-) -> tuple[Fragment, int]:
-    if is_carriage_return_with_new_line(
-        unicode_text,
-        char_idx,
-    ):
-        fragment = generate_new_line_fragment(
-            current_font,
-            current_font_size,
-            current_font_color,
-        )
-        return (fragment, 2)
-    if is_only_carriage_return(unicode_text, char_idx):
-        fragment = generate_new_line_fragment(
-            current_font,
-            current_font_size,
-            current_font_color,
-        )
-        return (fragment, 1)
-    if (
-        current_page_dummy is not None
-        and page_num_dummy_length is not None
-        and page_number_presentation is not None
-        and is_string_current_page_dummy(unicode_text, char_idx, current_page_dummy)
-    ):
-        (fragment, increment) = generate_current_page_fragment(
+    current_font_color: tuple[int, int, int],
+    current_page_dummy: str | None = None,
+    total_pages_dummy: str | None = None,
+    page_num_dummy_length: int | None = None,
+    page_number_presentation: Callable[[int], str] | None = None,
+) -> Iterator[Word]:
+    """Lazily creates words from chunks of text.
+
+    Chunks are read only when more words are needed. Text is turned into words in slices that end
+    after a space, a tab or a new line, so an incomplete word, carriage return or page number dummy
+    at the end of a chunk is carried over to the next chunk.
+    """
+    # text after the last word separator, kept as parts until a chunk with a separator arrives, so
+    # long text without separators is neither scanned nor copied again for every chunk
+    pending_parts: list[str] = []
+    for chunk in chunks:
+        pending_parts.append(chunk)
+        if not any(separator in chunk for separator in WORD_SEPARATORS):
+            continue
+        pending = "".join(pending_parts)
+        slice_start = 0
+        while True:
+            slice_end = find_word_boundary(pending, slice_start, slice_start + STREAM_SLICE_SIZE)
+            if slice_end == slice_start:
+                break
+            yield from create_words(
+                pending[slice_start:slice_end],
+                current_font,
+                current_font_size,
+                current_font_color,
+                current_page_dummy,
+                total_pages_dummy,
+                page_num_dummy_length,
+                page_number_presentation,
+            )
+            slice_start = slice_end
+        pending_parts = [pending[slice_start:]]
+    pending = "".join(pending_parts)
+    if len(pending) > 0:
+        yield from create_words(
+            pending,
             current_font,
             current_font_size,
             current_font_color,
             current_page_dummy,
-            page_num_dummy_length,
-            page_number_presentation,
-        )
-        return (fragment, increment)
-    if (
-        total_pages_dummy is not None
-        and page_num_dummy_length is not None
-        and page_number_presentation is not None
-        and is_string_total_pages_dummy(unicode_text, char_idx, total_pages_dummy)
-    ):
-        (fragment, increment) = generate_total_pages_fragment(
-            current_font,
-            current_font_size,
-            current_font_color,
             total_pages_dummy,
             page_num_dummy_length,
             page_number_presentation,
         )
-        return (fragment, increment)
-    fragment_height = current_font._get_line_height(current_font_size)
-    fragment_width = current_font._get_char_width(unicode_text[char_idx], current_font_size)
-    fragment_ascent = current_font._get_ascent(current_font_size)
-    fragment = Fragment(
-        fragment_height,
-        fragment_width,
-        fragment_ascent,
-        unicode_text[char_idx],
-        current_font.name,
-        current_font_size,
-        current_font_color,
-    )
-    increment = 1
-    return (fragment, increment)
-
-
-def is_carriage_return_with_new_line(
-    unicode_text: str,
-    char_idx: int,
-) -> bool:
-    carriage_return = unicode_text[char_idx]
-    try:
-        new_line = unicode_text[char_idx + 1]
-    except IndexError:
-        return False
-    if carriage_return == "\r" and new_line == "\n":
-        return True
-    return False
-
-
-def is_only_carriage_return(unicode_text: str, char_idx: int) -> bool:
-    if unicode_text[char_idx] == "\r":
-        return True
-    return False
-
-
-def is_string_current_page_dummy(
-    unicode_text: str,
-    char_idx: int,
-    current_page_dummy: str,
-) -> bool:
-    start = char_idx
-    end = start + len(current_page_dummy)
-    if unicode_text[start:end] == current_page_dummy:
-        return True
-    return False
-
 
-def is_string_total_pages_dummy(unicode_text: str, char_idx: int, total_pages_dummy: str) -> bool:
-    start = char_idx
-    end = start + len(total_pages_dummy)
-    if unicode_text[start:end] == total_pages_dummy:
-        return True
-    return False
 
-
-def generate_current_page_fragment(
-    current_font: Font,
-    current_font_size: float,
-    current_font_color: tuple[float, float, float],
-    current_page_dummy: str,
-    page_num_dummy_length: int,
-    page_number_presentation: Callable[[int], str] = (str),
-) -> tuple[Fragment, int]:
-    fragment_width = page_num_dummy_length * current_font._get_char_width("0", current_font_size)
-    fragment_height = current_font._get_line_height(current_font_size)
-    fragment_ascent = current_font._get_ascent(current_font_size)
-    fragment = Fragment(
-        fragment_height,
-        fragment_width,
-        fragment_ascent,
-        current_page_dummy,
-        current_font.name,
-        current_font_size,
-        current_font_color,
-    )
-    fragment._page_number_presentation = page_number_presentation
-    fragment._is_current_page_dummy = True
-    increment = len(current_page_dummy)
-    return (fragment, increment)
-
-
-def generate_total_pages_fragment(
+def find_word_boundary(unicode_text: str, start: int, max_end: int) -> int:
+    """Finds the end of the last word separator before max_end, or of the first one after it.
+
+    Returns:
+        int: Index after the separator, or start when the text has no separator after start.
+    """
+    last_separator = max(unicode_text.rfind(separator, start, max_end) for separator in WORD_SEPARATORS)
+    if last_separator >= 0:
+        return last_separator + 1
+    next_separators = [unicode_text.find(separator, max_end) for separator in WORD_SEPARATORS]
+    next_separators = [separator_idx for separator_idx in next_separators if separator_idx >= 0]
+    if len(next_separators) > 0:
+        return min(next_separators) + 1
+    return start
+
+
+def add_fragment_to_words(words: list[Word], fragment: Fragment) -> None:
+    if fragment._chars in {"\n", "\t", " "}:
+        word = Word()
+        word._add_fragment(fragment)
+        words.append(word)
+        return
+    if len(words) == 0:
+        words.append(Word())
+    if words[-1]._is_extendable:
+        words[-1]._add_fragment(fragment)
+    else:
+        word = Word()
+        word._add_fragment(fragment)
+        words.append(word)
+
+
+@lru_cache(maxsize=16)
+def get_tokenizer(current_page_dummy: str | None, total_pages_dummy: str | None) -> re.Pattern[str]:
+    """Compiles the pattern of tokens that are not part of a run of characters.
+
+    Alternatives are tried in the order carriage return, current page dummy, total pages dummy and
+    whitespace, the text between two tokens is a run of characters.
+    """
+    dummies = [re.escape(dummy) for dummy in (current_page_dummy, total_pages_dummy) if dummy]
+    alternatives = ["\r\n?", *dummies, "[\n\t ]"]
+    return re.compile("|".join(alternatives))
+
+
+def measure_advances(unicode_text: str, current_font: Font, current_font_size: float) -> array[float]:
+    """Measures the advance of every character of the text in one call."""
+    (_, advances) = current_font.measure(unicode_text, current_font_size)
+    if not isinstance(advances, array):
+        advances = array("d", advances.tobytes())
+    return advances
+
+
+def get_text_style(
     current_font: Font,
     current_font_size: float,
-    current_font_color: tuple[float, float, float],
-    total_pages_dummy: str,
-    page_num_dummy_length: int,
-    page_number_presentation: Callable[[int], str] = (str),
-) -> tuple[Fragment, int]:
-    fragment_width = page_num_dummy_length * current_font._get_char_width("0", current_font_size)
-    fragment_height = current_font._get_line_height(current_font_size)
-    fragment_ascent = current_font._get_ascent(current_font_size)
-    fragment = Fragment(
-        fragment_height,
-        fragment_width,
-        fragment_ascent,
-        total_pages_dummy,
+    current_font_color: tuple[int, int, int],
+) -> TextStyle:
+    return TextStyle._get(
         current_font.name,
         current_font_size,
         current_font_color,
-    )
-    fragment._page_number_presentation = page_number_presentation
-    fragment._is_total_pages_dummy = True
-    increment = len(total_pages_dummy)
-    return (fragment, increment)
-
-
-def generate_new_line_fragment(
-    current_font: Font,
-    current_font_size: float,
-    current_font_color: tuple[float, float, float],
-) -> Fragment:
-    fragment_width = 0.0
-    fragment_height = current_font._get_line_height(current_font_size)
-    fragment_ascent = current_font._get_ascent(current_font_size)
-    return Fragment(
-        fragment_height, fragment_width, fragment_ascent, "\n", current_font.name, current_font_size, current_font_color
+        current_font._get_line_height(current_font_size),
+        current_font._get_ascent(current_font_size),
     )
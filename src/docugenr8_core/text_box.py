@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from contextlib import contextmanager
 from typing import TYPE_CHECKING
 
 
 if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterable
+
     from docugenr8_core.document import Document
 
 from docugenr8_core.text_area import TextArea
@@ -58,3 +62,31 @@ class TextBox:
 
     def add_text(self, unicode_text: str) -> None:
         self._text_area.add_text(unicode_text)
+
+    def add_text_stream(self, chunks: Iterable[str]) -> None:
+        """Adds text from an iterable of strings, such as an open file, to the text area of the text box.
+
+        The iterable is consumed lazily, chunks are read only while the layout needs more words, and
+        text that does not fit into the linked text areas stays unread in the iterable. A word split
+        between chunks is joined again, the part at the end of a chunk is kept until the next chunk
+        is read.
+
+        Args:
+            chunks (Iterable[str]): Text split into chunks, chunks can end in the middle of a word.
+        """
+        self._text_area.add_text_stream(chunks)
+
+    @contextmanager
+    def batch(self) -> Generator[TextBox, None, None]:
+        """Defers the layout of text added to the text box until the end of the block.
+
+        Words of add_text and add_text_stream calls inside the block wait in the buffer and are laid
+        out once when the outermost block exits, or earlier when the document is exported. If the
+        block raises, the exception propagates without laying out the words added so far, they stay
+        in the buffer until the next layout of the text area or the next export.
+
+        Yields:
+            TextBox: The text box.
+        """
+        with self._text_area.batch():
+            yield self
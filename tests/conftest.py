@@ -1,8 +1,28 @@
 import pytest
+from array import array
 from unittest.mock import MagicMock
 
 from docugenr8_core import Document
 from docugenr8_core.font import Font
+from docugenr8_core.font import font_registry
+
+@pytest.fixture(autouse=True)
+def clear_font_registry():
+    # fonts loaded by one test must not be shared with the next one
+    font_registry.clear()
+    yield
+    font_registry.clear()
+
+def measure_with(get_char_width):
+    def measure(text, font_size):
+        advances = array("d", [get_char_width(char, font_size) for char in text])
+        return sum(advances), advances
+
+    def measure_many(texts, font_size):
+        measured = [measure(text, font_size) for text in texts]
+        return [total for total, _ in measured], [advances for _, advances in measured]
+
+    return measure, measure_many
 
 @pytest.fixture
 def font1() -> Font:
@@ -33,6 +53,7 @@ def font1() -> Font:
     font1._get_ascent.side_effect  = font1_get_ascent
     font1._get_descent.side_effect  = font1_get_descent
     font1._get_line_height.side_effect  = font1_get_line_height
+    font1.measure.side_effect, font1.measure_many.side_effect = measure_with(font1_get_char_width)
     font1.name = "font1"
     return font1
 
@@ -64,6 +85,7 @@ def font2() -> Font:
     font2._get_ascent.side_effect  = font2_get_ascent
     font2._get_descent.side_effect  = font2_get_descent
     font2._get_line_height.side_effect  = font2_get_line_height
+    font2.measure.side_effect, font2.measure_many.side_effect = measure_with(font2_get_char_width)
     font2.name = "font2"
     return font2
 
@@ -80,3 +102,31 @@ def doc_with_fonts(font1, font2):
     doc.settings.paragraph_space_after = 0
     doc.settings.paragraph_space_before = 0
     return doc
+
+@pytest.fixture(scope="session")
+def ttf_path(tmp_path_factory) -> str:
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    glyph_order = [".notdef", "space", "a", "zero", "smile"]
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(glyph_order)
+    fb.setupCharacterMap({32: "space", 48: "zero", 97: "a", 0x1F600: "smile"})
+    empty_glyph = TTGlyphPen(None).glyph()
+    fb.setupGlyf({glyph_name: empty_glyph for glyph_name in glyph_order})
+    fb.setupHorizontalMetrics(
+        {
+            ".notdef": (500, 0),
+            "space": (250, 0),
+            "a": (400, 0),
+            "zero": (550, 0),
+            "smile": (1000, 0),
+        }
+    )
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({"familyName": "Test", "styleName": "Regular"})
+    fb.setupOS2()
+    fb.setupPost()
+    path = tmp_path_factory.mktemp("fonts") / "test.ttf"
+    fb.save(str(path))
+    return str(path)
@@ -0,0 +1,118 @@
+def _get_exported_lines(dto_page):
+    return [
+        "".join(fragment.chars for fragment in dto_textline.fragments)
+        for dto_paragraph in dto_page.contents[0].paragraphs
+        for dto_textline in dto_paragraph.textlines
+    ]
+
+def _add_page_with_text(doc, text):
+    page = doc.add_page(100, 100)
+    ta = doc.create_textarea(0, 0, 100, 20)
+    ta.add_text(text)
+    page.add_content(ta)
+    return ta
+
+def test__export_reuses_unchanged_pages(doc_with_fonts):
+    ta1 = _add_page_with_text(doc_with_fonts, "aa bb")
+    _add_page_with_text(doc_with_fonts, "cc dd")
+    first_dto = doc_with_fonts.export()
+    ta1.add_text(" ee")
+    second_dto = doc_with_fonts.export()
+    assert second_dto.pages[0] is not first_dto.pages[0]
+    assert second_dto.pages[1] is first_dto.pages[1]
+    assert _get_exported_lines(second_dto.pages[0]) == ["aa bb ee"]
+
+def test__export_rebuilds_page_with_added_content(doc_with_fonts):
+    _add_page_with_text(doc_with_fonts, "aa bb")
+    first_dto = doc_with_fonts.export()
+    doc_with_fonts.pages[0].add_content(doc_with_fonts.create_textarea(0, 50, 100, 20))
+    second_dto = doc_with_fonts.export()
+    assert second_dto.pages[0] is not first_dto.pages[0]
+    assert len(second_dto.pages[0].contents) == 2
+
+def test__export_rebuilds_pages_with_total_pages_only_when_page_count_changes(doc_with_fonts):
+    _add_page_with_text(doc_with_fonts, "%%tp%%")
+    _add_page_with_text(doc_with_fonts, "%%pn%%")
+    _add_page_with_text(doc_with_fonts, "aa")
+    first_dto = doc_with_fonts.export()
+    second_dto = doc_with_fonts.export()
+    assert all(second_page is first_page for second_page, first_page in zip(second_dto.pages, first_dto.pages))
+    _add_page_with_text(doc_with_fonts, "bb")
+    third_dto = doc_with_fonts.export()
+    assert third_dto.pages[0] is not first_dto.pages[0]
+    assert third_dto.pages[1] is first_dto.pages[1]
+    assert third_dto.pages[2] is first_dto.pages[2]
+    assert _get_exported_lines(third_dto.pages[0]) == ["4"]
+    assert _get_exported_lines(third_dto.pages[1]) == ["2"]
+
+def test__export_rebuilds_pages_with_shapes(doc_with_fonts):
+    page = doc_with_fonts.add_page(100, 100)
+    rectangle = doc_with_fonts.create_rectangle(0, 0, 10, 10)
+    page.add_content(rectangle)
+    first_dto = doc_with_fonts.export()
+    rectangle.width = 20
+    second_dto = doc_with_fonts.export()
+    assert second_dto.pages[0] is not first_dto.pages[0]
+    assert second_dto.pages[0].contents[0].width == 20
+
+def test__iter_export_yields_fonts_then_pages(doc_with_fonts):
+    _add_page_with_text(doc_with_fonts, "%%pn%% of %%tp%%")
+    _add_page_with_text(doc_with_fonts, "%%pn%% of %%tp%%")
+    dto = doc_with_fonts.export()
+    for page in doc_with_fonts.pages:
+        page._dto_page = None
+    exported = list(doc_with_fonts.iter_export())
+    assert [dto_font.name for dto_font in exported[:2]] == [dto_font.name for dto_font in dto.fonts]
+    assert [_get_exported_lines(dto_page) for dto_page in exported[2:]] == [["1 of 2"], ["2 of 2"]]
+    assert all(page._dto_page is None for page in doc_with_fonts.pages)
+
+def test__iter_export_generates_pages_when_requested(doc_with_fonts, monkeypatch):
+    import docugenr8_core.dto
+
+    generated_pages = []
+    generate_dto_page = docugenr8_core.dto.generate_dto_page
+    def generate_and_count(page, overlay):
+        generated_pages.append(page)
+        return generate_dto_page(page, overlay)
+    monkeypatch.setattr(docugenr8_core.dto, "generate_dto_page", generate_and_count)
+    for text in ["aa", "bb", "cc"]:
+        _add_page_with_text(doc_with_fonts, text)
+    exported = doc_with_fonts.iter_export()
+    next(exported)
+    next(exported)
+    assert generated_pages == []
+    assert _get_exported_lines(next(exported)) == ["aa"]
+    assert generated_pages == doc_with_fonts.pages[:1]
+
+def test__iter_export_reuses_pages_from_export(doc_with_fonts):
+    _add_page_with_text(doc_with_fonts, "aa")
+    dto = doc_with_fonts.export()
+    assert list(doc_with_fonts.iter_export())[-1] is dto.pages[0]
+
+def test__export_in_process_pool_merges_pages_in_order(doc_with_fonts):
+    for text in ["%%pn%% of %%tp%%", "aa", "bb", "%%pn%%", "cc"]:
+        _add_page_with_text(doc_with_fonts, text)
+    doc_with_fonts.pages[1].add_content(doc_with_fonts.create_rectangle(0, 50, 10, 10))
+    doc_with_fonts.settings.export_workers = 2
+    doc_with_fonts.settings.export_parallel_min_pages = 2
+    dto = doc_with_fonts.export()
+    assert [_get_exported_lines(dto_page) for dto_page in dto.pages] == [["1 of 5"], ["aa"], ["bb"], ["4"], ["cc"]]
+    assert dto.pages[1].contents[1].width == 10
+    assert all(dto_page is page._dto_page for dto_page, page in zip(dto.pages, doc_with_fonts.pages))
+    assert doc_with_fonts.export().pages[2] is dto.pages[2]
+
+def test__export_below_parallel_min_pages_is_serial(doc_with_fonts, monkeypatch):
+    import docugenr8_core.dto
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Process pool is started.")
+    monkeypatch.setattr(docugenr8_core.dto, "ProcessPoolExecutor", fail)
+    for text in ["aa", "bb"]:
+        _add_page_with_text(doc_with_fonts, text)
+    doc_with_fonts.settings.export_workers = 2
+    doc_with_fonts.settings.export_parallel_min_pages = 3
+    dto = doc_with_fonts.export()
+    assert [_get_exported_lines(dto_page) for dto_page in dto.pages] == [["aa"], ["bb"]]
+    _add_page_with_text(doc_with_fonts, "cc")
+    doc_with_fonts.settings.export_parallel_min_pages = 2
+    assert _get_exported_lines(doc_with_fonts.export().pages[2]) == ["cc"]
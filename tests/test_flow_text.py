@@ -0,0 +1,50 @@
+import pytest
+
+from docugenr8_core import PageTemplate
+
+def _get_lines(page):
+    return [line._get_chars() for paragraph in page._contents[0]._paragraphs for line in paragraph._textlines]
+
+def test__flow_text_adds_pages_until_text_is_laid_out(doc_with_fonts):
+    doc_with_fonts.settings.textline_height_ratio = 1
+    template = PageTemplate(100, 100, 10, 10, 15, 20)
+    pages = doc_with_fonts.flow_text("aa bb cc dd\nee ", template)
+    assert pages == doc_with_fonts.pages
+    assert [_get_lines(page) for page in pages] == [["aa ", "bb "], ["cc ", "dd\n"], ["ee "]]
+    textarea = pages[0]._contents[0]
+    assert (textarea._x, textarea._y, textarea._width, textarea._height) == (10, 10, 15, 20)
+    assert len(textarea._get_buffer()) == 0
+
+def test__flow_text_reads_text_stream(doc_with_fonts):
+    doc_with_fonts.settings.textline_height_ratio = 1
+    template = PageTemplate(100, 100, 0, 0, 15, 20)
+    pages = doc_with_fonts.flow_text(iter(["aa b", "b cc d", "d ee"]), template)
+    assert [_get_lines(page) for page in pages] == [["aa ", "bb "], ["cc ", "dd "], ["ee"]]
+
+def test__flow_text_raises_when_word_does_not_fit(doc_with_fonts):
+    doc_with_fonts.settings.text_split_words = False
+    template = PageTemplate(100, 100, 0, 0, 15, 20)
+    with pytest.raises(ValueError, match="does not fit"):
+        doc_with_fonts.flow_text("aa bbbbbbbb", template)
+
+def test__flow_text_removes_added_pages_when_word_does_not_fit(doc_with_fonts):
+    doc_with_fonts.settings.text_split_words = False
+    page = doc_with_fonts.add_page(100, 100)
+    template = PageTemplate(100, 100, 0, 0, 15, 20)
+    with pytest.raises(ValueError, match="does not fit"):
+        doc_with_fonts.flow_text("aa bb cc dd bbbbbbbb", template)
+    assert doc_with_fonts.pages == [page]
+
+def test__flow_text_raises_for_invalid_page_template(doc_with_fonts):
+    templates = [
+        PageTemplate(0, 100, 0, 0, 15, 20),
+        PageTemplate(100, 100, 0, 0, 0, 20),
+        PageTemplate(100, 100, 0, 0, 15, -20),
+        PageTemplate(100, 100, -10, 0, 15, 20),
+        PageTemplate(100, 100, 90, 0, 15, 20),
+        PageTemplate(100, 100, 0, 90, 15, 20),
+    ]
+    for template in templates:
+        with pytest.raises(ValueError, match="page template"):
+            doc_with_fonts.flow_text("aa bb", template)
+    assert doc_with_fonts.pages == []
@@ -0,0 +1,213 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from fontTools import ttLib
+
+from docugenr8_core import Document
+from docugenr8_core.font import Font
+from docugenr8_core.font import FontRegistry
+
+
+def test__char_width_from_advance_table(ttf_path):
+    font = Font("test", ttf_path)
+    assert font._get_char_width("a", 10) == 4
+    assert font._get_char_width(" ", 10) == 2.5
+    assert font._get_char_width("0", 10) == 5.5
+
+
+def test__char_width_outside_bmp(ttf_path):
+    font = Font("test", ttf_path)
+    assert font._get_char_width("\U0001F600", 10) == 10
+
+
+def test__char_width_of_undefined_char_is_notdef_width(ttf_path):
+    font = Font("test", ttf_path)
+    assert font._get_char_width("b", 10) == 5
+    assert font._get_char_width("\U0001F601", 10) == 5
+
+
+def test__char_width_of_tab_and_new_line(ttf_path):
+    font = Font("test", ttf_path)
+    assert font._get_char_width("\t", 10) == 0
+    assert font._get_char_width("\n", 10) == 0
+
+
+def test__measure(ttf_path):
+    font = Font("test", ttf_path)
+    total, advances = font.measure("a a\U0001F600b", 10)
+    assert list(advances) == [4, 2.5, 4, 10, 5]
+    assert total == 25.5
+
+
+def test__measure_empty_text(ttf_path):
+    font = Font("test", ttf_path)
+    total, advances = font.measure("", 10)
+    assert total == 0
+    assert len(advances) == 0
+
+
+def test__measure_lone_surrogate(ttf_path):
+    font = Font("test", ttf_path)
+    total, advances = font.measure("a\ud800b", 10)
+    assert list(advances) == list(font._measure_array("a\ud800b", 10))
+    assert total == sum(font._measure_array("a\ud800b", 10))
+
+
+def test__measure_many(ttf_path):
+    font = Font("test", ttf_path)
+    totals, advances = font.measure_many(["aa", "", "0 "], 10)
+    assert totals == [8, 0, 8]
+    assert [list(char_advances) for char_advances in advances] == [[4, 4], [], [5.5, 2.5]]
+
+
+def test__measure_without_numpy(ttf_path, monkeypatch):
+    monkeypatch.setattr("docugenr8_core.font.np", None)
+    font = Font("test", ttf_path)
+    total, advances = font.measure("a a\U0001F600b", 10)
+    assert advances.typecode == "d"
+    assert list(advances) == [4, 2.5, 4, 10, 5]
+    assert total == 25.5
+    totals, _ = font.measure_many(["aa", "0 "], 10)
+    assert totals == [8, 8]
+
+
+def test__metrics_cache_is_written_and_reused(ttf_path, tmp_path):
+    font = Font("test", ttf_path, str(tmp_path))
+    assert len(list(tmp_path.glob("*.metrics"))) == 2
+    cached_font = Font("test", ttf_path, str(tmp_path))
+    assert cached_font._metrics_cache is not None
+    assert cached_font._parsed.ttfont is None
+    assert cached_font.em == font.em
+    assert cached_font.ascent_per_em == font.ascent_per_em
+    assert cached_font.descent_per_em == font.descent_per_em
+    assert cached_font.measure("a a\U0001F600b", 10)[0] == font.measure("a a\U0001F600b", 10)[0]
+    assert cached_font._get_char_width("\t", 10) == 0
+    assert cached_font._parsed.ttfont is None
+    assert cached_font.cmap[97] == "a"
+
+
+def test__invalid_metrics_cache_is_rebuilt(ttf_path, tmp_path):
+    Font("test", ttf_path, str(tmp_path))
+    for cache_path in tmp_path.glob("*.metrics"):
+        cache_path.write_bytes(b"invalid")
+    font = Font("test", ttf_path, str(tmp_path))
+    assert font._metrics_cache is None
+    assert font._get_char_width("a", 10) == 4
+    assert Font("test", ttf_path, str(tmp_path))._metrics_cache is not None
+
+
+def test__cached_metrics_are_loaded_without_hashing_font_file(ttf_path, tmp_path, monkeypatch):
+    Font("test", ttf_path, str(tmp_path))
+    hashed_data = []
+    sha256 = hashlib.sha256
+
+    def recording_sha256(data):
+        hashed_data.append(bytes(data))
+        return sha256(data)
+
+    monkeypatch.setattr(hashlib, "sha256", recording_sha256)
+    font = Font("test", ttf_path, str(tmp_path))
+    assert font._metrics_cache is not None
+    with open(ttf_path, "rb") as font_file:
+        assert font_file.read() not in hashed_data
+
+
+def test__metrics_cache_of_copied_font_file_is_found_by_content(ttf_path, tmp_path):
+    Font("test", ttf_path, str(tmp_path / "cache"))
+    copied_path = tmp_path / "copied.ttf"
+    copied_path.write_bytes(open(ttf_path, "rb").read())
+    font = Font("test", str(copied_path), str(tmp_path / "cache"))
+    assert font._metrics_cache is not None
+    assert len(list((tmp_path / "cache").glob("*.metrics"))) == 3
+
+
+def test__raw_data_is_read_only_view_of_font_file(ttf_path):
+    font = Font("test", ttf_path)
+    assert isinstance(font.raw_data, memoryview)
+    assert font.raw_data.readonly
+    with open(ttf_path, "rb") as font_file:
+        assert font.raw_data == font_file.read()
+
+
+def test__font_is_parsed_from_font_file_map(ttf_path):
+    font = Font("test", ttf_path)
+    assert font.ttfont.reader.file._data is font.raw_data
+    assert font.ttfont.lazy is True
+
+
+def test__dto_font_shares_font_data(ttf_path):
+    doc = Document()
+    doc.add_font("test", ttf_path)
+    dto = doc.export()
+    assert dto.fonts[0].raw_data is doc.fonts["test"].raw_data
+    other_doc = Document()
+    other_doc.add_font("other", ttf_path)
+    assert other_doc.export().fonts[0].raw_data is dto.fonts[0].raw_data
+
+
+def test__documents_share_fonts_from_registry(ttf_path):
+    doc1 = Document()
+    doc1.add_font("test", ttf_path)
+    doc2 = Document()
+    doc2.add_font("test", ttf_path)
+    assert doc1.fonts["test"] is doc2.fonts["test"]
+
+
+def test__font_added_under_another_name_shares_font_data(ttf_path):
+    doc = Document()
+    doc.add_font("test", ttf_path)
+    doc.add_font("other", ttf_path)
+    assert doc.fonts["other"].name == "other"
+    assert doc.fonts["test"].name == "test"
+    assert doc.fonts["other"]._bmp_advances is doc.fonts["test"]._bmp_advances
+    assert doc.fonts["other"].ttfont is doc.fonts["test"].ttfont
+
+
+def test__documents_share_font_added_under_another_name(ttf_path):
+    doc1 = Document()
+    doc1.add_font("other", ttf_path)
+    doc2 = Document()
+    doc2.add_font("other", ttf_path)
+    assert doc1.fonts["other"] is doc2.fonts["other"]
+
+
+def test__fonts_are_subset_from_several_threads(ttf_path):
+    unicode_sets = [{ord("a")}, {ord(" ")}, {ord("0")}, {ord("a"), ord("0")}] * 4
+    font = Font("test", ttf_path)
+    with ThreadPoolExecutor(8) as executor:
+        subsets = list(executor.map(font._subset, unicode_sets))
+    for unicodes, font_subset in zip(unicode_sets, subsets):
+        assert set(ttLib.TTFont(BytesIO(font_subset)).getBestCmap()) >= unicodes
+
+
+def test__font_registry_drops_least_recently_used_unpinned_fonts(ttf_path, tmp_path):
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"font{index}.ttf"
+        path.write_bytes(open(ttf_path, "rb").read())
+        paths.append(str(path))
+    registry = FontRegistry(max_size=1)
+    pinned_font = registry.preload(paths[0])
+    font1 = registry.get("font1", paths[1])
+    assert registry.get("font1", paths[1]) is font1
+    registry.get("font2", paths[2])
+    assert registry.get("font1", paths[1]) is not font1
+    assert registry.get("font0", paths[0]) is pinned_font
+    registry.unpin(paths[0])
+    assert len(registry._fonts) == 1
+
+
+def test__export_with_font_subsetting(ttf_path):
+    doc = Document()
+    doc.settings.font_subsetting = True
+    doc.add_font("test", ttf_path)
+    doc.add_page(100, 100)
+    ta = doc.create_textarea(0, 0, 100, 100)
+    ta.add_text("aa a")
+    doc.pages[0].add_content(ta)
+    dto = doc.export()
+    subset_font = ttLib.TTFont(BytesIO(dto.fonts[0].raw_data))
+    assert set(subset_font.getBestCmap()) == {ord("a"), ord(" ")}
+    ta.add_text("a")
+    assert doc.export().fonts[0].raw_data is dto.fonts[0].raw_data
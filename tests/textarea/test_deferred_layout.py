@@ -0,0 +1,95 @@
+import pytest
+
+from docugenr8_core import PageTemplate
+
+def _get_lines(textarea):
+    return [textline._get_chars() for paragraph in textarea._paragraphs for textline in paragraph._textlines]
+
+def test__textarea_batch_lays_out_once_at_the_end(doc_with_fonts):
+    texts = ["aa ", "bb", "b cc\tdd ", "ee\nff ", "gg hh ii jj kk ll mm"]
+    eager = doc_with_fonts.create_textarea(0, 0, 50, 60)
+    for text in texts:
+        eager.add_text(text)
+    ta = doc_with_fonts.create_textarea(0, 0, 50, 60)
+    with ta.batch():
+        for text in texts:
+            ta.add_text(text)
+        with ta.batch():
+            ta.add_text(" nn")
+        assert len(ta._paragraphs) == 0
+        assert len(ta._get_buffer()) > 0
+    eager.add_text(" nn")
+    assert _get_lines(ta) == _get_lines(eager)
+    assert ta._available_height == eager._available_height
+    assert len(ta._get_buffer()) == len(eager._get_buffer())
+
+def test__document_deferred_layout_is_run_on_export(doc_with_fonts):
+    page = doc_with_fonts.add_page(100, 100)
+    ta1 = doc_with_fonts.create_textarea(0, 0, 50, 60)
+    ta2 = doc_with_fonts.create_textarea(0, 0, 50, 60)
+    page.add_content(ta1)
+    page.add_content(ta2)
+    with doc_with_fonts.deferred_layout():
+        ta1.add_text("aa bb")
+        ta2.add_text("cc dd")
+        assert len(ta1._paragraphs) == 0
+        doc_with_fonts.export()
+        assert _get_lines(ta1) == ["aa bb"]
+        ta1.add_text(" ee")
+        assert _get_lines(ta1) == ["aa bb"]
+    assert _get_lines(ta1) == ["aa bb ee"]
+    assert _get_lines(ta2) == ["cc dd"]
+
+def test__textbox_batch_that_raises_leaves_words_for_export(doc_with_fonts):
+    page = doc_with_fonts.add_page(100, 100)
+    tb = doc_with_fonts.create_textbox(0, 0, 50, 60)
+    page.add_content(tb)
+    with pytest.raises(RuntimeError), tb.batch():
+        tb.add_text("aa bb")
+        raise RuntimeError()
+    assert len(tb._text_area._paragraphs) == 0
+    doc_with_fonts.export()
+    assert _get_lines(tb._text_area) == ["aa bb"]
+
+def test__textarea_batch_lays_out_words_with_settings_of_their_calls(doc_with_fonts):
+    def add_texts(textarea):
+        doc_with_fonts.settings.paragraph_first_line_indent = 20
+        doc_with_fonts.settings.text_tab_size = 35
+        textarea.add_text("aa\tbb cc dd\n")
+        doc_with_fonts.settings.paragraph_first_line_indent = 0
+        doc_with_fonts.settings.text_tab_size = 10
+        textarea.add_text("ee\tff gg hh\n")
+        doc_with_fonts.settings.paragraph_line_breaking = "total-fit"
+        textarea.add_text("ii jj kk ll mm nn")
+
+    eager = doc_with_fonts.create_textarea(0, 0, 50, 200)
+    add_texts(eager)
+    doc_with_fonts.settings.paragraph_line_breaking = "greedy"
+    ta = doc_with_fonts.create_textarea(0, 0, 50, 200)
+    with ta.batch():
+        add_texts(ta)
+        doc_with_fonts.settings.paragraph_first_line_indent = 30
+    assert _get_lines(ta) == _get_lines(eager)
+    assert [paragraph._first_line_indent for paragraph in ta._paragraphs] == [20, 0, 0]
+    assert [paragraph._line_breaking for paragraph in ta._paragraphs] == ["greedy", "greedy", "total-fit"]
+    assert [paragraph._tab_size for paragraph in ta._paragraphs] == [35, 10, 10]
+    assert doc_with_fonts.settings.paragraph_first_line_indent == 30
+
+def test__textarea_batch_defers_linking(doc_with_fonts):
+    ta1 = doc_with_fonts.create_textarea(0, 0, 50, 20)
+    ta2 = doc_with_fonts.create_textarea(0, 0, 50, 60)
+    ta1.add_text("aa bb cc dd ee ff gg hh")
+    lines = _get_lines(ta1)
+    with ta1.batch():
+        ta1.link_textarea(ta2)
+        assert _get_lines(ta1) == lines
+        assert len(ta2._paragraphs) == 0
+    assert len(ta2._paragraphs) > 0
+    assert len(ta1._get_buffer()) == 0
+
+def test__flow_text_lays_out_pages_inside_deferred_layout(doc_with_fonts):
+    doc_with_fonts.settings.textline_height_ratio = 1
+    template = PageTemplate(100, 100, 0, 0, 15, 20)
+    with doc_with_fonts.deferred_layout():
+        pages = doc_with_fonts.flow_text("aa bb cc dd ee ", template)
+    assert len(pages) == 3
@@ -0,0 +1,68 @@
+from docugenr8_core.text_area.line_breaking import SPACE
+from docugenr8_core.text_area.line_breaking import WORD
+from docugenr8_core.text_area.line_breaking import break_lines_total_fit
+
+def _layout(doc, text, batch_line_breaking):
+    doc.settings.text_batch_line_breaking = batch_line_breaking
+    doc.settings.textline_height_ratio = 1.2
+    doc.settings.text_tab_size = 40
+    ta = doc.create_textarea(0, 0, 100, 130)
+    ta.add_text(text)
+    lines = []
+    for paragraph in ta._paragraphs:
+        for textline in paragraph._textlines:
+            lines.append(
+                (
+                    textline._get_chars(),
+                    textline._available_width,
+                    textline._spaces_width_at_the_end,
+                    textline._leading,
+                    [tab._width for tab in textline._tabs],
+                )
+            )
+    buffer = "".join(word._chars for word in ta._get_buffer())
+    heights = [paragraph._height for paragraph in ta._paragraphs]
+    return lines, buffer, heights, ta._available_height
+
+def test__batch_line_breaking_matches_word_by_word(doc_with_fonts):
+    text = "aa bb\tccc   dddddddddd e\tf\t\tgg\nhhhh iiiiiiiiiiiiiiiiiiiiiiiii jj \n\n" * 3
+    batch = _layout(doc_with_fonts, text, True)
+    word_by_word = _layout(doc_with_fonts, text, False)
+    assert batch == word_by_word
+    assert batch[1] != ""
+    assert batch[0][0] == ("aa bb\tccc   ", 45, 15, 2.0, [15])
+
+def test__total_fit_stretches_lines_evenly():
+    widths = [2, 1, 2, 1, 2, 1, 4]
+    kinds = [WORD, SPACE, WORD, SPACE, WORD, SPACE, WORD]
+    assert break_lines_total_fit(widths, kinds, [8, 8], False) == [6, 7]
+    assert break_lines_total_fit(widths, kinds, [8, 8], True) == [4, 7]
+    assert break_lines_total_fit(widths, kinds, [8], False) is None
+
+def test__total_fit_keeps_number_of_lines(doc_with_fonts):
+    doc_with_fonts.settings.text_h_align = "justify"
+    text = "abcdefghi ab ab a a abcde abcdef abcdefgh"
+    ta_greedy = doc_with_fonts.create_textarea(0, 0, 100, 100)
+    ta_greedy.add_text(text)
+    doc_with_fonts.settings.paragraph_line_breaking = "total-fit"
+    ta = doc_with_fonts.create_textarea(0, 0, 100, 100)
+    ta.add_text(text)
+    textlines = ta._paragraphs[0]._textlines
+    assert [textline._get_chars() for textline in ta_greedy._paragraphs[0]._textlines] == [
+        "abcdefghi ab ab a a ",
+        "abcde abcdef ",
+        "abcdefgh",
+    ]
+    assert [textline._get_chars() for textline in textlines] == ["abcdefghi ab ab ", "a a abcde abcdef ", "abcdefgh"]
+    assert [textline._available_width for textline in textlines] == [25, 20, 60]
+    assert [textline._spaces_width_at_the_end for textline in textlines] == [5, 5, 0]
+    assert ta._paragraphs[0]._height == ta_greedy._paragraphs[0]._height
+    assert ta._available_height == ta_greedy._available_height
+    ta.add_text(" ab abcdefghijklmno")
+    # words appended to the paragraph are broken greedily first, then the lines are broken again
+    assert [textline._get_chars() for textline in ta._paragraphs[0]._textlines] == [
+        "abcdefghi ab ab ",
+        "a a abcde ",
+        "abcdef abcdefgh ab ",
+        "abcdefghijklmno",
+    ]
@@ -120,3 +120,62 @@ def test__textarea_linked_textareas_emptying_with_paragraphs(doc_with_fonts):
     assert words_buffer[11]._chars == " "
     assert words_buffer[12]._chars == "jj"
     assert words_buffer[13]._chars == " "
+
+def test__textarea_linked_textareas_text_stream(doc_with_fonts):
+    doc_with_fonts.settings.textline_height_ratio = 1
+    read_chunks = []
+
+    def chunks():
+        for chunk in ["aa b", "b cc", " dd\r", "\nee ", "ff gg hh"]:
+            read_chunks.append(chunk)
+            yield chunk
+
+    ta1 = doc_with_fonts.create_textarea(0, 0, 15, 20)
+    ta1.add_text_stream(chunks())
+    assert [line._get_chars() for line in ta1._paragraphs[0]._textlines] == ["aa ", "bb "]
+    assert len(read_chunks) == 3
+    ta2 = doc_with_fonts.create_textarea(0, 0, 15, 20)
+    ta1.link_textarea(ta2)
+    assert [line._get_chars() for line in ta2._paragraphs[0]._textlines] == ["cc ", "dd\n"]
+    ta2.add_text(" ii")
+    ta3 = doc_with_fonts.create_textarea(0, 0, 15, 100)
+    ta2.link_textarea(ta3)
+    chars = "".join(line._get_chars() for paragraph in ta3._paragraphs for line in paragraph._textlines)
+    assert chars == "ee ff gg hh ii"
+    assert len(read_chunks) == 5
+
+def test__textarea_linked_textareas_share_chain(doc_with_fonts):
+    doc_with_fonts.settings.textline_height_ratio = 1
+    ta1 = doc_with_fonts.create_textarea(0, 0, 15, 20)
+    ta1.add_text("aa bb cc dd ee ff gg hh ")
+    ta2 = doc_with_fonts.create_textarea(0, 0, 15, 20)
+    ta3 = doc_with_fonts.create_textarea(0, 0, 15, 40)
+    ta1.link_textarea(ta2)
+    ta2.link_textarea(ta3)
+    chain = ta1._chain
+    assert ta2._chain is chain
+    assert ta3._chain is chain
+    assert chain._head is ta1
+    assert chain._tail is ta3
+    assert [ta1._chain_position, ta2._chain_position, ta3._chain_position] == [0, 1, 2]
+    assert ta3._get_buffer() is ta1._get_buffer()
+    assert [line._get_chars() for line in ta3._paragraphs[0]._textlines] == ["ee ", "ff ", "gg ", "hh "]
+    assert ta1._get_the_first_textarea_to_accept_words() is ta3
+    assert ta2._get_next_textarea_with_words() is ta3
+    ta1.add_text("ii ")
+    assert ta1._get_the_first_textarea_to_accept_words() is None
+    assert ta3._get_next_textarea_with_words() is None
+    assert [word._chars for word in ta1._get_buffer()] == ["ii", " "]
+
+def test__textarea_linked_textareas_before_adding_text(doc_with_fonts):
+    doc_with_fonts.settings.textline_height_ratio = 1
+    ta1 = doc_with_fonts.create_textarea(0, 0, 15, 20)
+    ta2 = doc_with_fonts.create_textarea(0, 0, 15, 20)
+    ta3 = doc_with_fonts.create_textarea(0, 0, 15, 40)
+    ta1.link_textarea(ta2)
+    ta2.link_textarea(ta3)
+    ta1.add_text("aa bb cc dd ee ff gg hh ")
+    assert [line._get_chars() for line in ta1._paragraphs[0]._textlines] == ["aa ", "bb "]
+    assert [line._get_chars() for line in ta2._paragraphs[0]._textlines] == ["cc ", "dd "]
+    assert [line._get_chars() for line in ta3._paragraphs[0]._textlines] == ["ee ", "ff ", "gg ", "hh "]
+    assert len(ta1._get_buffer()) == 0
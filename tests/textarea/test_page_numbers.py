@@ -0,0 +1,97 @@
+def _get_lines(textarea):
+    return [textline._get_chars() for paragraph in textarea._paragraphs for textline in paragraph._textlines]
+
+def _get_exported_lines(dto, page_index):
+    dto_text_area = dto.pages[page_index].contents[0]
+    return [
+        "".join(fragment.chars for fragment in dto_textline.fragments)
+        for dto_paragraph in dto_text_area.paragraphs
+        for dto_textline in dto_paragraph.textlines
+    ]
+
+def _get_available_widths(textarea):
+    return [textline._available_width for paragraph in textarea._paragraphs for textline in paragraph._textlines]
+
+def test__page_number_narrower_than_reserved_width_keeps_lines(doc_with_fonts):
+    page = doc_with_fonts.add_page(100, 100)
+    ta = doc_with_fonts.create_textarea(0, 0, 50, 60)
+    page.add_content(ta)
+    ta.add_text("aaaa %%pn%% bb cc")
+    assert _get_lines(ta) == ["aaaa %%pn%% bb ", "cc"]
+    assert _get_available_widths(ta) == [0, 40]
+    dto = doc_with_fonts.export()
+    assert _get_exported_lines(dto, 0) == ["aaaa 1 bb ", "cc"]
+    assert _get_lines(ta) == ["aaaa %%pn%% bb ", "cc"]
+    assert _get_available_widths(ta) == [5, 40]
+
+def test__page_number_wider_than_reserved_width_reflows_lines(doc_with_fonts):
+    doc_with_fonts.settings.page_num_presentation = lambda page_number: f"({page_number})"
+    page = doc_with_fonts.add_page(100, 100)
+    ta = doc_with_fonts.create_textarea(0, 0, 50, 60)
+    page.add_content(ta)
+    ta.add_text("aaaa %%pn%% bb cc")
+    dto = doc_with_fonts.export()
+    assert _get_exported_lines(dto, 0) == ["aaaa (1) ", "bb cc"]
+    assert _get_lines(ta) == ["aaaa %%pn%% ", "bb cc"]
+    assert _get_available_widths(ta) == [10, 25]
+
+def test__page_number_pushed_to_next_page_is_filled_in_again(doc_with_fonts):
+    doc_with_fonts.settings.page_num_presentation = lambda page_number: f"({page_number})"
+    doc_with_fonts.settings.textline_height_ratio = 1
+    ta1 = doc_with_fonts.create_textarea(0, 0, 50, 20)
+    ta2 = doc_with_fonts.create_textarea(0, 0, 50, 40)
+    doc_with_fonts.add_page(100, 100).add_content(ta1)
+    doc_with_fonts.add_page(100, 100).add_content(ta2)
+    ta1.link_textarea(ta2)
+    ta1.add_text("aa bb cc ddd eee %%pn%% ff gg hh ii jj kk")
+    assert _get_lines(ta1) == ["aa bb cc ", "ddd eee %%pn%% "]
+    dto = doc_with_fonts.export()
+    assert _get_exported_lines(dto, 0) == ["aa bb cc ", "ddd eee "]
+    assert _get_exported_lines(dto, 1) == ["(2) ff gg ", "hh ii jj ", "kk"]
+    assert len(ta1._words_with_current_page_fragments) == 0
+    assert [word._chars for word in ta2._words_with_current_page_fragments] == ["%%pn%%"]
+
+def test__words_pushed_to_next_textarea_keep_order(doc_with_fonts):
+    doc_with_fonts.settings.page_num_presentation = lambda page_number: f"({page_number})"
+    doc_with_fonts.settings.textline_height_ratio = 1
+    ta1 = doc_with_fonts.create_textarea(0, 0, 50, 20)
+    ta2 = doc_with_fonts.create_textarea(0, 0, 50, 40)
+    doc_with_fonts.add_page(100, 100).add_content(ta1)
+    doc_with_fonts.add_page(100, 100).add_content(ta2)
+    ta1.link_textarea(ta2)
+    ta1.add_text("aaaa bb %%pn%% c d e f g h ii jj kk ll mm")
+    assert _get_lines(ta2) == ["h ii jj kk ", "ll mm"]
+    dto = doc_with_fonts.export()
+    assert _get_exported_lines(dto, 0) == ["aaaa bb ", "(1) c d e "]
+    assert _get_exported_lines(dto, 1) == ["f g h ii ", "jj kk ll ", "mm"]
+    assert ta2._paragraphs[0]._prev_linked_paragraph is ta1._paragraphs[0]
+
+def test__export_is_repeatable(doc_with_fonts):
+    doc_with_fonts.settings.page_num_presentation = lambda page_number: f"({page_number})"
+    page = doc_with_fonts.add_page(100, 100)
+    ta = doc_with_fonts.create_textarea(0, 0, 50, 60)
+    page.add_content(ta)
+    ta.add_text("aaaa %%pn%% bb cc %%tp%%")
+    first_dto = doc_with_fonts.export()
+    lines = _get_lines(ta)
+    available_widths = _get_available_widths(ta)
+    second_dto = doc_with_fonts.export()
+    assert _get_exported_lines(second_dto, 0) == _get_exported_lines(first_dto, 0) == ["aaaa (1) ", "bb cc (1)"]
+    assert [
+        (fragment.x, fragment.y, fragment.width) for fragment in second_dto.pages[0].contents[0].fragments
+    ] == [(fragment.x, fragment.y, fragment.width) for fragment in first_dto.pages[0].contents[0].fragments]
+    assert _get_lines(ta) == lines
+    assert _get_available_widths(ta) == available_widths
+
+def test__export_after_adding_pages_updates_page_numbers(doc_with_fonts):
+    footers = []
+    for _ in range(2):
+        page = doc_with_fonts.add_page(100, 100)
+        footer = doc_with_fonts.create_textarea(0, 0, 100, 20)
+        footer.add_text("%%pn%% of %%tp%%")
+        page.add_content(footer)
+        footers.append(footer)
+        dto = doc_with_fonts.export()
+    assert _get_exported_lines(dto, 0) == ["1 of 2"]
+    assert _get_exported_lines(dto, 1) == ["2 of 2"]
+    assert [_get_lines(footer) for footer in footers] == [["%%pn%% of %%tp%%"], ["%%pn%% of %%tp%%"]]
@@ -0,0 +1,37 @@
+def test__paragraph_reflow_stops_at_unchanged_line(doc_with_fonts):
+    ta = doc_with_fonts.create_textarea(0, 0, 50, 200)
+    ta.add_text("aa bbb cc dd eeeeee ff gg hh iiiiiiii jj kk ll")
+    paragraph = ta._paragraphs[0]
+    assert [textline._get_chars() for textline in paragraph._textlines] == [
+        "aa bbb cc ",
+        "dd eeeeee ",
+        "ff gg hh ",
+        "iiiiiiii ",
+        "jj kk ll",
+    ]
+    textline = paragraph._textlines[0]
+    last_textlines = list(paragraph._textlines)[3:]
+    last_words = [list(textline._words) for textline in last_textlines]
+    textline._pop_word(2)
+    textline._pop_word(2)
+    assert paragraph._reflow_from_textline(textline)
+    assert [textline._get_chars() for textline in paragraph._textlines] == [
+        "aa cc dd ",
+        "eeeeee ff ",
+        "gg hh ",
+        "iiiiiiii ",
+        "jj kk ll",
+    ]
+    assert list(paragraph._textlines)[3:] == last_textlines
+    assert [list(textline._words) for textline in last_textlines] == last_words
+    assert paragraph._height == 58
+
+def test__paragraph_reflow_reports_changed_number_of_lines(doc_with_fonts):
+    ta = doc_with_fonts.create_textarea(0, 0, 50, 200)
+    ta.add_text("aa bbb cc dd ee ff gg")
+    paragraph = ta._paragraphs[0]
+    textline = paragraph._textlines[0]
+    textline._pop_word(2)
+    textline._pop_word(2)
+    assert not paragraph._reflow_from_textline(textline)
+    assert [textline._get_chars() for textline in paragraph._textlines] == ["aa cc dd ", "ee ff gg"]
@@ -109,6 +109,15 @@ def test__textline_word_width_exceeds_textline_width(doc_with_fonts):
     ta.add_text("cccccc dd ee ")
     assert len(words_buffer) == 0
 
+def test__textline_long_word_is_split_over_all_lines(doc_with_fonts):
+    doc_with_fonts.settings.text_split_words = True
+    ta = doc_with_fonts.create_textarea(0, 0, 25, 100)
+    ta.add_text("a" * 23)
+    lines = ta._paragraphs[0]._textlines
+    assert [line._get_chars() for line in lines] == ["aaaaa"] * 4 + ["aaa"]
+    assert [line._available_width for line in lines] == [0, 0, 0, 0, 10]
+    assert ta._paragraphs[0]._get_chars() == "a" * 23
+
 def test__textline_fragment_width_exceeds_textline_width(doc_with_fonts):
     doc_with_fonts.settings.paragraph_first_line_indent = 0
     doc_with_fonts.settings.paragraph_hanging_indent = 0
@@ -162,7 +171,7 @@ def test__word_split(doc_with_fonts):
     ta.add_text("ab%%pn%%cd%%tp%%ef")
     textline = ta._paragraphs[0]._textlines[0]
     word = ta._paragraphs[0]._textlines[0]._words[0]
-    assert len(ta._paragraphs[0]._textlines[0]._words[0]._fragments) == 8
+    assert len(ta._paragraphs[0]._textlines[0]._words[0]._fragments) == 5
     assert len(ta._words_with_current_page_fragments) == 1
     assert ta._words_with_current_page_fragments[0] == textline._words[0]
     assert len(ta._words_with_total_pages_fragments) == 1
@@ -182,8 +191,26 @@ def test__merge_words(doc_with_fonts):
     ta.add_text("d%%tp%%ef")
     textline = ta._paragraphs[0]._textlines[0]
     assert len(ta._paragraphs[0]._textlines[0]._words) == 1
-    assert len(ta._paragraphs[0]._textlines[0]._words[0]._fragments) == 8
+    assert len(ta._paragraphs[0]._textlines[0]._words[0]._fragments) == 5
     assert len(ta._words_with_current_page_fragments) == 1
     assert ta._words_with_current_page_fragments[0] == textline._words[0]
     assert len(ta._words_with_total_pages_fragments) == 1
     assert ta._words_with_total_pages_fragments[0] == textline._words[0]
+
+def test__tab_widths_follow_words_before_them(doc_with_fonts):
+    doc_with_fonts.settings.text_tab_size = 20
+    ta = doc_with_fonts.create_textarea(0, 0, 100, 100)
+    ta.add_text("a\tbb\tc")
+    textline = ta._paragraphs[0]._textlines[0]
+    assert [word._width for word in textline._tabs] == [15, 10]
+    textline._pop_word(0)
+    assert [word._width for word in textline._tabs] == [20, 10]
+    new_words = create_words(
+        "aaa",
+        doc_with_fonts.fonts["font1"],
+        doc_with_fonts.settings.font_size,
+        doc_with_fonts.settings.font_color)
+    textline._append_word(new_words[0], 0)
+    assert [word._width for word in textline._tabs] == [5, 10]
+    assert textline._available_width == 100 - 45
+    assert textline._test_tab_width() == 15
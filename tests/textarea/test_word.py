@@ -0,0 +1,92 @@
+from docugenr8_core.text_area.words_creation import create_words
+
+
+def test__word_keeps_run_of_characters_in_one_fragment(font1):
+    words = create_words("abcd ef", font1, 10, (0, 0, 0))
+    assert len(words) == 3
+    assert len(words[0]._fragments) == 1
+    assert words[0]._fragments[0]._chars == "abcd"
+    assert list(words[0]._fragments[0]._advances) == [5, 5, 5, 5]
+    assert words[0]._width == 20
+
+
+def test__word_extends_run_with_same_style(font1, font2):
+    word = create_words("ab", font1, 10, (0, 0, 0))[0]
+    word._add_fragment(create_words("cd", font1, 10, (0, 0, 0))[0]._fragments[0])
+    assert len(word._fragments) == 1
+    assert word._chars == "abcd"
+    assert word._width == 20
+    word._add_fragment(create_words("ef", font2, 10, (0, 0, 0))[0]._fragments[0])
+    assert len(word._fragments) == 2
+    assert word._chars == "abcdef"
+    assert word._width == 40
+
+
+def test__split_first_fragment_of_word(font1):
+    word = create_words("abcd", font1, 10, (0, 0, 0))[0]
+    left_fragment = word._split_first_fragment(3)
+    assert left_fragment._chars == "abc"
+    assert left_fragment._width == 15
+    assert word._chars == "d"
+    assert word._width == 5
+    assert list(word._fragments[0]._advances) == [5]
+
+
+def test__fragments_share_interned_text_style(font1, font2):
+    words = create_words("ab cd", font1, 10, (0, 0, 0))
+    style = words[0]._fragments[0]._style
+    assert words[1]._fragments[0]._style is style
+    assert words[2]._fragments[0]._style is style
+    assert create_words("ef", font1, 10, (0, 0, 0))[0]._fragments[0]._style is style
+    assert create_words("ef", font2, 10, (0, 0, 0))[0]._fragments[0]._style is not style
+    assert create_words("ef", font1, 10, (255, 0, 0))[0]._fragments[0]._style is not style
+    assert style.height == 10
+    assert style.ascent == 6
+
+
+def test__word_creates_bookkeeping_containers_lazily(font1, font2):
+    word = create_words(" ", font1, 10, (0, 0, 0))[0]
+    assert word._height_dict is None
+    assert word._ascent_dict is None
+    assert word._current_page_fragments is None
+    assert word._total_pages_fragments is None
+    assert not hasattr(word, "__dict__")
+    word = create_words("ab", font1, 10, (0, 0, 0))[0]
+    word._add_fragment(create_words("cd", font2, 10, (0, 0, 0))[0]._fragments[0])
+    assert word._height_dict == {10: 1, 20: 1}
+    assert word._ascent_dict == {6: 1, 12: 1}
+    assert word._height == 20
+    word._pop_fragment(1)
+    assert word._height == 10
+    assert word._ascent == 6
+
+
+def test__word_without_counters_resets_height_when_emptied(font1):
+    word = create_words("ab", font1, 10, (0, 0, 0))[0]
+    assert word._height == 10
+    word._pop_fragment(0)
+    assert word._height == 0
+    assert word._ascent == 0
+
+
+def test__split_keeps_rest_of_run_as_view(font1):
+    word = create_words("abcdefgh", font1, 10, (0, 0, 0))[0]
+    fragment = word._fragments[0]
+    assert word._split_first_fragment(3)._chars == "abc"
+    assert word._split_first_fragment(2)._chars == "de"
+    assert fragment._text == "abcdefgh"
+    assert fragment._chars == "fgh"
+    assert fragment._get_num_chars() == 3
+    assert fragment._width == 15
+    assert word._chars == "fgh"
+    fragment._extend(create_words("ij", font1, 10, (0, 0, 0))[0]._fragments[0])
+    assert fragment._chars == "fghij"
+    assert list(fragment._advances) == [5] * 5
+
+
+def test__word_whitespace_checks(font1):
+    words = create_words("a \t\n", font1, 10, (0, 0, 0))
+    assert [word._is_whitespace() for word in words] == [False, True, True, True]
+    assert [word._is_space() for word in words] == [False, True, False, False]
+    assert [word._is_tab() for word in words] == [False, False, True, False]
+    assert [word._is_new_line() for word in words] == [False, False, False, True]
@@ -1,4 +1,6 @@
+from docugenr8_core.text_area import words_creation
 from docugenr8_core.text_area.words_creation import create_words
+from docugenr8_core.text_area.words_creation import stream_words
 
 def test__create_words(font1):
     text = "The quick brown fox jumps over the lazy dog 1234567890 !@#$%^&*()_+[]{};':\",./<>?`~-"
@@ -6,19 +8,55 @@ def test__create_words(font1):
     assert len(new_words) == 21
 
 def test__words_with_carriage_return(font1):
-    pass
+    new_words = create_words("ab\rcd", font1, 10, (0,0,0))
+    assert [word._chars for word in new_words] == ["ab", "\n", "cd"]
+    assert new_words[1]._width == 0
 
 def test__words_with_carriage_return_and_new_line(font1):
-    pass
+    new_words = create_words("ab\r\ncd\r\n", font1, 10, (0,0,0))
+    assert [word._chars for word in new_words] == ["ab", "\n", "cd", "\n"]
 
 def test__words__with_new_line(font1):
-    pass
+    new_words = create_words("ab\n\ncd", font1, 10, (0,0,0))
+    assert [word._chars for word in new_words] == ["ab", "\n", "\n", "cd"]
+    assert not new_words[1]._should_render
 
 def test__words_with_tab(font1):
-    pass
+    new_words = create_words("ab\tcd", font1, 10, (0,0,0))
+    assert [word._chars for word in new_words] == ["ab", "\t", "cd"]
+    assert new_words[1]._width == 0
+    assert not new_words[1]._should_render
 
 def test__words_with_current_page_number(font1):
-    pass
+    new_words = create_words("ab%%pn%%cd %%pn%%", font1, 10, (0,0,0), "%%pn%%", "%%tp%%", 2, str)
+    assert [word._chars for word in new_words] == ["ab%%pn%%cd", " ", "%%pn%%"]
+    assert [fragment._chars for fragment in new_words[0]._fragments] == ["ab", "%%pn%%", "cd"]
+    assert new_words[0]._current_page_fragments == [new_words[0]._fragments[1]]
+    assert new_words[0]._width == 30
+    assert new_words[2]._has_current_page_fragments()
 
 def test__words_with_total_pages_number(font1):
-    pass
+    new_words = create_words("%%tp%%/%%tp%%", font1, 10, (0,0,0), "%%pn%%", "%%tp%%", 2, str)
+    assert len(new_words) == 1
+    assert [fragment._chars for fragment in new_words[0]._fragments] == ["%%tp%%", "/", "%%tp%%"]
+    assert len(new_words[0]._total_pages_fragments) == 2
+    assert not new_words[0]._has_current_page_fragments()
+
+def test__page_number_dummies_are_plain_text_without_presentation(font1):
+    new_words = create_words("a%%pn%%", font1, 10, (0,0,0), "%%pn%%", "%%tp%%", 2, None)
+    assert len(new_words[0]._fragments) == 1
+    assert new_words[0]._width == 35
+
+def test__stream_words_scans_text_only_when_a_chunk_has_a_separator(font1, monkeypatch):
+    scans = []
+    find_word_boundary = words_creation.find_word_boundary
+
+    def recording_find_word_boundary(unicode_text, start, max_end):
+        scans.append(start)
+        return find_word_boundary(unicode_text, start, max_end)
+
+    monkeypatch.setattr(words_creation, "find_word_boundary", recording_find_word_boundary)
+    chunks = ["ab"] * 100 + ["c d", "ef"]
+    words = list(stream_words(iter(chunks), font1, 10, (0, 0, 0)))
+    assert [word._chars for word in words] == ["ab" * 100 + "c", " ", "def"]
+    assert len(scans) == 2